@@ -1,56 +1,108 @@
 # Ant Colony Optimization
 import sys
 import os
-import random
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from models.province_node import ProvinceNode
-from utils.distance_function import haversine_distance
-from utils.heuristic_function import AIRPORTS, AIR_SPEED, ROAD_SPEED
-from utils.heuristic_function import (
-    AIR_COST_PER_KM,
-    ROAD_COST_PER_KM,
-    STORAGE_TIME,
-    REST_DISTANCE,
-    REST_TIME,
-)
-from data.provinces_infor import coordinates, province_neighbor
+from models.ant_colony import AntColony
+from utils.graph_builder import get_graph, set_graph
+from utils.landmarks import landmark_lower_bounds
+from utils.route_tables import get_route_table
 
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
 
-def build_graph_from_province_data():
+import numpy as np
+
+# Cách các đàn kiến (mô hình đảo) trao đổi sau mỗi exchange_interval vòng lặp:
+# - "best": mọi đàn rải thêm pheromone lên đường tốt nhất chung
+# - "pheromone": pheromone của mọi đàn được thay bằng trung bình cộng
+EXCHANGE_MODES = ("best", "pheromone")
+
+# Số vòng lặp mặc định giữa hai lần trao đổi
+DEFAULT_EXCHANGE_INTERVAL = 50
+
+# Số vòng lặp không cải thiện trước khi giao diện dừng ACO
+ACO_STAGNATION_ITERATIONS = 200
+
+# Số cạnh tối đa của một đoạn được thay bằng đường tối ưu trong bảng tra cứu khi
+# local_search=True (tối ưu cả đường sẽ biến ACO thành tra bảng)
+DEFAULT_LOCAL_SEARCH_WINDOW = 3
+
+
+def _local_search(graph, cost_priority: float, weights: np.ndarray, start: int, window: int) -> Callable[[List[int], float], Tuple[List[int], float]]:
+    """
+    Hàm improve(edges, value) tối ưu cục bộ một đường đi của kiến: bỏ các vòng lặp
+    (đi qua một nút hai lần) và thay mỗi đoạn tối đa window cạnh bằng đường tối ưu giữa
+    hai đầu đoạn lấy từ bảng tra cứu mọi cặp (utils/route_tables.py) nếu rẻ hơn.
+    Bảng tra cứu là của điểm lưới cost_priority gần nhất nên chỉ dùng để lọc; đoạn thay
+    thế được tính lại bằng weights và chỉ được nhận khi thực sự rẻ hơn.
     """
-    Xây dựng đồ thị từ dữ liệu về các tỉnh/thành
+    table = get_route_table(graph, cost_priority)
+    dist = table.arrays["dist"]
+    targets = graph.targets
 
-    Returns:
-        Tuple chứa dictionary các tỉnh/thành và dictionary các đoạn đường
+    def remove_loops(edges: List[int]) -> List[int]:
+        kept: List[int] = []
+        position = {start: 0}
+        for e in edges:
+            v = targets[e]
+            if v in position:
+                # Quay lại nút đã qua: bỏ cả vòng
+                for dropped in kept[position[v]:]:
+                    del position[targets[dropped]]
+                del kept[position[v]:]
+            else:
+                kept.append(e)
+                position[v] = len(kept)
+        return kept
+
+    def improve(edges: List[int], value: float) -> Tuple[List[int], float]:
+        edges = remove_loops(edges)
+        i = 0
+        while i < len(edges):
+            u = start if i == 0 else targets[edges[i - 1]]
+            for j in range(min(len(edges), i + window), i, -1):
+                v = targets[edges[j - 1]]
+                segment = float(weights[edges[i:j]].sum())
+                if dist[u, v] >= segment * (1 - 1e-6):
+                    continue
+                nodes = table.path(u, v)
+                replacement = [graph.best_edge(a, b, weights) for a, b in zip(nodes, nodes[1:])]
+                if replacement and min(replacement) >= 0 and float(weights[replacement].sum()) < segment:
+                    edges = remove_loops(edges[:i] + replacement + edges[j:])
+                    break
+            else:
+                i += 1
+        return edges, float(weights[edges].sum()) if edges else value
+
+    return improve
+
+
+def _colony_epoch(
+    start: int,
+    goal: int,
+    cost_priority: float,
+    params: Dict,
+    local_search_window: int,
+    tau: np.ndarray,
+    tau_max: Optional[float],
+    rng: np.random.Generator,
+    num_ants: int,
+    num_iterations: int,
+) -> Tuple[np.ndarray, Optional[float], np.random.Generator, List[int], float, int]:
+    """
+    Chạy một đàn num_iterations vòng lặp từ pheromone tau (và cận tau_max của MMAS),
+    trong tiến trình con hoặc tiến trình hiện tại. Trả lại pheromone, tau_max và bộ
+    sinh số ngẫu nhiên để chạy tiếp.
     """
-    provinces = {}
-    road_segments = {}
-
-    # Tạo các nút tỉnh/thành
-    for province_name, (lat, lon) in coordinates.items():
-        province_id = hash(province_name)
-        provinces[province_name] = ProvinceNode(province_id, province_name, lat, lon)
-
-    # Thêm thông tin về các tỉnh liền kề
-    for province_name, neighbors_list in province_neighbor.items():
-        if province_name in provinces:
-            for neighbor_name in neighbors_list:
-                if neighbor_name in provinces:
-                    provinces[province_name].add_neighbor(neighbor_name)
-
-                    # Tính khoảng cách giữa hai tỉnh
-                    if (province_name, neighbor_name) not in road_segments and (
-                        neighbor_name,
-                        province_name,
-                    ) not in road_segments:
-                        p1_lat, p1_lon = coordinates[province_name]
-                        p2_lat, p2_lon = coordinates[neighbor_name]
-                        distance = haversine_distance(p1_lat, p1_lon, p2_lat, p2_lon)
-                        road_segments[(province_name, neighbor_name)] = distance
-
-    return provinces, road_segments
+    graph = get_graph()
+    colony = AntColony(graph, graph.edge_weight_array(cost_priority), start, goal, **params)
+    colony.tau, colony.tau_max = tau, tau_max
+    improve = _local_search(graph, cost_priority, colony.weights, start, local_search_window) if local_search_window > 0 else None
+    edges, value, steps = colony.run(num_ants, num_iterations, rng, improve)
+    return colony.tau, colony.tau_max, rng, edges, value, steps
 
 
 def ant_colony_optimization(
@@ -64,163 +116,204 @@ def ant_colony_optimization(
     evaporation_rate: float = 0.1,
     Q: float = 100.0,
     max_steps: int = 100,
+    candidate_size: Optional[int] = None,
+    mmas: bool = False,
+    local_search: bool = False,
+    local_search_window: int = DEFAULT_LOCAL_SEARCH_WINDOW,
+    seed: Optional[int] = None,
+    colonies: int = 1,
+    workers: Optional[int] = None,
+    exchange_interval: int = DEFAULT_EXCHANGE_INTERVAL,
+    exchange: str = "best",
+    target_value: Optional[float] = None,
+    stagnation_iterations: Optional[int] = None,
+    entropy_threshold: Optional[float] = None,
+    time_budget: Optional[float] = None,
+    progress: Optional[Callable[[List[str], float, List[Tuple[str, str, str]], int], None]] = None,
+    stats: Optional[Dict] = None,
 ):
+    """
+    Tìm đường bằng ACO. Với colonies > 1, các đàn kiến độc lập (mô hình đảo) chạy
+    song song trong một process pool, mỗi đàn num_ants con kiến và một luồng số
+    ngẫu nhiên riêng sinh từ seed, trao đổi theo exchange sau mỗi exchange_interval
+    vòng lặp. Kết quả chỉ phụ thuộc seed, không phụ thuộc số tiến trình.
+
+    candidate_size (danh sách ứng viên), mmas (chặn pheromone kiểu MAX-MIN) và
+    local_search (tối ưu cục bộ đường tốt nhất của mỗi vòng lặp trước khi rải pheromone,
+    xem _local_search) giúp hội tụ nhanh hơn; mặc định tắt như ACO gốc.
+
+    Có thể dừng trước num_iterations (mô hình đảo chỉ kiểm tra sau mỗi lần trao đổi):
+    khi đạt target_value, khi đường tốt nhất không cải thiện sau stagnation_iterations
+    vòng lặp, khi pheromone trên đường tốt nhất đã hội tụ (entropy dưới
+    entropy_threshold) hoặc khi hết time_budget giây. progress được gọi mỗi khi tìm
+    được đường tốt hơn, nên người gọi có thể hiển thị ngay đường tốt nhất hiện tại.
+
+    Args:
+        start_province: Tỉnh/thành bắt đầu
+        goal_province: Tỉnh/thành đích
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+        num_ants, num_iterations: Số kiến mỗi vòng lặp và số vòng lặp của mỗi đàn
+        alpha, beta, evaporation_rate, Q, max_steps: Tham số ACO, xem models/ant_colony.py
+        candidate_size: Số cạnh ứng viên của mỗi nút, xếp theo trọng số + cận dưới landmark
+            (ALT) đến đích (xem AntColony, DEFAULT_CANDIDATE_SIZE), None để xét mọi cạnh
+        mmas: Dùng MAX-MIN Ant System, xem AntColony
+        local_search: Tối ưu cục bộ đường của kiến bằng bảng tra cứu mọi cặp
+        local_search_window: Số cạnh tối đa của một đoạn được thay khi local_search
+        seed: Hạt giống của bộ sinh số ngẫu nhiên
+        colonies: Số đàn kiến
+        workers: Số tiến trình (mặc định: số CPU); 1 để chạy các đàn tuần tự
+        exchange_interval: Số vòng lặp giữa hai lần trao đổi
+        exchange: "best" hoặc "pheromone", xem EXCHANGE_MODES
+        target_value: Dừng sớm khi tìm được đường có tổng trọng số không vượt quá giá trị này
+        stagnation_iterations: Dừng khi đường tốt nhất không đổi sau chừng này vòng lặp
+        entropy_threshold: Dừng khi entropy pheromone trên đường tốt nhất (0..1, xem
+            AntColony.pheromone_entropy) nhỏ hơn ngưỡng này
+        time_budget: Thời gian chạy tối đa (giây)
+        progress: Hàm progress(path, total_value, transport_info, iteration) gọi với mỗi
+            đường tốt hơn vừa tìm được
+        stats: Nếu truyền vào một dictionary, số bước kiến (iterations), không gian tối đa
+            (max_space), số vòng lặp đã chạy của mỗi đàn (colony_iterations) và lý do
+            dừng (stop_reason: "iterations", "target", "stagnation", "entropy", "time_budget")
+            được ghi vào đó
+
+    Returns:
+        Tuple chứa đường đi, tổng chi phí và thông tin vận chuyển
+    """
     print("Đường đi từ: ", start_province, " đến: ", goal_province)
     
-    # Build graph
-    provinces, road_segments = build_graph_from_province_data()
+    # Shared compiled graph
+    graph = get_graph()
+    provinces = graph.names
     cost_priority = max(0.0, min(1.0, cost_priority))
+    if exchange not in EXCHANGE_MODES:
+        raise ValueError(f"Không hỗ trợ trao đổi {exchange!r}, chọn một trong {EXCHANGE_MODES}")
 
-    # Build adjacency with precomputed metrics and initial pheromone
-    adjacency = {}
-    initial_tau = 1.0
-    for u, node in provinces.items():
-        adjacency[u] = []
-        # Road edges
-        for v in node.neighbors:
-            if v not in provinces:
-                continue
-            # distance lookup
-            key, rev = (u, v), (v, u)
-            if key in road_segments:
-                dist = road_segments[key]
-            elif rev in road_segments:
-                dist = road_segments[rev]
-            else:
-                dist = haversine_distance(
-                    node.latitude,
-                    node.longitude,
-                    provinces[v].latitude,
-                    provinces[v].longitude,
-                )
-            t = dist / ROAD_SPEED + (dist // REST_DISTANCE) * REST_TIME
-            c = dist * ROAD_COST_PER_KM / 10000
-            value = cost_priority * c + (1 - cost_priority) * t
-            eta = 1.0 / value if value > 0 else 1.0
-            adjacency[u].append(
-                {
-                    "to": v,
-                    "type": "road",
-                    "dist": dist,
-                    "time": t,
-                    "cost": c,
-                    "value": value,
-                    "eta": eta,
-                    "tau": initial_tau,
-                }
-            )
-        # Air edges
-        if u in AIRPORTS:
-            for v in AIRPORTS:
-                if v == u or v not in provinces:
-                    continue
-                dist = haversine_distance(
-                    node.latitude,
-                    node.longitude,
-                    provinces[v].latitude,
-                    provinces[v].longitude,
-                )
-                t = dist / AIR_SPEED + STORAGE_TIME
-                c = dist * AIR_COST_PER_KM / 10000
-                value = cost_priority * c + (1 - cost_priority) * t
-                eta = 1.0 / value if value > 0 else 1.0
-                adjacency[u].append(
-                    {
-                        "to": v,
-                        "type": "fly",
-                        "dist": dist,
-                        "time": t,
-                        "cost": c,
-                        "value": value,
-                        "eta": eta,
-                        "tau": initial_tau,
-                    }
-                )
-
-    best_path = None
+    if start_province not in graph.index or goal_province not in graph.index:
+        return [], float("inf"), []
+
+    # Trường hợp đặc biệt: nếu bắt đầu và đích là cùng một tỉnh
+    if start_province == goal_province:
+        return [start_province], 0.0, []
+    start, goal = graph.index[start_province], graph.index[goal_province]
+
+    # Pheromone, heuristic và danh sách cạnh kề dạng mảng (xem models/ant_colony.py)
+    params = {
+        "alpha": alpha, "beta": beta, "evaporation_rate": evaporation_rate, "Q": Q, "max_steps": max_steps,
+        "candidate_size": candidate_size, "mmas": mmas,
+    }
+    if candidate_size is not None:
+        # Ứng viên hướng về đích: cận dưới ALT đến goal của mọi nút
+        params["goal_bounds"] = landmark_lower_bounds(graph, goal, cost_priority)
+    window = max(1, local_search_window) if local_search else 0
+    colonies = max(1, colonies)
+    rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(colonies)] if colonies > 1 else [np.random.default_rng(seed)]
+
+    best_edges = None
     best_value = float("inf")
     
     # Thêm biến đếm số bước và không gian tìm kiếm tối đa
     total_iterations = 0
-    max_space = 0
-    total_ants = 0
-
-    # Main ACO loop
-    for iteration in range(num_iterations):
-        iteration_best_path = None
-        iteration_best_value = float("inf")
-        iteration_edges = []
-        
-        # Theo dõi số lượng kiến trong mỗi vòng lặp
-        iteration_ants = 0
-
-        for _ in range(num_ants):
-            path = [start_province]
-            visited = {start_province}
-            total_value = 0.0
-            steps = 0
-            
-            # Mỗi kiến là một lần thử nghiệm
-            total_ants += 1
-            iteration_ants += 1
-
-            while path[-1] != goal_province and steps < max_steps:
-                current = path[-1]
-                edges = [e for e in adjacency[current] if e["to"] not in visited]
-                if not edges:
+    # Trong ACO, không gian tìm kiếm có thể được đo bằng số lượng kiến * số lượng tỉnh
+    max_space = colonies * num_ants * len(provinces)
+
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    colony = AntColony(graph, graph.edge_weight_array(cost_priority), start, goal, **params)
+    improve = _local_search(graph, cost_priority, colony.weights, start, window) if window else None
+    improved_at = 0
+
+    def stop_reason(done: int) -> Optional[str]:
+        """Lý do dừng sau done vòng lặp, None nếu chạy tiếp"""
+        if target_value is not None and best_value <= target_value:
+            return "target"
+        if stagnation_iterations is not None and done - improved_at >= stagnation_iterations:
+            return "stagnation"
+        if entropy_threshold is not None and best_edges:
+            nodes = [start] + [graph.targets[e] for e in best_edges[:-1]]
+            if colony.pheromone_entropy(nodes) < entropy_threshold:
+                return "entropy"
+        if deadline is not None and time.perf_counter() >= deadline:
+            return "time_budget"
+        return None
+
+    def report(done: int) -> None:
+        if progress is not None:
+            path, transport_info = graph.edge_route(start, best_edges)
+            progress(path, best_value, transport_info, done)
+
+    reason = "iterations"
+    done = 0
+    if colonies == 1:
+        rng = rngs[0]
+
+        # Main ACO loop
+        while done < num_iterations:
+            # Mọi con kiến của vòng lặp đi cùng lúc, mỗi bước của kiến là một bước tính toán
+            iteration_edges, iteration_best_value, ant_steps = colony.construct(num_ants, rng)
+            total_iterations += ant_steps
+            done += 1
+            if iteration_edges and improve is not None:
+                iteration_edges, iteration_best_value = improve(iteration_edges, iteration_best_value)
+
+            # Bay hơi rồi rải pheromone theo đường tốt nhất của vòng lặp
+            colony.update(iteration_edges, iteration_best_value, best_value)
+
+            # update global best
+            if iteration_edges and iteration_best_value < best_value:
+                best_value = iteration_best_value
+                best_edges = iteration_edges
+                improved_at = done
+                report(done)
+            reason = stop_reason(done) or reason
+            if reason != "iterations":
+                break
+    else:
+        taus = [np.ones(graph.num_edges) for _ in range(colonies)]
+        tau_maxes = [None] * colonies
+        pool = None if workers == 1 else ProcessPoolExecutor(max_workers=workers, initializer=set_graph, initargs=(graph,))
+        try:
+            while done < num_iterations:
+                epoch = min(max(1, exchange_interval), num_iterations - done)
+                tasks = [(start, goal, cost_priority, params, window, taus[c], tau_maxes[c], rngs[c], num_ants, epoch) for c in range(colonies)]
+                if pool is None:
+                    results = [_colony_epoch(*task) for task in tasks]
+                else:
+                    results = list(pool.map(_colony_epoch, *zip(*tasks)))
+                done += epoch
+
+                improved = False
+                for c, (tau, tau_max, rng, edges, value, steps) in enumerate(results):
+                    taus[c], tau_maxes[c], rngs[c] = tau, tau_max, rng
+                    total_iterations += steps
+                    if edges and value < best_value:
+                        best_value, best_edges = value, edges
+                        improved = True
+                if improved:
+                    improved_at = done
+                    report(done)
+
+                # Trao đổi giữa các đảo
+                if exchange == "pheromone":
+                    mean_tau = np.mean(taus, axis=0)
+                    taus = [mean_tau.copy() for _ in range(colonies)]
+                elif best_edges:
+                    for tau in taus:
+                        tau[best_edges] += Q / best_value
+                # Mức hội tụ đo trên pheromone trung bình của các đảo
+                colony.tau = np.mean(taus, axis=0)
+                reason = stop_reason(done) or reason
+                if reason != "iterations":
                     break
-                # choose next edge by weighted probability
-                weights = [(e["tau"] ** alpha) * (e["eta"] ** beta) for e in edges]
-                edge = random.choices(edges, weights, k=1)[0]
-
-                path.append(edge["to"])
-                visited.add(edge["to"])
-                total_value += edge["value"]
-                steps += 1
-                
-                # Mỗi bước của kiến cũng là một bước tính toán
-                total_iterations += 1
-
-            if path[-1] == goal_province and total_value < iteration_best_value:
-                iteration_best_value = total_value
-                iteration_best_path = list(path)
-                iteration_edges = [
-                    (iteration_best_path[i], iteration_best_path[i + 1])
-                    for i in range(len(iteration_best_path) - 1)
-                ]
-        
-        # Cập nhật max_space - không gian tìm kiếm tối đa
-        # Trong ACO, không gian tìm kiếm có thể được đo bằng số lượng kiến * số lượng tỉnh
-        current_space = iteration_ants * len(provinces)
-        if current_space > max_space:
-            max_space = current_space
-
-        # Global pheromone update: evaporation
-        for u in adjacency:
-            for edge in adjacency[u]:
-                edge["tau"] *= 1 - evaporation_rate
-        # deposit pheromone along iteration best
-        if iteration_edges:
-            deposit = Q / iteration_best_value
-            for u, v in iteration_edges:
-                for edge in adjacency[u]:
-                    if edge["to"] == v:
-                        edge["tau"] += deposit
-                        break
-
-        # update global best
-        if iteration_best_path and iteration_best_value < best_value:
-            best_value = iteration_best_value
-            best_path = iteration_best_path
-
-    # build transport_info from best_path
-    transport_info = []
-    if best_path:
-        for i in range(len(best_path) - 1):
-            u, v = best_path[i], best_path[i + 1]
-            # find edge type
-            typ = next(e["type"] for e in adjacency[u] if e["to"] == v)
-            transport_info.append((u, v, typ))
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    if stats is not None:
+        stats.update(iterations=total_iterations, max_space=max_space, colony_iterations=done, stop_reason=reason)
+
+    # build transport_info from best path
+    best_path, transport_info = None, []
+    if best_edges:
+        best_path, transport_info = graph.edge_route(start, best_edges)
     
     print("Thuật toán Ant Colony Optimization")
     print("Tìm thấy đường sau: ", total_iterations, " steps")
@@ -230,12 +323,8 @@ def ant_colony_optimization(
     return best_path or [], best_value, transport_info
 
 
-def calculate_transport_options_aco(
-    start: str,
-    goal: str,
-    cost_priority: float = 0.5,
-    **kwargs,
-):
+def _aco_result(path, total_val, transport_info) -> Dict:
+    """Dictionary kết quả theo định dạng chung từ đường đi của ACO"""
     result = {
         "path": [],
         "distance": 0.0,
@@ -244,45 +333,13 @@ def calculate_transport_options_aco(
         "total_value": 0.0,
         "transport_details": [],
     }
-    path, total_val, transport_info = ant_colony_optimization(
-        start, goal, cost_priority, **kwargs
-    )
     if not path:
         return result
-    provinces, road_segments = build_graph_from_province_data()
-    total_dist = total_time = total_cost = 0.0
-    for u, v, ttype in transport_info:
-        if ttype == "road":
-            key, rev = (u, v), (v, u)
-            dist = road_segments.get(
-                key,
-                road_segments.get(
-                    rev,
-                    haversine_distance(
-                        provinces[u].latitude,
-                        provinces[u].longitude,
-                        provinces[v].latitude,
-                        provinces[v].longitude,
-                    ),
-                ),
-            )
-            tm = dist / ROAD_SPEED + (dist // REST_DISTANCE) * REST_TIME
-            c = dist * ROAD_COST_PER_KM / 10
-        else:
-            dist = haversine_distance(
-                provinces[u].latitude,
-                provinces[u].longitude,
-                provinces[v].latitude,
-                provinces[v].longitude,
-            )
-            tm = dist / AIR_SPEED + STORAGE_TIME
-            c = dist * AIR_COST_PER_KM / 10
-        total_dist += dist
-        total_time += tm
-        total_cost += c
-        result["transport_details"].append(
-            {"from": u, "to": v, "type": ttype, "distance": dist, "time": tm, "cost": c}
-        )
+    transport_details = get_graph().route_details(transport_info)
+    result["transport_details"] = transport_details
+    total_dist = sum(s["distance"] for s in transport_details)
+    total_time = sum(s["time"] for s in transport_details)
+    total_cost = sum(s["cost"] for s in transport_details)
     result.update(
         {
             "path": path,
@@ -294,3 +351,33 @@ def calculate_transport_options_aco(
     )
     return result
 
+
+def calculate_transport_options_aco(
+    start: str,
+    goal: str,
+    cost_priority: float = 0.5,
+    progress: Optional[Callable[[Dict, int], None]] = None,
+    **kwargs,
+):
+    """
+    Tính toán các phương án vận chuyển sử dụng ACO
+
+    Args:
+        start: Tỉnh/thành bắt đầu
+        goal: Tỉnh/thành đích
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+        progress: Hàm progress(result, iteration) nhận dictionary kết quả của mỗi đường
+            tốt hơn vừa tìm được (cùng định dạng với kết quả cuối cùng)
+        kwargs: Các tham số khác của ant_colony_optimization
+
+    Returns:
+        Dictionary chứa thông tin của phương án
+    """
+    if progress is not None:
+        kwargs["progress"] = lambda path, total_val, transport_info, iteration: progress(
+            _aco_result(path, total_val, transport_info), iteration
+        )
+    path, total_val, transport_info = ant_colony_optimization(
+        start, goal, cost_priority, **kwargs
+    )
+    return _aco_result(path, total_val, transport_info)
@@ -0,0 +1,177 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.floyd_warshall import floyd_warshall_matrices, next_hop_dtype
+from utils.graph_builder import get_graph, set_graph
+
+import heapq
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Đường đi ngắn nhất mọi cặp bằng hai engine:
+# - "dense": Floyd-Warshall NumPy, O(n³) phép min-plus vector hóa
+# - "sparse": một Dijkstra với heap cho mỗi nguồn, O(n · m log n) bước Python, chia
+#   các nguồn cho nhiều tiến trình. Trọng số cạnh không âm nên không cần bước đổi
+#   trọng số của Johnson.
+ALL_PAIRS_ENGINES = ("auto", "dense", "sparse")
+
+# "auto" chọn "sparse" khi mật độ cạnh m / n² nhỏ hơn ngưỡng này. Trên một tiến trình,
+# thời gian Floyd-Warshall / Dijkstra lặp lại tỉ lệ với n² / m và bằng nhau quanh
+# n² / m ≈ 130 (đo trên đồ thị lưới tổng hợp 500 và 1000 nút)
+SPARSE_EDGE_DENSITY = 1 / 128
+
+# Số nguồn mỗi tác vụ gửi cho tiến trình con
+DEFAULT_CHUNK_SIZE = 64
+
+
+def _source_row(indptr: List[int], targets: List[int], weights: List[float], n: int, source: int) -> Tuple[List[float], List[int]]:
+    """
+    Dijkstra từ source, ghi lại nút đầu tiên sau source trên đường đến mỗi nút.
+
+    Returns:
+        Tuple (khoảng cách, nút kế tiếp): inf / -1 với nút không đến được,
+        nút kế tiếp của chính source là source như ma trận của Floyd-Warshall
+    """
+    inf = float('inf')
+    dist = [inf] * n
+    first = [-1] * n
+    done = [False] * n
+    dist[source] = 0.0
+    first[source] = source
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if done[u]:
+            continue
+        done[u] = True
+        hop = first[u]
+        for e in range(indptr[u], indptr[u + 1]):
+            v = targets[e]
+            if done[v]:
+                continue
+            nd = d + weights[e]
+            if nd < dist[v]:
+                dist[v] = nd
+                first[v] = v if u == source else hop
+                heapq.heappush(heap, (nd, v))
+    return dist, first
+
+
+def dijkstra_rows(graph, sources: Sequence[int], cost_priority: float = 0.5, dtype=np.float64) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Các hàng của ma trận khoảng cách và nút kế tiếp cho các nguồn sources.
+
+    Returns:
+        Tuple (dist len(sources)×n, nxt len(sources)×n)
+    """
+    indptr, targets, _ = graph.adjacency()
+    weights = graph.edge_weights(cost_priority)
+    n = graph.num_nodes
+    dist = np.empty((len(sources), n), dtype=dtype)
+    nxt = np.empty((len(sources), n), dtype=next_hop_dtype(n))
+    for row, source in enumerate(sources):
+        dist[row], nxt[row] = _source_row(indptr, targets, weights, n, source)
+    return dist, nxt
+
+
+def _dijkstra_rows_worker(sources: Sequence[int], cost_priority: float, dtype) -> Tuple[np.ndarray, np.ndarray]:
+    # Tiến trình con nhận đồ thị một lần qua initializer=set_graph
+    return dijkstra_rows(get_graph(), sources, cost_priority, dtype)
+
+
+def iter_all_pairs_rows(
+    graph,
+    cost_priority: float = 0.5,
+    dtype=np.float64,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
+    """
+    Sinh lần lượt từng hàng (nguồn, dist, nxt) theo thứ tự nguồn bằng Dijkstra lặp lại,
+    để dùng được với đồ thị mà ma trận n×n không vừa bộ nhớ (ví dụ ghi thẳng ra file).
+    Mỗi lúc chỉ có tối đa 2 × workers nhóm nguồn đang tính hoặc chờ được đọc.
+
+    Args:
+        graph: CompiledGraph
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+        dtype: Kiểu lưu khoảng cách
+        workers: Số tiến trình (mặc định: số CPU); 1 để chạy tuần tự
+        chunk_size: Số nguồn mỗi tác vụ
+    """
+    if (graph.edge_weight_array(cost_priority) < 0).any():
+        raise ValueError("Dijkstra lặp lại cần trọng số cạnh không âm")
+    n = graph.num_nodes
+    chunks = [range(start, min(start + chunk_size, n)) for start in range(0, n, max(1, chunk_size))]
+
+    if workers == 1:
+        for sources in chunks:
+            dist, nxt = dijkstra_rows(graph, sources, cost_priority, dtype)
+            for row, source in enumerate(sources):
+                yield source, dist[row], nxt[row]
+        return
+
+    window = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers, initializer=set_graph, initargs=(graph,)) as pool:
+        pending = deque()
+        for sources in chunks:
+            pending.append((sources, pool.submit(_dijkstra_rows_worker, sources, cost_priority, dtype)))
+            # Giữ số nhóm đang chờ có giới hạn, trả các hàng theo thứ tự nguồn
+            while len(pending) >= window:
+                yield from _chunk_rows(*pending.popleft())
+        while pending:
+            yield from _chunk_rows(*pending.popleft())
+
+
+def _chunk_rows(sources: Sequence[int], future) -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
+    dist, nxt = future.result()
+    for row, source in enumerate(sources):
+        yield source, dist[row], nxt[row]
+
+
+def choose_engine(graph) -> str:
+    """Engine "dense" hoặc "sparse" phù hợp với mật độ cạnh của đồ thị"""
+    n = max(graph.num_nodes, 1)
+    return "sparse" if graph.num_edges / (n * n) < SPARSE_EDGE_DENSITY else "dense"
+
+
+def all_pairs_matrices(
+    graph,
+    cost_priority: float = 0.5,
+    dtype=np.float64,
+    engine: str = "auto",
+    workers: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Ma trận khoảng cách và nút kế tiếp mọi cặp, cùng dạng với floyd_warshall_matrices.
+    Hai engine cho cùng khoảng cách (có thể lệch ở chữ số cuối vì thứ tự cộng khác);
+    giữa các đường bằng nhau có thể chọn nút kế tiếp khác.
+
+    Args:
+        graph: CompiledGraph
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+        dtype: Kiểu lưu khoảng cách
+        engine: "auto", "dense" hoặc "sparse", xem ALL_PAIRS_ENGINES
+        workers: Số tiến trình của engine "sparse" (mặc định: số CPU)
+
+    Returns:
+        Tuple (dist n×n, nxt n×n)
+    """
+    if engine not in ALL_PAIRS_ENGINES:
+        raise ValueError(f"Không hỗ trợ engine {engine!r}, chọn một trong {ALL_PAIRS_ENGINES}")
+    if engine == "auto":
+        engine = choose_engine(graph)
+    if engine == "dense":
+        dist, nxt, _ = floyd_warshall_matrices(graph, cost_priority, dtype)
+        return dist, nxt
+
+    n = graph.num_nodes
+    dist = np.empty((n, n), dtype=dtype)
+    nxt = np.empty((n, n), dtype=next_hop_dtype(n))
+    for source, dist_row, nxt_row in iter_all_pairs_rows(graph, cost_priority, dtype, workers):
+        dist[source] = dist_row
+        nxt[source] = nxt_row
+    return dist, nxt
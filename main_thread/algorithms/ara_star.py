@@ -0,0 +1,268 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.search_state import search_state
+from utils.graph_builder import get_graph
+from utils.heuristic_function import HEURISTIC_MODES, heuristic_table
+from utils.landmarks import landmark_lower_bounds
+from utils.priority_queue import make_queue
+
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Anytime Repairing A* (ARA*): A* với heuristic nhân hệ số epsilon >= 1 tìm nhanh một
+# đường có tổng trọng số không quá epsilon lần tối ưu, rồi giảm epsilon dần và sửa
+# đường đi thay vì tìm lại từ đầu: g và nút cha của mọi nút được giữ lại, chỉ các nút
+# có g giảm sau khi đã mở rộng trong vòng hiện tại (INCONS) được đưa lại vào hàng đợi.
+# Cận epsilon chỉ đúng khi heuristic là cận dưới nhất quán: mặc định dùng riêng cận
+# dưới landmark (ALT); heuristic địa lý trên dữ liệu này không phải cận dưới.
+
+# Hệ số heuristic ban đầu và lượng giảm sau mỗi vòng
+DEFAULT_INITIAL_EPSILON = 3.0
+DEFAULT_EPSILON_STEP = 0.5
+
+
+def _open_nodes(open_set) -> List[int]:
+    """Các nút đang nằm trong hàng đợi lười (LazyHeap)"""
+    return list(open_set.best)
+
+
+def ara_star(
+    start_province: str,
+    goal_province: str,
+    cost_priority: float = 0.5,
+    initial_epsilon: float = DEFAULT_INITIAL_EPSILON,
+    epsilon_step: float = DEFAULT_EPSILON_STEP,
+    time_budget: Optional[float] = None,
+    heuristic_mode: str = "alt",
+    progress: Optional[Callable[[List[str], float, List[Tuple[str, str, str]], float], None]] = None,
+    stats: Optional[Dict] = None,
+):
+    """
+    Thuật toán ARA* (A* anytime) tìm đường giữa hai tỉnh/thành
+
+    Mỗi vòng tìm kiếm với khóa g + epsilon · h kết thúc với một đường đi kèm cận
+    suboptimality_bound = min(epsilon, g(goal) / min(g + h trên OPEN ∪ INCONS)):
+    tổng trọng số không vượt quá suboptimality_bound lần tối ưu. Sau đó epsilon giảm
+    epsilon_step (hoặc xuống ngay cận vừa tính nếu nhỏ hơn) cho đến khi cận bằng 1
+    hoặc hết time_budget. Vòng đầu tiên luôn chạy đến khi có đường (nếu có) dù đã hết
+    time_budget; vòng bị ngắt giữa chừng vẫn có thể làm đường ngắn hơn, cận của vòng
+    trước vẫn đúng cho đường đó.
+
+    Args:
+        start_province: Tỉnh/thành bắt đầu
+        goal_province: Tỉnh/thành đích
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+        initial_epsilon: Hệ số heuristic của vòng đầu tiên (>= 1)
+        epsilon_step: Lượng giảm epsilon sau mỗi vòng
+        time_budget: Thời gian chạy tối đa (giây), None để chạy đến khi tối ưu
+        heuristic_mode: "alt" / "alt-regions" (chỉ cận dưới landmark) hoặc "geodesic"
+        progress: Hàm progress(path, total_value, transport_info, suboptimality_bound) gọi
+            sau mỗi vòng có đường đi
+        stats: Nếu truyền vào một dictionary, số bước (iterations), không gian tối đa
+            (max_space), các lời giải trung gian (solutions: danh sách dictionary epsilon,
+            suboptimality_bound, total_value, iterations, elapsed), cận của đường trả về
+            (suboptimality_bound) và lý do dừng (stop_reason: "optimal", "time_budget",
+            "exhausted") được ghi vào đó
+
+    Returns:
+        Tuple chứa đường đi, tổng chi phí và thông tin vận chuyển
+    """
+    print("Đường đi từ: ", start_province, " đến: ", goal_province)
+    if heuristic_mode not in HEURISTIC_MODES:
+        raise ValueError(f"Không hỗ trợ heuristic {heuristic_mode!r}, chọn một trong {sorted(HEURISTIC_MODES)}")
+    if initial_epsilon < 1:
+        raise ValueError(f"initial_epsilon phải >= 1, nhận {initial_epsilon}")
+
+    graph = get_graph()
+    indptr, targets, _ = graph.adjacency()
+    cost_priority = max(0.0, min(1.0, cost_priority))
+    weights = graph.edge_weights(cost_priority)
+
+    if start_province not in graph.index or goal_province not in graph.index:
+        return [], float('inf'), []
+    if start_province == goal_province:
+        if stats is not None:
+            stats.update(iterations=0, max_space=0, solutions=[], suboptimality_bound=1.0, stop_reason="optimal")
+        return [start_province], 0.0, []
+
+    start = graph.index[start_province]
+    goal = graph.index[goal_province]
+    method = HEURISTIC_MODES[heuristic_mode]
+    if method is None:
+        h = heuristic_table(graph, goal, cost_priority)
+    else:
+        h = landmark_lower_bounds(graph, goal, cost_priority, method).tolist()
+
+    start_time = time.perf_counter()
+    deadline = None if time_budget is None else start_time + time_budget
+    epsilon = initial_epsilon
+    epsilon_step = max(epsilon_step, 1e-6)
+
+    with search_state(graph) as state:
+        g, seen, epoch = state.g, state.seen, state.epoch
+
+        state.open(start, 0.0)
+        open_set = make_queue("lazy", graph.num_nodes)
+        open_set.push(start, epsilon * h[start])
+        # Nút đã mở rộng trong vòng hiện tại, và nút đã mở rộng nhưng sau đó có g giảm
+        closed = set()
+        incons = set()
+
+        iterations = 0
+        max_space = 0
+        solutions = []
+        best = None
+        reason = "exhausted"
+
+        while True:
+            # Mở rộng đến khi g(goal) không lớn hơn khóa nhỏ nhất của hàng đợi
+            timed_out = False
+            while open_set:
+                key, u = open_set.peek()
+                if seen[goal] == epoch and g[goal] <= key:
+                    break
+                if deadline is not None and best is not None and time.perf_counter() >= deadline:
+                    timed_out = True
+                    break
+                open_set.pop()
+                closed.add(u)
+                iterations += 1
+
+                g_u = g[u]
+                for e in range(indptr[u], indptr[u + 1]):
+                    v = targets[e]
+                    tentative_g_x = g_u + weights[e]
+                    if seen[v] != epoch or tentative_g_x < g[v]:
+                        state.open(v, tentative_g_x, u, e)
+                        if v in closed:
+                            incons.add(v)
+                        else:
+                            open_set.push(v, tentative_g_x + epsilon * h[v])
+
+                if len(open_set) + len(closed) + len(incons) > max_space:
+                    max_space = len(open_set) + len(closed) + len(incons)
+
+            if seen[goal] != epoch:
+                # Không có đường đi
+                break
+
+            path, transport_info = state.route(graph, goal)
+            total_value = g[goal]
+            if timed_out:
+                # Vòng bị ngắt: đường có thể đã tốt hơn, cận của vòng trước vẫn đúng
+                bound = best[3]
+            else:
+                # Mọi đường tốt hơn phải đi qua một nút của OPEN ∪ INCONS
+                lower = min((g[v] + h[v] for v in _open_nodes(open_set) + list(incons)), default=float('inf'))
+                bound = min(epsilon, total_value / lower) if lower > 0 else epsilon
+                bound = max(bound, 1.0)
+                solutions.append({
+                    "epsilon": epsilon,
+                    "suboptimality_bound": bound,
+                    "total_value": total_value,
+                    "iterations": iterations,
+                    "elapsed": time.perf_counter() - start_time,
+                })
+            if best is None or total_value < best[1] or not timed_out:
+                best = (path, total_value, transport_info, bound)
+                if progress is not None:
+                    progress(path, total_value, transport_info, bound)
+
+            if timed_out:
+                reason = "time_budget"
+                break
+            if bound <= 1.0 or epsilon <= 1.0:
+                reason = "optimal"
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                reason = "time_budget"
+                break
+
+            # Giảm epsilon, đưa INCONS vào lại hàng đợi và tính lại khóa của mọi nút đang mở
+            epsilon = max(1.0, min(epsilon - epsilon_step, bound))
+            pending = _open_nodes(open_set) + list(incons)
+            open_set = make_queue("lazy", graph.num_nodes)
+            for v in pending:
+                open_set.push(v, g[v] + epsilon * h[v])
+            incons.clear()
+            closed.clear()
+
+    if stats is not None:
+        stats.update(
+            iterations=iterations,
+            max_space=max_space,
+            solutions=solutions,
+            suboptimality_bound=best[3] if best is not None else float('inf'),
+            stop_reason=reason,
+        )
+
+    if best is None:
+        return [], float('inf'), []
+
+    path, total_value, transport_info, bound = best
+    print("Thuật toán ARA*")
+    print("Tìm thấy đường sau: ", iterations, " steps")
+    print("Đường đi: ", path)
+    print("Max space: ", max_space)
+    print("Hệ số dưới tối ưu tối đa: ", bound)
+
+    return path, total_value, transport_info
+
+
+def calculate_transport_options_ara(
+    start: str,
+    goal: str,
+    cost_priority: float = 0.5,
+    time_budget: Optional[float] = None,
+    progress: Optional[Callable[[Dict], None]] = None,
+    **kwargs,
+):
+    """
+    Tính toán các phương án vận chuyển sử dụng ARA*
+
+    Args:
+        start: Tỉnh/thành bắt đầu
+        goal: Tỉnh/thành đích
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+        time_budget: Thời gian chạy tối đa cho truy vấn này (giây)
+        progress: Hàm progress(result) nhận dictionary kết quả của mỗi lời giải trung gian
+            (cùng định dạng với kết quả cuối cùng)
+        kwargs: Các tham số khác của ara_star
+
+    Returns:
+        Dictionary chứa thông tin của phương án, cùng suboptimality_bound (tổng trọng số
+        không vượt quá suboptimality_bound lần tối ưu) và stop_reason
+    """
+    graph = get_graph()
+
+    def make_result(path, total_cost, transport_info, bound) -> Dict:
+        result = {
+            "path": [],
+            "distance": 0,
+            "time": 0,
+            "cost": 0,
+            "total_value": 0,
+            "heuristic_value": 0,
+            "transport_details": [],
+            "suboptimality_bound": bound,
+        }
+        if path:
+            result["path"] = path
+            segments_details = graph.route_details(transport_info)
+            result["distance"] = sum(s["distance"] for s in segments_details)
+            result["time"] = sum(s["time"] for s in segments_details)
+            result["cost"] = sum(s["cost"] for s in segments_details)
+            result["total_value"] = total_cost
+            result["heuristic_value"] = cost_priority * result["cost"] + (1 - cost_priority) * result["time"]
+            result["transport_details"] = segments_details
+        return result
+
+    if progress is not None:
+        kwargs["progress"] = lambda path, total_cost, transport_info, bound: progress(make_result(path, total_cost, transport_info, bound))
+    stats = {}
+    path, total_cost, transport_info = ara_star(start, goal, cost_priority, time_budget=time_budget, stats=stats, **kwargs)
+    result = make_result(path, total_cost, transport_info, stats.get("suboptimality_bound", float('inf')))
+    result["stop_reason"] = stats.get("stop_reason", "exhausted")
+    return result
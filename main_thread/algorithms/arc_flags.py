@@ -0,0 +1,280 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.search_state import search_state
+from utils.graph_builder import get_graph, set_graph
+from utils.heuristic_function import heuristic_table
+from utils.partition import DEFAULT_CELLS, graph_partition
+from utils.priority_queue import make_queue
+from utils.shortest_paths import dijkstra
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional, Tuple
+
+import numpy as np
+
+# Arc-flags: mỗi cạnh có một bitset, bit c bật nếu cạnh nằm trên một đường đi ngắn
+# nhất nào đó đến một nút thuộc ô c của phân vùng. Khi tìm đường đến đích thuộc ô c
+# chỉ cần xét các cạnh có bit c.
+
+# Sai số tương đối khi so sánh tổng trọng số để nhận diện mọi đường đi ngắn nhất
+SHORTEST_PATH_TOLERANCE = 1e-9
+
+# Số bộ cờ giữ trong cache, bộ ít dùng gần đây nhất bị bỏ trước
+FLAGS_CACHE_SIZE = 8
+
+# Cache (cells, flags, flags dạng list Python cho vòng lặp tìm kiếm) theo (phiên bản
+# đồ thị, cost_priority), thứ tự từ cũ đến mới dùng
+_flags: "OrderedDict[Tuple[str, float], Tuple[np.ndarray, np.ndarray, List[int]]]" = OrderedDict()
+_flags_lock = threading.Lock()
+
+
+def flags_prefix(cost_priority: float) -> str:
+    """Tiền tố tên bảng arc-flags ứng với cost_priority trong graph.tables"""
+    return f"af/{cost_priority:.6g}/"
+
+
+def _flag_dtype(num_cells: int):
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if num_cells <= np.iinfo(dtype).bits:
+            return dtype
+    raise ValueError(f"Arc-flags hỗ trợ tối đa 64 ô, phân vùng có {num_cells} ô")
+
+
+def cell_edge_flags(graph, cells: np.ndarray, cell: int, cost_priority: float) -> np.ndarray:
+    """
+    Các cạnh của đồ thị nằm trên đường đi ngắn nhất đến ô cell: cạnh bên
+    trong ô, và mọi cạnh thuộc một cây đường đi ngắn nhất (tính ngược) đến một nút
+    biên của ô (nút trong ô có cạnh đi vào từ ngoài ô).
+
+    Returns:
+        Mảng bool độ dài num_edges
+    """
+    weights = graph.edge_weight_array(cost_priority)
+    weight_list = graph.edge_weights(cost_priority)
+    tails = np.repeat(np.arange(graph.num_nodes), np.diff(graph.indptr))
+    heads = graph.targets
+
+    in_cell = cells == cell
+    flags = in_cell[tails] & in_cell[heads]
+
+    boundary = np.unique(heads[in_cell[heads] & ~in_cell[tails]])
+    for b in boundary:
+        dist, _ = dijkstra(graph, int(b), weight_list, reverse=True)
+        # Cạnh u -> v nằm trên một đường ngắn nhất đến b khi d(u) = w(u, v) + d(v)
+        via = weights + dist[heads]
+        with np.errstate(invalid="ignore"):
+            flags |= np.isfinite(via) & (np.abs(dist[tails] - via) <= SHORTEST_PATH_TOLERANCE * np.maximum(1.0, via))
+    return flags
+
+
+def _cell_edge_flags_worker(cells: np.ndarray, cell: int, cost_priority: float) -> np.ndarray:
+    # Tiến trình con nhận đồ thị một lần qua initializer=set_graph
+    return cell_edge_flags(get_graph(), cells, cell, cost_priority)
+
+
+def compute_arc_flags(graph, cost_priority: float = 0.5, num_cells: int = DEFAULT_CELLS, workers: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Tiền xử lý arc-flags cho một mức cost_priority, mỗi ô của phân vùng được xử lý
+    song song trong một tiến trình riêng.
+
+    Args:
+        graph: CompiledGraph
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+        num_cells: Số ô khi đồ thị không có tiểu vùng logistics (xem utils/partition.py)
+        workers: Số tiến trình (mặc định: số CPU); 1 để chạy tuần tự
+
+    Returns:
+        Dictionary tên bảng -> mảng, lưu được trong graph.tables / file snapshot:
+        cells (id ô của mỗi nút), flags (bitset của mỗi cạnh)
+    """
+    cost_priority = max(0.0, min(1.0, cost_priority))
+    cells, _ = graph_partition(graph, num_cells)
+    num = int(cells.max()) + 1
+    dtype = _flag_dtype(num)
+
+    if workers == 1:
+        results = [cell_edge_flags(graph, cells, c, cost_priority) for c in range(num)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=set_graph, initargs=(graph,)) as pool:
+            results = list(pool.map(_cell_edge_flags_worker, [cells] * num, range(num), [cost_priority] * num))
+
+    flags = np.zeros(graph.num_edges, dtype=dtype)
+    for c, mask in enumerate(results):
+        flags[mask] |= dtype(1) << dtype(c)
+
+    prefix = flags_prefix(cost_priority)
+    return {prefix + "cells": cells, prefix + "flags": flags}
+
+
+def _cached_flags(graph, cost_priority: float) -> Tuple[np.ndarray, np.ndarray, List[int]]:
+    """(cells, flags, flags.tolist()) từ cache, tính một lần cho mỗi (phiên bản đồ thị, cost_priority)"""
+    cost_priority = max(0.0, min(1.0, cost_priority))
+    key = (graph.version, cost_priority)
+    with _flags_lock:
+        entry = _flags.get(key)
+        if entry is None:
+            prefix = flags_prefix(cost_priority)
+            source = graph.tables if prefix + "flags" in graph.tables else compute_arc_flags(graph, cost_priority)
+            flags = source[prefix + "flags"]
+            entry = (source[prefix + "cells"], flags, flags.tolist())
+            _flags[key] = entry
+            while len(_flags) > FLAGS_CACHE_SIZE:
+                _flags.popitem(last=False)
+        else:
+            _flags.move_to_end(key)
+    return entry
+
+
+def get_arc_flags(graph, cost_priority: float = 0.5) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (cells, flags) của đồ thị cho cost_priority: lấy từ cache (tối đa FLAGS_CACHE_SIZE
+    bộ cờ), từ graph.tables (snapshot đã lưu kèm, nạp bằng mmap) hoặc tiền xử lý ở lần
+    gọi đầu tiên.
+    """
+    cells, flags, _ = _cached_flags(graph, cost_priority)
+    return cells, flags
+
+
+def arc_flags_search(start_province: str, goal_province: str, cost_priority: float = 0.5, use_heuristic: bool = False, queue_type: str = "lazy", stats: Optional[Dict] = None):
+    print("Đường đi từ: ", start_province, " đến: ", goal_province)
+    """
+    UCS (hoặc A* nếu use_heuristic) chỉ xét các cạnh có cờ của ô chứa đích
+
+    Args:
+        start_province: Tỉnh/thành bắt đầu
+        goal_province: Tỉnh/thành đích
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+        use_heuristic: True để cộng heuristic vào khóa như A*; dùng cận dưới landmark (ALT)
+            vì heuristic địa lý không phải cận dưới và sẽ cho đường không tối ưu
+        queue_type: Loại hàng đợi ưu tiên ("binary", "4-ary", "lazy"), xem utils/priority_queue.py
+        stats: Nếu truyền vào một dictionary, số bước (iterations) và không gian tối đa (max_space) được ghi vào đó
+
+    Returns:
+        Tuple chứa đường đi, tổng chi phí và thông tin vận chuyển
+    """
+    # Lấy đồ thị đã biên dịch dùng chung
+    graph = get_graph()
+    indptr, targets, _ = graph.adjacency()
+
+    # Đảm bảo cost_priority nằm trong khoảng [0, 1]
+    cost_priority = max(0.0, min(1.0, cost_priority))
+    weights = graph.edge_weights(cost_priority)
+
+    # Kiểm tra tỉnh/thành bắt đầu và đích có tồn tại không
+    if start_province not in graph.index or goal_province not in graph.index:
+        return [], float('inf'), []
+
+    # Trường hợp đặc biệt: nếu bắt đầu và đích là cùng một tỉnh
+    if start_province == goal_province:
+        return [start_province], 0.0, []
+
+    start = graph.index[start_province]
+    goal = graph.index[goal_province]
+
+    cells, _, flags = _cached_flags(graph, cost_priority)
+    bit = 1 << int(cells[goal])
+    h = heuristic_table(graph, goal, cost_priority, "alt") if use_heuristic else None
+
+    # Trạng thái tìm kiếm riêng của truy vấn này, lưu trong các mảng theo id nút
+    with search_state(graph) as state:
+        g, parent, parent_edge = state.g, state.parent, state.parent_edge
+        seen, closed, epoch = state.seen, state.closed, state.epoch
+
+        state.open(start, 0.0)
+        open_set = make_queue(queue_type, graph.num_nodes)
+        open_set.push(start, h[start] if h else 0.0)
+
+        max_iterations = max(10000, graph.num_nodes)
+        iterations = 0
+        max_space = 0
+        closed_set_size = 0
+
+        while open_set and iterations < max_iterations:
+            iterations += 1
+            _, u = open_set.pop()
+
+            # Nếu đã đến đích, truy vết lại đường đi
+            if u == goal:
+                path, transport_info = state.route(graph, goal)
+
+                if stats is not None:
+                    stats.update(iterations=iterations, max_space=max_space)
+
+                print("Thuật toán Arc-flags")
+                print("Tìm thấy đường sau: ", iterations, " steps")
+                print("Đường đi: ", path)
+                print("Max space: ", max_space)
+
+                return path, g[goal], transport_info
+
+            closed[u] = epoch
+            closed_set_size += 1
+
+            if len(open_set) + closed_set_size > max_space:
+                max_space = len(open_set) + closed_set_size
+
+            # Chỉ xét các cạnh có cờ của ô chứa đích
+            g_u = g[u]
+            for e in range(indptr[u], indptr[u + 1]):
+                if not flags[e] & bit:
+                    continue
+                v = targets[e]
+                if closed[v] == epoch:
+                    continue
+
+                tentative_g_x = g_u + weights[e]
+                if seen[v] != epoch or tentative_g_x < g[v]:
+                    g[v] = tentative_g_x
+                    parent[v] = u
+                    parent_edge[v] = e
+                    seen[v] = epoch
+                    open_set.push(v, tentative_g_x + h[v] if h else tentative_g_x)
+
+    # Không tìm thấy đường đi
+    return [], float('inf'), []
+
+
+def calculate_transport_options_arc_flags(start: str, goal: str, cost_priority: float = 0.5, use_heuristic: bool = False):
+    """
+    Tính toán các phương án vận chuyển sử dụng UCS / A* với arc-flags
+
+    Args:
+        start: Tỉnh/thành bắt đầu
+        goal: Tỉnh/thành đích
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+        use_heuristic: True để dùng A* thay cho UCS
+
+    Returns:
+        Dictionary chứa thông tin của phương án
+    """
+    # Kết quả trả về
+    result = {
+        "path": [],
+        "distance": 0,
+        "time": 0,
+        "cost": 0,
+        "total_value": 0,
+        "transport_details": []
+    }
+
+    path, total_cost, transport_info = arc_flags_search(start, goal, cost_priority, use_heuristic)
+
+    # Nếu tìm được đường đi
+    if path:
+        result["path"] = path
+
+        # Thông tin chi tiết từng đoạn lấy trực tiếp từ các cạnh của đồ thị
+        segments_details = get_graph().route_details(transport_info)
+
+        # Cập nhật kết quả
+        result["distance"] = sum(s["distance"] for s in segments_details)
+        result["time"] = sum(s["time"] for s in segments_details)
+        result["cost"] = sum(s["cost"] for s in segments_details)
+        result["total_value"] = total_cost
+        result["transport_details"] = segments_details
+
+    return result
@@ -0,0 +1,280 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.search_state import search_state
+from utils.graph_builder import get_graph
+from utils.priority_queue import INTEGER_QUEUES, make_queue
+from utils.heuristic_function import HEURISTIC_MODES, heuristic_array
+
+from typing import List, Dict, Optional
+
+# Tìm kiếm hai chiều: một lượt tìm xuôi từ điểm xuất phát trên danh sách kề và
+# một lượt tìm ngược từ đích trên danh sách kề ngược, dừng khi hai lượt gặp nhau
+# và không còn đường nào ngắn hơn đường tốt nhất đã thấy (mu).
+
+
+def _bidirectional_search(graph, start: int, goal: int, weights: List[float], potential: Optional[List[float]], queue_type: str):
+    """
+    Lõi chung của UCS hai chiều và A* hai chiều.
+
+    potential là thế năng p(v) của lượt xuôi; lượt ngược dùng -p(v). Khóa trong
+    hàng đợi xuôi là g_f(v) + p(v), hàng đợi ngược là g_b(v) - p(v). Vì hai lượt
+    cùng chạy trên trọng số rút gọn w(u, v) - p(u) + p(v), điều kiện dừng là
+    top_f + top_b >= mu. potential là None tương ứng với UCS hai chiều (p = 0).
+
+    Returns:
+        Tuple (danh sách chỉ số cạnh từ start đến goal hoặc None, số nút đã chốt của mỗi chiều, max_space)
+    """
+    if queue_type in INTEGER_QUEUES:
+        raise ValueError("Tìm kiếm hai chiều chỉ hỗ trợ hàng đợi khóa số thực (binary, 4-ary, lazy)")
+
+    indptr, targets, _ = graph.adjacency()
+    rindptr, sources, redges = graph.reverse_adjacency()
+
+    with search_state(graph) as forward, search_state(graph) as backward:
+        forward.open(start, 0.0)
+        backward.open(goal, 0.0)
+
+        open_f = make_queue(queue_type, graph.num_nodes)
+        open_b = make_queue(queue_type, graph.num_nodes)
+        open_f.push(start, potential[start] if potential else 0.0)
+        open_b.push(goal, -potential[goal] if potential else 0.0)
+
+        # Đường tốt nhất đã thấy: giá trị mu và cạnh nối (u -> v) giữa hai lượt tìm
+        mu = float('inf')
+        meeting_edge = -1
+
+        settled = [0, 0]
+        max_space = 0
+        max_iterations = max(10000, 2 * graph.num_nodes)
+        iterations = 0
+
+        while open_f and open_b and iterations < max_iterations:
+            iterations += 1
+
+            # Dừng khi tổng hai khóa nhỏ nhất không nhỏ hơn đường tốt nhất
+            top_f = open_f.peek()[0]
+            top_b = open_b.peek()[0]
+            if top_f + top_b >= mu:
+                break
+
+            # Mở rộng phía có khóa nhỏ nhất nhỏ hơn
+            if top_f <= top_b:
+                side, this, other, open_set = 0, forward, backward, open_f
+                ptr, adjacent, edges, sign = indptr, targets, None, 1.0
+            else:
+                side, this, other, open_set = 1, backward, forward, open_b
+                ptr, adjacent, edges, sign = rindptr, sources, redges, -1.0
+
+            _, u = open_set.pop()
+            this.close(u)
+            settled[side] += 1
+
+            g, parent, parent_edge, seen, closed, epoch = this.g, this.parent, this.parent_edge, this.seen, this.closed, this.epoch
+            other_g, other_seen, other_epoch = other.g, other.seen, other.epoch
+            g_u = g[u]
+
+            for i in range(ptr[u], ptr[u + 1]):
+                v = adjacent[i]
+                e = i if edges is None else edges[i]
+
+                tentative_g_x = g_u + weights[e]
+
+                # Nút v đã được lượt tìm kia gặp: cập nhật đường tốt nhất qua cạnh e
+                if other_seen[v] == other_epoch and tentative_g_x + other_g[v] < mu:
+                    mu = tentative_g_x + other_g[v]
+                    meeting_edge = e
+
+                if closed[v] == epoch:
+                    continue
+
+                if seen[v] != epoch or tentative_g_x < g[v]:
+                    g[v] = tentative_g_x
+                    parent[v] = u
+                    parent_edge[v] = e
+                    seen[v] = epoch
+                    open_set.push(v, tentative_g_x + sign * potential[v] if potential else tentative_g_x)
+
+            if len(open_f) + len(open_b) + settled[0] + settled[1] > max_space:
+                max_space = len(open_f) + len(open_b) + settled[0] + settled[1]
+
+        if meeting_edge < 0:
+            return None, settled, max_space
+
+        # Ghép nửa đường xuôi start -> u, cạnh nối u -> v và nửa đường ngược v -> goal
+        u, v = graph.edge_tail(meeting_edge), targets[meeting_edge]
+        edge_ids = []
+        x = u
+        while x != start:
+            edge_ids.append(forward.parent_edge[x])
+            x = forward.parent[x]
+        edge_ids.reverse()
+        edge_ids.append(meeting_edge)
+        x = v
+        while x != goal:
+            edge_ids.append(backward.parent_edge[x])
+            x = backward.parent[x]
+        return edge_ids, settled, max_space
+
+
+
+def _run(name: str, start_province: str, goal_province: str, cost_priority: float, queue_type: str, stats: Optional[Dict], heuristic_mode: Optional[str]):
+    print("Đường đi từ: ", start_province, " đến: ", goal_province)
+
+    # Lấy đồ thị đã biên dịch dùng chung
+    graph = get_graph()
+
+    # Đảm bảo cost_priority nằm trong khoảng [0, 1]
+    cost_priority = max(0.0, min(1.0, cost_priority))
+    weights = graph.edge_weights(cost_priority)
+
+    # Kiểm tra tỉnh/thành bắt đầu và đích có tồn tại không
+    if start_province not in graph.index or goal_province not in graph.index:
+        return [], float('inf'), []
+
+    # Trường hợp đặc biệt: nếu bắt đầu và đích là cùng một tỉnh
+    if start_province == goal_province:
+        return [start_province], 0.0, []
+
+    start = graph.index[start_province]
+    goal = graph.index[goal_province]
+
+    # Thế năng trung bình p(v) = (h(v, goal) - h(v, start)) / 2, dùng chung cho hai chiều
+    potential = None
+    if heuristic_mode is not None:
+        potential = ((heuristic_array(graph, goal, cost_priority, heuristic_mode) - heuristic_array(graph, start, cost_priority, heuristic_mode)) / 2).tolist()
+
+    edge_ids, settled, max_space = _bidirectional_search(graph, start, goal, weights, potential, queue_type)
+
+    if stats is not None:
+        stats.update(
+            iterations=settled[0] + settled[1],
+            max_space=max_space,
+            settled=settled[0] + settled[1],
+            settled_forward=settled[0],
+            settled_backward=settled[1],
+        )
+
+    # Không tìm thấy đường đi
+    if edge_ids is None:
+        return [], float('inf'), []
+
+    path, transport_info = graph.edge_route(start, edge_ids)
+    total_value = 0.0
+    for e in edge_ids:
+        total_value += weights[e]
+
+    print("Thuật toán", name)
+    print("Số nút đã chốt: ", settled[0], " (xuôi) + ", settled[1], " (ngược)")
+    print("Đường đi: ", path)
+    print("Max space: ", max_space)
+
+    return path, total_value, transport_info
+
+
+def bidirectional_ucs(start_province: str, goal_province: str, cost_priority: float = 0.5, queue_type: str = "lazy", stats: Optional[Dict] = None):
+    """
+    UCS hai chiều (Dijkstra hai chiều) tìm đường đi tối ưu giữa hai tỉnh/thành
+
+    Args:
+        start_province: Tỉnh/thành bắt đầu
+        goal_province: Tỉnh/thành đích
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+        queue_type: Loại hàng đợi ưu tiên ("binary", "4-ary", "lazy"), xem utils/priority_queue.py
+        stats: Nếu truyền vào một dictionary, số nút đã chốt mỗi chiều (settled_forward,
+            settled_backward), tổng (settled) và không gian tối đa (max_space) được ghi vào đó
+
+    Returns:
+        Tuple chứa đường đi, tổng chi phí và thông tin vận chuyển
+    """
+    return _run("UCS hai chiều", start_province, goal_province, cost_priority, queue_type, stats, heuristic_mode=None)
+
+
+def bidirectional_a_star(start_province: str, goal_province: str, cost_priority: float = 0.5, queue_type: str = "lazy", stats: Optional[Dict] = None, heuristic_mode: str = "alt"):
+    """
+    A* hai chiều với thế năng trung bình (consistent average potentials): lượt xuôi
+    dùng p(v) = (h(v, goal) - h(v, start)) / 2, lượt ngược dùng -p(v). Điều kiện dừng
+    chỉ đúng khi heuristic nhất quán, nên chỉ nhận heuristic ALT; heuristic địa lý
+    không phải cận dưới trên dữ liệu này và bị từ chối.
+
+    Args:
+        start_province: Tỉnh/thành bắt đầu
+        goal_province: Tỉnh/thành đích
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+        queue_type: Loại hàng đợi ưu tiên ("binary", "4-ary", "lazy"), xem utils/priority_queue.py
+        stats: Nếu truyền vào một dictionary, số nút đã chốt mỗi chiều (settled_forward,
+            settled_backward), tổng (settled) và không gian tối đa (max_space) được ghi vào đó
+        heuristic_mode: Loại heuristic ("alt", "alt-regions"), xem utils/heuristic_function.py
+
+    Returns:
+        Tuple chứa đường đi, tổng chi phí và thông tin vận chuyển
+    """
+    if HEURISTIC_MODES.get(heuristic_mode) is None:
+        consistent = sorted(mode for mode, method in HEURISTIC_MODES.items() if method is not None)
+        raise ValueError(f"A* hai chiều cần heuristic nhất quán, chọn một trong {consistent}, nhận {heuristic_mode!r}")
+    return _run("A* hai chiều", start_province, goal_province, cost_priority, queue_type, stats, heuristic_mode=heuristic_mode)
+
+
+def _transport_options(search, start: str, goal: str, cost_priority: float, **kwargs) -> Dict:
+    # Kết quả trả về
+    result = {
+        "path": [],
+        "distance": 0,
+        "time": 0,
+        "cost": 0,
+        "total_value": 0,
+        "settled_nodes": 0,
+        "transport_details": []
+    }
+
+    stats = {}
+    path, total_cost, transport_info = search(start, goal, cost_priority, stats=stats, **kwargs)
+    result["settled_nodes"] = stats.get("settled", 0)
+
+    # Nếu tìm được đường đi
+    if path:
+        result["path"] = path
+
+        # Thông tin chi tiết từng đoạn lấy trực tiếp từ các cạnh của đồ thị
+        segments_details = get_graph().route_details(transport_info)
+
+        # Cập nhật kết quả
+        result["distance"] = sum(s["distance"] for s in segments_details)
+        result["time"] = sum(s["time"] for s in segments_details)
+        result["cost"] = sum(s["cost"] for s in segments_details)
+        result["total_value"] = total_cost
+        result["transport_details"] = segments_details
+
+    return result
+
+
+def calculate_transport_options_bidirectional_ucs(start: str, goal: str, cost_priority: float = 0.5):
+    """
+    Tính toán các phương án vận chuyển sử dụng UCS hai chiều
+
+    Args:
+        start: Tỉnh/thành bắt đầu
+        goal: Tỉnh/thành đích
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+
+    Returns:
+        Dictionary chứa thông tin của phương án, kèm số nút đã chốt (settled_nodes)
+    """
+    return _transport_options(bidirectional_ucs, start, goal, cost_priority)
+
+
+def calculate_transport_options_bidirectional_a_star(start: str, goal: str, cost_priority: float = 0.5, heuristic_mode: str = "alt"):
+    """
+    Tính toán các phương án vận chuyển sử dụng A* hai chiều
+
+    Args:
+        start: Tỉnh/thành bắt đầu
+        goal: Tỉnh/thành đích
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+        heuristic_mode: Loại heuristic ("alt", "alt-regions")
+
+    Returns:
+        Dictionary chứa thông tin của phương án, kèm số nút đã chốt (settled_nodes)
+    """
+    return _transport_options(bidirectional_a_star, start, goal, cost_priority, heuristic_mode=heuristic_mode)
@@ -0,0 +1,298 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.contraction_hierarchy import ContractionHierarchy
+from utils.graph_builder import get_graph
+
+import heapq
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
+
+import numpy as np
+
+# Giới hạn số nút được chốt trong mỗi lượt tìm đường chứng (witness search).
+# Khi vượt giới hạn, cạnh tắt được thêm vào (luôn đúng, chỉ tốn thêm cạnh).
+WITNESS_SETTLE_LIMIT = 500
+
+# Số hierarchy giữ trong cache; mỗi giá trị cost_priority khác nhau (ví dụ mỗi vị trí
+# của thanh trượt) là một hierarchy, hierarchy ít dùng gần đây nhất bị bỏ trước
+HIERARCHY_CACHE_SIZE = 8
+
+# Cache hierarchy theo (phiên bản đồ thị, cost_priority), thứ tự từ cũ đến mới dùng
+_hierarchies: "OrderedDict[Tuple[str, float], ContractionHierarchy]" = OrderedDict()
+_hierarchies_lock = threading.Lock()
+
+
+def _witness_search(out_adj: List[Dict], source: int, excluded: int, max_cost: float, targets: Dict[int, float]) -> Dict[int, float]:
+    """
+    Dijkstra giới hạn từ source trên đồ thị còn lại (bỏ qua nút excluded), dừng khi
+    khoảng cách vượt max_cost, đã chốt hết các targets hoặc chạm WITNESS_SETTLE_LIMIT.
+    """
+    dist = {source: 0.0}
+    heap = [(0.0, source)]
+    remaining = len(targets)
+    settled = 0
+    while heap and remaining and settled < WITNESS_SETTLE_LIMIT:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        if d > max_cost:
+            break
+        settled += 1
+        if u in targets:
+            remaining -= 1
+        for v, (w, _) in out_adj[u].items():
+            if v == excluded:
+                continue
+            nd = d + w
+            if nd < dist.get(v, float('inf')):
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return dist
+
+
+def _shortcuts(out_adj: List[Dict], in_adj: List[Dict], v: int) -> List[Tuple[int, int, float, int, int]]:
+    """Các cạnh tắt (u, w, trọng số, cạnh u -> v, cạnh v -> w) cần thêm khi co nút v"""
+    shortcuts = []
+    for u, (w_uv, e_uv) in in_adj[v].items():
+        candidates = {w: w_uv + w_vw for w, (w_vw, _) in out_adj[v].items() if w != u}
+        if not candidates:
+            continue
+        dist = _witness_search(out_adj, u, v, max(candidates.values()), candidates)
+        for w, cost in candidates.items():
+            if dist.get(w, float('inf')) > cost:
+                shortcuts.append((u, w, cost, e_uv, out_adj[v][w][1]))
+    return shortcuts
+
+
+def build_contraction_hierarchy(graph, cost_priority: float = 0.5) -> ContractionHierarchy:
+    """
+    Tiền xử lý Contraction Hierarchy cho một mức cost_priority.
+
+    Các nút được co lần lượt theo thứ tự ưu tiên (edge difference + số hàng xóm đã
+    bị co), cập nhật lười: nút lấy ra khỏi heap được tính lại độ ưu tiên và chỉ được
+    co nếu vẫn nhỏ nhất. Khi co nút v, mỗi cặp u -> v -> w không có đường chứng
+    ngắn hơn hoặc bằng sẽ sinh một cạnh tắt u -> w.
+
+    Args:
+        graph: CompiledGraph
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+
+    Returns:
+        ContractionHierarchy
+    """
+    cost_priority = max(0.0, min(1.0, cost_priority))
+    n = graph.num_nodes
+    indptr, targets, _ = graph.adjacency()
+    weights = graph.edge_weights(cost_priority)
+
+    # Danh sách cạnh CH: cạnh gốc trước, cạnh tắt được nối thêm khi co nút
+    tails, heads, ch_weights, first, second = [], [], [], [], []
+
+    # Đồ thị còn lại: out_adj[u][v] = in_adj[v][u] = (trọng số, cạnh CH), giữ cạnh song song rẻ nhất
+    out_adj = [dict() for _ in range(n)]
+    in_adj = [dict() for _ in range(n)]
+    for u in range(n):
+        for e in range(indptr[u], indptr[u + 1]):
+            v = targets[e]
+            if v == u:
+                continue
+            current = out_adj[u].get(v)
+            if current is None or weights[e] < current[0]:
+                if current is None:
+                    i = len(tails)
+                    tails.append(u)
+                    heads.append(v)
+                    ch_weights.append(weights[e])
+                    first.append(-1)
+                    second.append(e)
+                else:
+                    i = current[1]
+                    ch_weights[i] = weights[e]
+                    second[i] = e
+                out_adj[u][v] = in_adj[v][u] = (weights[e], i)
+
+    deleted_neighbors = [0] * n
+
+    def priority(v: int, shortcuts: List) -> int:
+        return len(shortcuts) - len(in_adj[v]) - len(out_adj[v]) + deleted_neighbors[v]
+
+    heap = [(priority(v, _shortcuts(out_adj, in_adj, v)), v) for v in range(n)]
+    heapq.heapify(heap)
+    rank = [0] * n
+    order = 0
+
+    while heap:
+        _, v = heapq.heappop(heap)
+        # Cập nhật lười: nếu độ ưu tiên mới không còn nhỏ nhất thì đưa lại vào heap
+        shortcuts = _shortcuts(out_adj, in_adj, v)
+        p = priority(v, shortcuts)
+        if heap and p > heap[0][0]:
+            heapq.heappush(heap, (p, v))
+            continue
+
+        for u, w, cost, e_uv, e_vw in shortcuts:
+            current = out_adj[u].get(w)
+            if current is not None and current[0] <= cost:
+                continue
+            i = len(tails)
+            tails.append(u)
+            heads.append(w)
+            ch_weights.append(cost)
+            first.append(e_uv)
+            second.append(e_vw)
+            out_adj[u][w] = in_adj[w][u] = (cost, i)
+
+        # Gỡ v khỏi đồ thị còn lại
+        for u in in_adj[v]:
+            del out_adj[u][v]
+            deleted_neighbors[u] += 1
+        for w in out_adj[v]:
+            del in_adj[w][v]
+            deleted_neighbors[w] += 1
+        in_adj[v] = {}
+        out_adj[v] = {}
+
+        rank[v] = order
+        order += 1
+
+    rank = np.asarray(rank, dtype=np.int32)
+    tails = np.asarray(tails, dtype=np.int32)
+    heads = np.asarray(heads, dtype=np.int32)
+
+    # Cạnh đi lên theo rank, nhóm theo nút đầu (lượt xuôi) và theo nút cuối (lượt ngược)
+    upward = rank[heads] > rank[tails]
+    up_edges = np.flatnonzero(upward)
+    up_edges = up_edges[np.argsort(tails[up_edges], kind="stable")]
+    down_edges = np.flatnonzero(~upward)
+    down_edges = down_edges[np.argsort(heads[down_edges], kind="stable")]
+
+    up_indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(tails[up_edges], minlength=n), out=up_indptr[1:])
+    down_indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(heads[down_edges], minlength=n), out=down_indptr[1:])
+
+    return ContractionHierarchy(cost_priority, {
+        "rank": rank,
+        "tails": tails,
+        "heads": heads,
+        "weights": np.asarray(ch_weights, dtype=np.float64),
+        "first": np.asarray(first, dtype=np.int32),
+        "second": np.asarray(second, dtype=np.int32),
+        "up_indptr": up_indptr,
+        "up_edges": up_edges.astype(np.int32),
+        "down_indptr": down_indptr,
+        "down_edges": down_edges.astype(np.int32),
+    })
+
+
+def get_hierarchy(graph, cost_priority: float = 0.5) -> ContractionHierarchy:
+    """
+    Hierarchy của đồ thị cho cost_priority: lấy từ cache (tối đa HIERARCHY_CACHE_SIZE
+    hierarchy), từ graph.tables (snapshot đã lưu kèm hierarchy, nạp bằng mmap) hoặc
+    tiền xử lý ở lần gọi đầu tiên.
+    """
+    cost_priority = max(0.0, min(1.0, cost_priority))
+    key = (graph.version, cost_priority)
+    with _hierarchies_lock:
+        hierarchy = _hierarchies.get(key)
+        if hierarchy is None:
+            hierarchy = ContractionHierarchy.from_tables(graph.tables, cost_priority)
+            if hierarchy is None:
+                hierarchy = build_contraction_hierarchy(graph, cost_priority)
+            _hierarchies[key] = hierarchy
+            while len(_hierarchies) > HIERARCHY_CACHE_SIZE:
+                _hierarchies.popitem(last=False)
+        else:
+            _hierarchies.move_to_end(key)
+    return hierarchy
+
+
+def contraction_hierarchy_search(start_province: str, goal_province: str, cost_priority: float = 0.5, stats: Optional[Dict] = None):
+    """
+    Tìm đường đi tối ưu bằng Contraction Hierarchy (tìm kiếm hai chiều chỉ đi lên)
+
+    Args:
+        start_province: Tỉnh/thành bắt đầu
+        goal_province: Tỉnh/thành đích
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+        stats: Nếu truyền vào một dictionary, số nút đã chốt (settled) được ghi vào đó
+
+    Returns:
+        Tuple chứa đường đi, tổng chi phí và thông tin vận chuyển
+    """
+    # Lấy đồ thị đã biên dịch dùng chung
+    graph = get_graph()
+
+    # Đảm bảo cost_priority nằm trong khoảng [0, 1]
+    cost_priority = max(0.0, min(1.0, cost_priority))
+
+    # Kiểm tra tỉnh/thành bắt đầu và đích có tồn tại không
+    if start_province not in graph.index or goal_province not in graph.index:
+        return [], float('inf'), []
+
+    # Trường hợp đặc biệt: nếu bắt đầu và đích là cùng một tỉnh
+    if start_province == goal_province:
+        return [start_province], 0.0, []
+
+    start = graph.index[start_province]
+    hierarchy = get_hierarchy(graph, cost_priority)
+    _, ch_edges = hierarchy.query(start, graph.index[goal_province], stats)
+
+    # Không tìm thấy đường đi
+    if ch_edges is None:
+        return [], float('inf'), []
+
+    # Giải nén cạnh tắt thành dãy cạnh gốc (đường bộ / đường bay)
+    edge_ids = hierarchy.unpack(ch_edges)
+    path, transport_info = graph.edge_route(start, edge_ids)
+
+    weights = graph.edge_weights(cost_priority)
+    total_value = 0.0
+    for e in edge_ids:
+        total_value += weights[e]
+
+    return path, total_value, transport_info
+
+
+def calculate_transport_options_ch(start: str, goal: str, cost_priority: float = 0.5):
+    """
+    Tính toán các phương án vận chuyển sử dụng Contraction Hierarchies
+
+    Args:
+        start: Tỉnh/thành bắt đầu
+        goal: Tỉnh/thành đích
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+
+    Returns:
+        Dictionary chứa thông tin của phương án
+    """
+    # Kết quả trả về
+    result = {
+        "path": [],
+        "distance": 0,
+        "time": 0,
+        "cost": 0,
+        "total_value": 0,
+        "transport_details": []
+    }
+
+    path, total_cost, transport_info = contraction_hierarchy_search(start, goal, cost_priority)
+
+    # Nếu tìm được đường đi
+    if path:
+        result["path"] = path
+
+        # Thông tin chi tiết từng đoạn lấy trực tiếp từ các cạnh của đồ thị
+        segments_details = get_graph().route_details(transport_info)
+
+        # Cập nhật kết quả
+        result["distance"] = sum(s["distance"] for s in segments_details)
+        result["time"] = sum(s["time"] for s in segments_details)
+        result["cost"] = sum(s["cost"] for s in segments_details)
+        result["total_value"] = total_cost
+        result["transport_details"] = segments_details
+
+    return result
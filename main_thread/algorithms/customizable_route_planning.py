@@ -0,0 +1,262 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.overlay_graph import MultilevelOverlay
+from utils.graph_builder import get_graph
+from utils.partition import DEFAULT_CELLS, graph_partition, refine_partition
+
+import heapq
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Customizable Route Planning: phân vùng lồng nhau và cấu trúc overlay chỉ phụ thuộc
+# hình dạng đồ thị nên được dựng một lần. Khi đổi cost_priority (hoặc mô hình chi phí)
+# chỉ cần customization: tính lại trọng số clique của từng ô, từ tầng mịn nhất lên.
+
+# Số tầng overlay: tầng trên cùng là logistics_regions (hoặc DEFAULT_CELLS ô cân bằng),
+# mỗi tầng bên dưới chia mỗi ô của tầng trên thành OVERLAY_BRANCHING ô con
+DEFAULT_OVERLAY_LEVELS = 2
+OVERLAY_BRANCHING = 4
+
+# Số bộ trọng số clique giữ trong cache cho mỗi đồ thị (thanh trượt cost_priority
+# tạo ra nhiều giá trị khác nhau, bộ ít dùng gần đây nhất bị bỏ trước)
+MAX_CUSTOMIZATIONS = 32
+
+# Cache overlay theo phiên bản đồ thị, trọng số clique theo (phiên bản đồ thị, cost_priority)
+_overlays: Dict[str, MultilevelOverlay] = {}
+_customizations: "OrderedDict[Tuple[str, float], Tuple[List[np.ndarray], List[List[float]]]]" = OrderedDict()
+_overlay_lock = threading.Lock()
+
+
+def build_overlay(graph, levels: int = DEFAULT_OVERLAY_LEVELS, branching: int = OVERLAY_BRANCHING, num_cells: int = DEFAULT_CELLS) -> MultilevelOverlay:
+    """
+    Dựng overlay không phụ thuộc trọng số (bước tiền xử lý một lần của CRP).
+
+    Args:
+        graph: CompiledGraph
+        levels: Số tầng phân vùng
+        branching: Số ô con mỗi ô được chia ở tầng bên dưới
+        num_cells: Số ô tầng trên cùng khi đồ thị không có tiểu vùng logistics
+
+    Returns:
+        MultilevelOverlay
+    """
+    cells, _ = graph_partition(graph, num_cells)
+    partition = [cells]
+    for _ in range(levels - 1):
+        partition.append(refine_partition(graph, partition[-1], branching))
+    partition.reverse()
+    return MultilevelOverlay(graph, partition)
+
+
+def customize_overlay(overlay: MultilevelOverlay, weights: Sequence[float]) -> List[np.ndarray]:
+    """
+    Tính trọng số clique của mọi ô cho một bộ trọng số cạnh, từ tầng 1 lên. Mỗi ô chạy
+    Floyd–Warshall trên ma trận của đồ thị cục bộ (một phép min-plus NumPy cho mỗi nút).
+
+    Args:
+        overlay: MultilevelOverlay
+        weights: Trọng số cạnh gốc, ví dụ graph.edge_weight_array(cost_priority) hoặc
+            một mô hình chi phí khác
+
+    Returns:
+        Danh sách mảng trọng số clique, mỗi tầng một mảng (inf nếu entry không đến
+        được exit bên trong ô)
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    cliques: List[np.ndarray] = []
+    for l, local in enumerate(overlay.local):
+        clique = np.full(int(overlay.offsets[l][-1]), np.inf)
+        for c, (nodes, (src, dst, edges), (csrc, cdst, cpos), entry_local, exit_local) in enumerate(local):
+            if not len(entry_local) or not len(exit_local):
+                continue
+            k = len(nodes)
+            m = np.full((k, k), np.inf)
+            np.fill_diagonal(m, 0.0)
+            np.minimum.at(m, (src, dst), weights[edges])
+            if l:
+                np.minimum.at(m, (csrc, cdst), cliques[l - 1][cpos])
+            for x in range(k):
+                np.minimum(m, m[:, x, None] + m[None, x, :], out=m)
+            clique[overlay.offsets[l][c]:overlay.offsets[l][c + 1]] = m[np.ix_(entry_local, exit_local)].ravel()
+        cliques.append(clique)
+    return cliques
+
+
+def get_overlay(graph) -> MultilevelOverlay:
+    """Overlay của đồ thị: lấy từ cache hoặc dựng ở lần gọi đầu tiên"""
+    overlay = _overlays.get(graph.version)
+    if overlay is None:
+        with _overlay_lock:
+            overlay = _overlays.get(graph.version)
+            if overlay is None:
+                overlay = build_overlay(graph)
+                _overlays[graph.version] = overlay
+    return overlay
+
+
+def _customization(graph, cost_priority: float) -> Tuple[List[np.ndarray], List[List[float]]]:
+    key = (graph.version, cost_priority)
+    with _overlay_lock:
+        customization = _customizations.get(key)
+        if customization is not None:
+            _customizations.move_to_end(key)
+            return customization
+    overlay = get_overlay(graph)
+    with _overlay_lock:
+        customization = _customizations.get(key)
+        if customization is None:
+            cliques = customize_overlay(overlay, graph.edge_weight_array(cost_priority))
+            # Kèm bản sao dạng list Python cho vòng lặp truy vấn
+            customization = (cliques, [clique.tolist() for clique in cliques])
+            _customizations[key] = customization
+            while len(_customizations) > MAX_CUSTOMIZATIONS:
+                _customizations.popitem(last=False)
+    return customization
+
+
+def get_customization(graph, cost_priority: float = 0.5) -> List[np.ndarray]:
+    """Trọng số clique của overlay cho cost_priority: lấy từ cache hoặc customize"""
+    return _customization(graph, max(0.0, min(1.0, cost_priority)))[0]
+
+
+def _cell_path(graph, weights: Sequence[float], cells: Sequence[int], source: int, target: int) -> List[int]:
+    """Các cạnh của đường đi ngắn nhất source -> target chỉ qua các nút cùng ô với source"""
+    indptr, targets, _ = graph.adjacency()
+    cell = cells[source]
+    dist = {source: 0.0}
+    parent_edge = {}
+    done = set()
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if u in done:
+            continue
+        if u == target:
+            break
+        done.add(u)
+        for e in range(indptr[u], indptr[u + 1]):
+            v = targets[e]
+            if v in done or cells[v] != cell:
+                continue
+            nd = d + weights[e]
+            if nd < dist.get(v, float('inf')):
+                dist[v] = nd
+                parent_edge[v] = e
+                heapq.heappush(heap, (nd, v))
+
+    edge_ids = []
+    v = target
+    while v != source:
+        e = parent_edge[v]
+        edge_ids.append(e)
+        v = graph.edge_tail(e)
+    edge_ids.reverse()
+    return edge_ids
+
+
+def _unpack(graph, overlay: MultilevelOverlay, weights: Sequence[float], arcs: List[Tuple[int, int, int]]) -> List[int]:
+    """Thay mỗi cung clique bằng đường đi ngắn nhất tương ứng bên trong ô"""
+    edge_ids = []
+    for u, v, arc in arcs:
+        if arc >= 0:
+            edge_ids.append(arc)
+        else:
+            edge_ids.extend(_cell_path(graph, weights, overlay.cell_lists[-arc - 1], u, v))
+    return edge_ids
+
+
+def crp_search(start_province: str, goal_province: str, cost_priority: float = 0.5, stats: Optional[Dict] = None):
+    """
+    Tìm đường đi tối ưu bằng Dijkstra nhiều tầng trên overlay đã customize
+
+    Args:
+        start_province: Tỉnh/thành bắt đầu
+        goal_province: Tỉnh/thành đích
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+        stats: Nếu truyền vào một dictionary, số nút đã chốt (settled_nodes) được ghi vào đó
+
+    Returns:
+        Tuple chứa đường đi, tổng chi phí và thông tin vận chuyển
+    """
+    # Lấy đồ thị đã biên dịch dùng chung
+    graph = get_graph()
+
+    # Đảm bảo cost_priority nằm trong khoảng [0, 1]
+    cost_priority = max(0.0, min(1.0, cost_priority))
+    weights = graph.edge_weights(cost_priority)
+
+    # Kiểm tra tỉnh/thành bắt đầu và đích có tồn tại không
+    if start_province not in graph.index or goal_province not in graph.index:
+        return [], float('inf'), []
+
+    # Trường hợp đặc biệt: nếu bắt đầu và đích là cùng một tỉnh
+    if start_province == goal_province:
+        return [start_province], 0.0, []
+
+    start = graph.index[start_province]
+    goal = graph.index[goal_province]
+    overlay = get_overlay(graph)
+    _, cliques = _customization(graph, cost_priority)
+    _, arcs = overlay.query(graph, weights, cliques, start, goal, stats)
+
+    # Không tìm thấy đường đi
+    if not arcs:
+        return [], float('inf'), []
+
+    edge_ids = _unpack(graph, overlay, weights, arcs)
+    path, transport_info = graph.edge_route(start, edge_ids)
+
+    total_value = 0.0
+    for e in edge_ids:
+        total_value += weights[e]
+
+    return path, total_value, transport_info
+
+
+def calculate_transport_options_crp(start: str, goal: str, cost_priority: float = 0.5):
+    """
+    Tính toán các phương án vận chuyển sử dụng overlay nhiều tầng (CRP)
+
+    Args:
+        start: Tỉnh/thành bắt đầu
+        goal: Tỉnh/thành đích
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+
+    Returns:
+        Dictionary chứa thông tin của phương án
+    """
+    # Kết quả trả về
+    result = {
+        "path": [],
+        "distance": 0,
+        "time": 0,
+        "cost": 0,
+        "total_value": 0,
+        "transport_details": [],
+        "settled_nodes": 0
+    }
+
+    stats = {}
+    path, total_cost, transport_info = crp_search(start, goal, cost_priority, stats)
+    result["settled_nodes"] = stats.get("settled_nodes", 0)
+
+    # Nếu tìm được đường đi
+    if path:
+        result["path"] = path
+
+        # Thông tin chi tiết từng đoạn lấy trực tiếp từ các cạnh của đồ thị
+        segments_details = get_graph().route_details(transport_info)
+
+        # Cập nhật kết quả
+        result["distance"] = sum(s["distance"] for s in segments_details)
+        result["time"] = sum(s["time"] for s in segments_details)
+        result["cost"] = sum(s["cost"] for s in segments_details)
+        result["total_value"] = total_cost
+        result["transport_details"] = segments_details
+
+    return result
@@ -0,0 +1,135 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.compiled_graph import FLY, ROAD
+from models.dstar_lite import DStarLite
+from utils.graph_builder import get_graph
+from utils.heuristic_function import HEURISTIC_MODES, heuristic_table
+from utils.landmarks import landmark_source_bounds
+
+from typing import Iterable, Optional, Tuple
+
+# Lập lại kế hoạch cho xe đang chạy bằng D* Lite: planner giữ trạng thái tìm kiếm giữa
+# các lần gọi, mỗi lần chỉ nhận các thay đổi trọng số cạnh (đóng đường, hệ số tắc
+# đường) và chỉ mở rộng lại các nút bị ảnh hưởng.
+# D* Lite cần h(vị trí xe, u) là cận dưới nhất quán: mặc định dùng riêng cận dưới
+# landmark (ALT) tính trên trọng số ban đầu, vẫn đúng khi đường bị đóng hoặc tắc thêm
+# nên các hệ số nhân phải >= 1. Heuristic địa lý (đối xứng) cũng dùng được nhưng trên
+# dữ liệu này không phải cận dưới, đường đi có thể không tối ưu như A*.
+
+# Cận dưới landmark thường bằng đúng khoảng cách; nhân với (1 - HEURISTIC_SLACK) để sai
+# số làm tròn không làm khóa của nút trên đường vượt khóa của vị trí xe (dừng quá sớm).
+# Heuristic nhân với hệ số < 1 vẫn nhất quán
+HEURISTIC_SLACK = 1e-9
+
+# Một thay đổi: (từ tỉnh, đến tỉnh, hệ số nhân trọng số ban đầu, "road"/"fly");
+# hệ số inf là đóng đoạn đường, 1 là trở lại bình thường
+EdgeUpdate = Tuple[str, str, float, str]
+
+
+def create_replanner(start: str, goal: str, cost_priority: float = 0.5, heuristic_mode: str = "alt") -> Optional[DStarLite]:
+    """
+    Tạo planner D* Lite cho xe đi từ start đến goal, None nếu tỉnh/thành không tồn tại.
+
+    Args:
+        start: Tỉnh/thành bắt đầu (vị trí hiện tại của xe)
+        goal: Tỉnh/thành đích
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+        heuristic_mode: "alt" / "alt-regions" (chỉ cận dưới landmark) hoặc "geodesic"
+    """
+    if heuristic_mode not in HEURISTIC_MODES:
+        raise ValueError(f"Không hỗ trợ heuristic {heuristic_mode!r}, chọn một trong {sorted(HEURISTIC_MODES)}")
+    graph = get_graph()
+    if start not in graph.index or goal not in graph.index:
+        return None
+    cost_priority = max(0.0, min(1.0, cost_priority))
+    method = HEURISTIC_MODES[heuristic_mode]
+    if method is None:
+        heuristic_from = lambda s: heuristic_table(graph, s, cost_priority)
+    else:
+        heuristic_from = lambda s: (landmark_source_bounds(graph, s, cost_priority, method) * (1 - HEURISTIC_SLACK)).tolist()
+    return DStarLite(graph, cost_priority, graph.edge_weights(cost_priority), graph.index[start], graph.index[goal], heuristic_from)
+
+
+def apply_edge_updates(planner: DStarLite, updates: Iterable[EdgeUpdate]) -> int:
+    """
+    Đưa các thay đổi (from, to, hệ số, "road"/"fly") vào planner; trọng số mới là
+    trọng số ban đầu của cạnh nhân với hệ số, nên các hệ số không cộng dồn qua nhiều lần cập nhật.
+
+    Returns:
+        Số cạnh đã đổi trọng số
+    """
+    graph = planner.graph
+    base = planner.base_weights
+    changes = []
+    for update in updates:
+        frm, to, factor = update[:3]
+        if factor < 1:
+            raise ValueError(f"Hệ số {factor} của đoạn {frm} -> {to} nhỏ hơn 1, heuristic không còn là cận dưới")
+        transport_type = update[3] if len(update) > 3 else "road"
+        e = graph.find_edge(graph.index[frm], graph.index[to], FLY if transport_type == "fly" else ROAD)
+        if e < 0:
+            raise KeyError(f"Không có đoạn đường {frm} -> {to}")
+        changes.append((e, base[e] * factor if factor != float('inf') else float('inf')))
+    planner.update_edges(changes)
+    return len(changes)
+
+
+def calculate_transport_options_replan(planner: DStarLite, updates: Iterable[EdgeUpdate] = (), position: Optional[str] = None):
+    """
+    Lập lại kế hoạch sau khi xe đến position và/hoặc có các thay đổi updates
+
+    Args:
+        planner: Planner tạo bởi create_replanner, được cập nhật tại chỗ
+        updates: Các thay đổi trọng số, xem apply_edge_updates
+        position: Tỉnh/thành xe vừa đến (None: giữ nguyên vị trí)
+
+    Returns:
+        Dictionary chứa thông tin của phương án như calculate_transport_options, cùng
+        touched_nodes và expanded_nodes của lần lập lại kế hoạch này
+    """
+    # Kết quả trả về
+    result = {
+        "path": [],
+        "distance": 0,
+        "time": 0,
+        "cost": 0,
+        "total_value": 0,
+        "heuristic_value": 0,
+        "transport_details": [],
+        "touched_nodes": 0,
+        "expanded_nodes": 0
+    }
+
+    graph = planner.graph
+    if position is not None:
+        planner.move_to(graph.index[position])
+    apply_edge_updates(planner, updates)
+    edges, total_cost = planner.replan()
+    result["touched_nodes"] = planner.stats["touched_nodes"]
+    result["expanded_nodes"] = planner.stats["expanded_nodes"]
+
+    start_name = graph.names[planner.start]
+    if planner.start == planner.goal:
+        result["path"] = [start_name]
+        return result
+
+    # Nếu tìm được đường đi
+    if edges:
+        path, transport_info = graph.edge_route(planner.start, edges)
+        result["path"] = path
+
+        # Thông tin chi tiết từng đoạn lấy trực tiếp từ các cạnh của đồ thị
+        segments_details = graph.route_details(transport_info)
+
+        # Cập nhật kết quả
+        cost_priority = planner.cost_priority
+        result["distance"] = sum(s["distance"] for s in segments_details)
+        result["time"] = sum(s["time"] for s in segments_details)
+        result["cost"] = sum(s["cost"] for s in segments_details)
+        result["total_value"] = total_cost
+        result["heuristic_value"] = cost_priority * result["cost"] + (1 - cost_priority) * result["time"]
+        result["transport_details"] = segments_details
+
+    return result
@@ -1,85 +1,255 @@
-import math
-from algorithms.UCS import build_graph_from_province_data
-from utils.distance_function import haversine_distance
-from utils.heuristic_function import (
-    AIRPORTS,
-    AIR_SPEED,
-    ROAD_SPEED,
-    AIR_COST_PER_KM,
-    ROAD_COST_PER_KM,
-    STORAGE_TIME,
-    REST_DISTANCE,
-    REST_TIME,
-)
-from data.provinces_infor import coordinates
+from models.dynamic_all_pairs import DynamicAllPairs
+from utils.graph_builder import get_graph
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# Kích thước khối mặc định của Floyd-Warshall theo khối: khối float64 256×256
+# (512 KB) cùng hàng khối k vừa với cache L2/L3 của một lõi
+DEFAULT_BLOCK_SIZE = 256
+
+# Số bộ ma trận (dist, nxt, số bước) giữ trong cache cho truy vấn từng cặp, bộ ít dùng
+# gần đây nhất bị bỏ trước
+MATRICES_CACHE_SIZE = 4
+
+# Cache ma trận theo (phiên bản đồ thị, cost_priority), thứ tự từ cũ đến mới dùng
+_matrices: "OrderedDict[Tuple[str, float], Tuple[np.ndarray, np.ndarray, int]]" = OrderedDict()
+_matrices_lock = threading.Lock()
+
+# Ma trận dùng chung của tiến trình con, gắn vào shared memory bởi initializer
+_shared: Dict[str, np.ndarray] = {}
+
+
+def next_hop_dtype(n: int):
+    """Kiểu nguyên nhỏ nhất chứa được mọi id nút và -1 (không có đường)"""
+    return np.int16 if n <= np.iinfo(np.int16).max else np.int32
+
+
+def _initial_matrices(graph, cost_priority: float, dtype) -> Tuple[np.ndarray, np.ndarray]:
+    """Ma trận khoảng cách và nút kế tiếp ban đầu từ các cạnh của đồ thị"""
+    n = graph.num_nodes
+    tails = np.repeat(np.arange(n), np.diff(graph.indptr))
+    heads = np.asarray(graph.targets)
+
+    dist = np.full((n, n), np.inf, dtype=dtype)
+    np.fill_diagonal(dist, 0.0)
+    np.minimum.at(dist, (tails, heads), graph.edge_weight_array(cost_priority).astype(dtype))
+
+    nxt = np.where(np.isfinite(dist), np.arange(n)[None, :], -1).astype(next_hop_dtype(n))
+    return dist, nxt
+
+
+def floyd_warshall_matrices(graph, cost_priority: float = 0.5, dtype=np.float64) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Floyd-Warshall dạng min-plus NumPy: mỗi bước k là một phép broadcast
+    dist[i, k] + dist[k, j] trên toàn ma trận, ma trận nút kế tiếp được cập nhật
+    theo mặt nạ các ô vừa giảm.
+
+    Ở bước k, hàng k và cột k không đổi (dist[k, k] = 0), nên kết quả, kể cả cách
+    chọn giữa các đường bằng nhau, giống hệt vòng lặp ba tầng cập nhật tại chỗ.
+
+    Args:
+        graph: CompiledGraph
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+        dtype: Kiểu lưu khoảng cách; np.float32 giảm một nửa bộ nhớ cho đồ thị hàng
+            nghìn nút nhưng tổng giá trị có thể lệch ở các chữ số cuối so với float64
+
+    Returns:
+        Tuple (dist n×n, nxt n×n với nxt[i, j] là id nút kế tiếp trên đường i -> j
+        hoặc -1 nếu không có đường, số bước so sánh như vòng lặp ba tầng)
+    """
+    dist, nxt = _initial_matrices(graph, cost_priority, dtype)
+    return dist, nxt, min_plus_closure(dist, nxt)
+
+
+def get_floyd_warshall_matrices(graph, cost_priority: float = 0.5) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Kết quả floyd_warshall_matrices của đồ thị cho cost_priority, tính một lần rồi giữ
+    trong cache (tối đa MATRICES_CACHE_SIZE bộ). Các ma trận trả về chỉ đọc.
+    """
+    key = (graph.version, cost_priority)
+    with _matrices_lock:
+        matrices = _matrices.get(key)
+        if matrices is None:
+            dist, nxt, iterations = floyd_warshall_matrices(graph, cost_priority)
+            dist.flags.writeable = False
+            nxt.flags.writeable = False
+            matrices = (dist, nxt, iterations)
+            _matrices[key] = matrices
+            while len(_matrices) > MATRICES_CACHE_SIZE:
+                _matrices.popitem(last=False)
+        else:
+            _matrices.move_to_end(key)
+    return matrices
+
+
+def min_plus_closure(dist: np.ndarray, nxt: np.ndarray) -> int:
+    """
+    Các bước k của Floyd-Warshall tại chỗ trên ma trận khoảng cách và nút kế tiếp ban đầu.
+
+    Returns:
+        Số bước so sánh như vòng lặp ba tầng
+    """
+    n = len(dist)
+    iterations = 0
+    candidate = np.empty_like(dist)
+    improved = np.empty((n, n), dtype=bool)
+    for k in range(n):
+        column, row = dist[:, k], dist[k, :]
+        # Mỗi cặp (i, j) với dist[i][k] và dist[k][j] hữu hạn là một bước so sánh
+        iterations += int(np.count_nonzero(np.isfinite(column))) * int(np.count_nonzero(np.isfinite(row)))
+        np.add(column[:, None], row[None, :], out=candidate)
+        np.less(candidate, dist, out=improved)
+        np.copyto(dist, candidate, where=improved)
+        np.copyto(nxt, nxt[:, k].copy()[:, None], where=improved)
+
+    return iterations
+
+
+def _relax_block(dist: np.ndarray, nxt: np.ndarray, rows: slice, cols: slice, ks: range) -> None:
+    """
+    Các bước k trong ks trên khối dist[rows, cols], tuần tự theo k như Floyd-Warshall
+    thường: dist[i, j] = min(dist[i, j], dist[i, k] + dist[k, j]).
+    """
+    block = dist[rows, cols]
+    block_nxt = nxt[rows, cols]
+    improved = np.empty(block.shape, dtype=bool)
+    for k in ks:
+        candidate = dist[rows, k][:, None] + dist[k, cols][None, :]
+        np.less(candidate, block, out=improved)
+        np.copyto(block, candidate, where=improved)
+        np.copyto(block_nxt, nxt[rows, k][:, None], where=improved)
+
+
+def _attach_shared(names: Tuple[str, str], shape: Tuple[int, int], dtypes: Tuple[str, str]) -> None:
+    """Initializer của tiến trình con: gắn ma trận dist và nxt trong shared memory"""
+    for key, name, dtype in zip(("dist", "nxt"), names, dtypes):
+        memory = shared_memory.SharedMemory(name=name)
+        _shared[key + "_memory"] = memory
+        _shared[key] = np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+
+
+def _relax_shared(rows: Tuple[int, int], cols: Tuple[int, int], ks: Tuple[int, int]) -> None:
+    _relax_block(_shared["dist"], _shared["nxt"], slice(*rows), slice(*cols), range(*ks))
+
+
+def blocked_floyd_warshall_matrices(
+    graph,
+    cost_priority: float = 0.5,
+    dtype=np.float64,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    workers: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Floyd-Warshall theo khối cho đồ thị lớn. Với mỗi khối chỉ số kb:
+    1. khối chéo (kb, kb) chạy Floyd-Warshall với các k trong khối
+    2. các khối cùng hàng và cùng cột với khối chéo, song song
+    3. các khối còn lại (mỗi tác vụ một dải hàng khối), song song, chỉ đọc hàng và
+       cột khối kb đã xong ở bước 2
+
+    Ma trận nằm trong shared memory, các tiến trình con ghi trực tiếp vào các khối
+    rời nhau. Khoảng cách bằng kết quả của floyd_warshall_matrices (có thể lệch ở
+    chữ số cuối vì thứ tự cộng khác), giữa các đường bằng nhau có thể chọn đường khác.
+
+    Args:
+        graph: CompiledGraph
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+        dtype: Kiểu lưu khoảng cách (np.float64 hoặc np.float32)
+        block_size: Số nút mỗi khối
+        workers: Số tiến trình (mặc định: số CPU); 1 để chạy tuần tự không dùng shared memory
+
+    Returns:
+        Tuple (dist n×n, nxt n×n), như floyd_warshall_matrices
+    """
+    dist, nxt = _initial_matrices(graph, cost_priority, dtype)
+    n = graph.num_nodes
+    block_size = max(1, block_size)
+    blocks = [(b, min(b + block_size, n)) for b in range(0, n, block_size)]
+
+    if workers == 1:
+        def run(tasks):
+            for rows, cols, ks in tasks:
+                _relax_block(dist, nxt, slice(*rows), slice(*cols), range(*ks))
+        _blocked_rounds(blocks, n, run)
+        return dist, nxt
+
+    memories = [shared_memory.SharedMemory(create=True, size=max(a.nbytes, 1)) for a in (dist, nxt)]
+    try:
+        shared_dist = np.ndarray(dist.shape, dtype=dist.dtype, buffer=memories[0].buf)
+        shared_nxt = np.ndarray(nxt.shape, dtype=nxt.dtype, buffer=memories[1].buf)
+        shared_dist[:] = dist
+        shared_nxt[:] = nxt
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_attach_shared,
+            initargs=((memories[0].name, memories[1].name), dist.shape, (dist.dtype.str, nxt.dtype.str)),
+        ) as pool:
+            def run(tasks):
+                # list() để đợi mọi khối của bước này xong và nhận lại lỗi nếu có
+                list(pool.map(_relax_shared, *zip(*tasks)))
+            _blocked_rounds(blocks, n, run)
+        dist[:] = shared_dist
+        nxt[:] = shared_nxt
+        del shared_dist, shared_nxt
+    finally:
+        for memory in memories:
+            memory.close()
+            memory.unlink()
+    return dist, nxt
+
+
+def dynamic_all_pairs(graph, cost_priority: float = 0.5) -> DynamicAllPairs:
+    """
+    Ma trận Floyd-Warshall của đồ thị dưới dạng DynamicAllPairs để cập nhật tăng dần
+    khi đóng cạnh, đổi trọng số hoặc thêm cung mới thay vì tính lại toàn bộ.
+    """
+    dist, nxt, _ = floyd_warshall_matrices(graph, cost_priority)
+    return DynamicAllPairs(graph, graph.edge_weight_array(cost_priority), dist, nxt)
+
+
+def recompute_all_pairs(dynamic: DynamicAllPairs) -> Tuple[np.ndarray, np.ndarray]:
+    """Tính lại toàn bộ bằng Floyd-Warshall trên trọng số cung hiện tại của dynamic (để so sánh)"""
+    n = dynamic.num_nodes
+    dist = dynamic.arcs.copy()
+    np.fill_diagonal(dist, 0.0)
+    nxt = np.where(np.isfinite(dist), np.arange(n)[None, :], -1).astype(next_hop_dtype(n))
+    min_plus_closure(dist, nxt)
+    return dist, nxt
+
+
+def _blocked_rounds(blocks, n: int, run) -> None:
+    """Ba bước của mỗi vòng khối kb; run(tasks) thực hiện các tác vụ (rows, cols, ks) của một bước"""
+    for kb in blocks:
+        others = [b for b in blocks if b != kb]
+        run([(kb, kb, kb)])
+        run([(kb, b, kb) for b in others] + [(b, kb, kb) for b in others])
+        # Mỗi dải hàng khối một tác vụ, gồm hai phần cột nằm hai bên cột khối kb
+        tasks = []
+        for b in others:
+            if kb[0] > 0:
+                tasks.append((b, (0, kb[0]), kb))
+            if kb[1] < n:
+                tasks.append((b, (kb[1], n), kb))
+        if tasks:
+            run(tasks)
 
 
 def floyd_warshall(start: str, goal: str, cost_priority: float = 0.5):
-    provinces, road_segments = build_graph_from_province_data()
-    province_list = list(provinces.keys())
-    index = {p: i for i, p in enumerate(province_list)}
+    graph = get_graph()
+    province_list = list(graph.names)
+    index = graph.index
     n = len(province_list)
 
     # Theo dõi số bước và không gian
-    iterations = 0
     max_space = 2 * n * n  # Không gian cho hai ma trận n×n (dist và nxt)
 
-    flights = {}
-    for u in AIRPORTS:
-        if u not in index:
-            continue
-        for v in AIRPORTS:
-            if v not in index or u == v:
-                continue
-            lat_u = coordinates[u][0]
-            lon_u = coordinates[u][1]
-            lat_v = coordinates[v][0]
-            lon_v = coordinates[v][1]
-            d = haversine_distance(lat_u, lon_u, lat_v, lon_v)
-            flights[(u, v)] = d
-
     INF = float("inf")
-    dist = [[INF] * n for _ in range(n)]
-    nxt = [[None] * n for _ in range(n)]
-
-    for i in range(n):
-        dist[i][i] = 0.0
-        nxt[i][i] = province_list[i]
-
-    for (u, v), d in road_segments.items():
-        i, j = index[u], index[v]
-        time_val = d / ROAD_SPEED + (d // REST_DISTANCE) * REST_TIME
-        cost_val = d * ROAD_COST_PER_KM / 10000
-        w = cost_priority * cost_val + (1 - cost_priority) * time_val
-        if w < dist[i][j]:
-            dist[i][j] = w
-            nxt[i][j] = v
-        if w < dist[j][i]:
-            dist[j][i] = w
-            nxt[j][i] = u
-
-    for (u, v), d in flights.items():
-        i, j = index[u], index[v]
-        time_val = d / AIR_SPEED + STORAGE_TIME
-        cost_val = d * AIR_COST_PER_KM / 10000
-        w = cost_priority * cost_val + (1 - cost_priority) * time_val
-        if w < dist[i][j]:
-            dist[i][j] = w
-            nxt[i][j] = v
-
-    # Thuật toán Floyd-Warshall chính - đếm số bước
-    for k in range(n):
-        for i in range(n):
-            if dist[i][k] == INF:
-                continue
-            for j in range(n):
-                if dist[k][j] == INF:
-                    continue
-                iterations += 1  # Mỗi phép so sánh và cập nhật tính là 1 bước
-                nd = dist[i][k] + dist[k][j]
-                if nd < dist[i][j]:
-                    dist[i][j] = nd
-                    nxt[i][j] = nxt[i][k]
+    dist, nxt, iterations = get_floyd_warshall_matrices(graph, cost_priority)
 
     if start not in index or goal not in index:
         return {
@@ -92,7 +262,7 @@ def floyd_warshall(start: str, goal: str, cost_priority: float = 0.5):
         }
 
     i0, j0 = index[start], index[goal]
-    if nxt[i0][j0] is None:
+    if nxt[i0, j0] < 0:
         return {
             "path": [],
             "distance": 0,
@@ -103,17 +273,16 @@ def floyd_warshall(start: str, goal: str, cost_priority: float = 0.5):
         }
 
     path = [start]
-    u = start
-    while u != goal:
-        next_node = nxt[index[u]][j0]
-        if next_node is None:
+    u = i0
+    while u != j0:
+        u = int(nxt[u, j0])
+        if u < 0:
             break
-        u = next_node
-        path.append(u)
+        path.append(province_list[u])
         if len(path) > n:
             break
 
-    total_value = dist[i0][j0]
+    total_value = float(dist[i0, j0])
 
     # In thông tin tương tự như trong A*
     print("Thuật toán Floyd-Warshall")
@@ -121,48 +290,13 @@ def floyd_warshall(start: str, goal: str, cost_priority: float = 0.5):
     print("Đường đi: ", path)
     print("Max space: ", max_space)
 
-    total_dist = total_time = total_cost = 0.0
-    transport_details = []
-
-    for frm, to in zip(path, path[1:]):
-        if (frm, to) in flights:
-            mode = "fly"
-            d = flights[(frm, to)]
-            time_val = d / AIR_SPEED + STORAGE_TIME
-            cost_val = d * AIR_COST_PER_KM / 10
-        else:
-            mode = "road"
-            if (frm, to) in road_segments:
-                d = road_segments[(frm, to)]
-            elif (to, frm) in road_segments:
-                d = road_segments[(to, frm)]
-            else:
-                lat_f = coordinates[frm][0]
-                lon_f = coordinates[frm][1]
-                lat_t = coordinates[to][0]
-                lon_t = coordinates[to][1]
-                d = haversine_distance(lat_f, lon_f, lat_t, lon_t)
-            time_val = d / ROAD_SPEED + (d // REST_DISTANCE) * REST_TIME
-            cost_val = d * ROAD_COST_PER_KM / 10 
-        total_dist += d
-        total_time += time_val
-        total_cost += cost_val
-        transport_details.append(
-            {
-                "from": frm,
-                "to": to,
-                "type": mode,
-                "distance": d,
-                "time": time_val,
-                "cost": cost_val,
-            }
-        )
+    transport_details = graph.route_details(graph.path_transport_info(path, cost_priority))
 
     return {
         "path": path,
-        "distance": total_dist,
-        "time": total_time,
-        "cost": total_cost,
+        "distance": sum(s["distance"] for s in transport_details),
+        "time": sum(s["time"] for s in transport_details),
+        "cost": sum(s["cost"] for s in transport_details),
         "total_value": total_value,
         "transport_details": transport_details,
     }
@@ -1,147 +1,209 @@
 import sys
 import os
+import heapq
+from typing import Dict, Optional
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from models.province_node import ProvinceNode
-from utils.distance_function import haversine_distance
-from utils.heuristic_function import heuristic, AIRPORTS, AIR_SPEED, ROAD_SPEED
-from utils.heuristic_function import (
-    AIR_COST_PER_KM,
-    ROAD_COST_PER_KM,
-    STORAGE_TIME,
-    REST_DISTANCE,
-    REST_TIME,
-)
-from data.provinces_infor import coordinates, province_neighbor
-from algorithms.UCS import build_graph_from_province_data
+from utils.heuristic_function import heuristic, heuristic_table
+from models.search_state import search_state
+from utils.graph_builder import get_graph
+from utils.priority_queue import make_queue
 
-from queue import PriorityQueue
-import random
+# Số nút tối đa giữ lại ở mỗi tầng của beam search
+DEFAULT_BEAM_WIDTH = 8
 
 
 def evaluate_path(path, cost_priority):
-    total_value = 0.0
-    _, road_segments = build_graph_from_province_data()
-    for u, v in zip(path, path[1:]):
-        dist = road_segments.get((u, v)) or road_segments.get((v, u))
-        if dist is None:
-            lat1, lon1 = coordinates[u]
-            lat2, lon2 = coordinates[v]
-            dist = haversine_distance(lat1, lon1, lat2, lon2)
-        if u in AIRPORTS and v in AIRPORTS:
-            time = dist / AIR_SPEED + STORAGE_TIME
-            cost = dist * AIR_COST_PER_KM / 10000
-        else:
-            time = dist / ROAD_SPEED + (dist // REST_DISTANCE) * REST_TIME
-            cost = dist * ROAD_COST_PER_KM / 10000
-        total_value += cost_priority * cost + (1 - cost_priority) * time
-    return total_value
+    return get_graph().path_value(path, cost_priority)
 
 
 def greedy_best_first_search(
-    start_province: str, goal_province: str, cost_priority: float = 0.5
+    start_province: str,
+    goal_province: str,
+    cost_priority: float = 0.5,
+    queue_type: str = "lazy",
+    stats: Optional[Dict] = None,
 ):
     print("Đường đi từ: ", start_province, " đến: ", goal_province)
-    provinces, road_segments = build_graph_from_province_data()
+    graph = get_graph()
+    indptr, targets, _ = graph.adjacency()
     cost_priority = max(0.0, min(1.0, cost_priority))
 
-    for province in provinces.values():
-        province.reset()
-
-    if start_province not in provinces or goal_province not in provinces:
+    if start_province not in graph.index or goal_province not in graph.index:
         return [], float("inf"), []
     if start_province == goal_province:
         return [start_province], 0.0, []
 
-    start_node = provinces[start_province]
-    start_node.h_x = heuristic(start_province, goal_province, cost_priority)
-    start_node.transport_type = "road"
-
-    open_set = PriorityQueue()
-    open_set.put((start_node.h_x, random.random(), start_node))
-    start_node.is_in_open_set = True
-
-    flights = {}
-    
-    # Thêm biến đếm số bước và không gian tìm kiếm tối đa
-    iterations = 0
-    max_iterations = 10000
-    max_space = 0
-    closed_set_size = 0
-    closed_set = []
-
-    while not open_set.empty() and iterations < max_iterations:
-        iterations += 1
-        
-        _, _, current = open_set.get()
-        current.is_in_open_set = False
-
-        if current.name == goal_province:
-            path, transport_info = [], []
-            node = current
-            while node:
-                path.append(node.name)
-                if node.parent:
-                    p, c = node.parent.name, node.name
-                    if p in AIRPORTS and c in AIRPORTS:
-                        transport_info.append((p, c, "fly"))
-                    else:
-                        transport_info.append((p, c, "road"))
-                node = node.parent
-            path.reverse()
-            transport_info.reverse()
-            
-            print("Thuật toán Greedy Best First Search")
-            print("Tìm thấy đường sau: ", iterations, " steps")
-            print("Đường đi: ", path)
-            print("Max space: ", max_space)
-            
-            return path, evaluate_path(path, cost_priority), transport_info
-
-        current.is_in_closed_set = True
-        closed_set.append(current.name)
-        closed_set_size += 1
-        
-        if open_set.qsize() + closed_set_size > max_space:
-            max_space = open_set.qsize() + closed_set_size
-
-        for nb_name in provinces[current.name].neighbors:
-            if nb_name not in provinces:
-                continue
-            nb = provinces[nb_name]
-            if nb.is_in_closed_set:
-                continue
-
-            if not nb.is_in_open_set:
-                nb.parent = current
-                nb.h_x = heuristic(nb_name, goal_province, cost_priority)
-                open_set.put((nb.h_x, random.random(), nb))
-                nb.is_in_open_set = True
-
-        if current.name in AIRPORTS:
-            for dest in AIRPORTS:
-                if dest == current.name or dest not in provinces:
-                    continue
-                nb = provinces[dest]
-                if nb.is_in_closed_set:
+    start = graph.index[start_province]
+    goal = graph.index[goal_province]
+
+    # Bảng heuristic của mọi nút đến đích, tính một lần cho mỗi (đích, cost_priority)
+    h = heuristic_table(graph, goal, cost_priority)
+
+    with search_state(graph) as state:
+        parent, parent_edge = state.parent, state.parent_edge
+        seen, closed, epoch = state.seen, state.closed, state.epoch
+
+        state.open(start, 0.0)
+        # Khóa h của một nút không đổi nên không cần giảm khóa
+        open_set = make_queue(queue_type, graph.num_nodes)
+        open_set.push(start, h[start])
+
+        # Thêm biến đếm số bước và không gian tìm kiếm tối đa
+        iterations = 0
+        max_iterations = max(10000, graph.num_nodes)
+        max_space = 0
+        closed_set_size = 0
+
+        while open_set and iterations < max_iterations:
+            iterations += 1
+
+            _, u = open_set.pop()
+
+            if u == goal:
+                path, transport_info = state.route(graph, goal)
+
+                if stats is not None:
+                    stats.update(iterations=iterations, max_space=max_space)
+
+                print("Thuật toán Greedy Best First Search")
+                print("Tìm thấy đường sau: ", iterations, " steps")
+                print("Đường đi: ", path)
+                print("Max space: ", max_space)
+
+                return path, evaluate_path(path, cost_priority), transport_info
+
+            closed[u] = epoch
+            closed_set_size += 1
+
+            if len(open_set) + closed_set_size > max_space:
+                max_space = len(open_set) + closed_set_size
+
+            # Xét các cạnh đi ra (đường bộ và đường bay)
+            for e in range(indptr[u], indptr[u + 1]):
+                v = targets[e]
+                if closed[v] == epoch or seen[v] == epoch:
                     continue
 
-                if not nb.is_in_open_set:
-                    nb.parent = current
-                    nb.h_x = heuristic(dest, goal_province, cost_priority)
-                    open_set.put((nb.h_x, random.random(), nb))
-                    nb.is_in_open_set = True
-                    
-        # Cập nhật max space
-        if open_set.qsize() + len(provinces) > max_space:
-            max_space = open_set.qsize() + len(provinces)
+                parent[v] = u
+                parent_edge[v] = e
+                seen[v] = epoch
+                open_set.push(v, h[v])
+
+            # Cập nhật max space
+            if len(open_set) + graph.num_nodes > max_space:
+                max_space = len(open_set) + graph.num_nodes
 
     return [], float("inf"), []
 
 
+def beam_search(
+    start_province: str,
+    goal_province: str,
+    cost_priority: float = 0.5,
+    beam_width: int = DEFAULT_BEAM_WIDTH,
+    fallback: bool = True,
+    stats: Optional[Dict] = None,
+):
+    """
+    Greedy Best First Search giới hạn bộ nhớ (beam search): mỗi tầng chỉ giữ beam_width
+    nút có heuristic nhỏ nhất trong các nút kề chưa vào beam của tầng trước, các nút còn
+    lại bị bỏ hẳn. Mỗi tầng tạo tối đa beam_width × bậc lớn nhất nút kề nên bộ nhớ và
+    số bước mỗi tầng bị chặn; một nút chỉ vào beam một lần nên có không quá số nút tầng.
+    Đường đi có thể kém hơn Greedy Best First Search, và beam có thể tắt (mọi nút kề đã
+    vào beam) trước khi đến đích dù vẫn có đường.
+
+    Args:
+        start_province: Tỉnh/thành bắt đầu
+        goal_province: Tỉnh/thành đích
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+        beam_width: Số nút tối đa của mỗi tầng
+        fallback: Khi beam tắt, chạy greedy_best_first_search (không giới hạn bộ nhớ)
+        stats: Nếu truyền vào một dictionary, số bước (iterations), không gian tối đa
+            (max_space), số tầng (depth) và việc có dùng fallback (fallback) được ghi vào đó
+
+    Returns:
+        Tuple chứa đường đi, tổng chi phí và thông tin vận chuyển
+    """
+    print("Đường đi từ: ", start_province, " đến: ", goal_province)
+    graph = get_graph()
+    indptr, targets, _ = graph.adjacency()
+    cost_priority = max(0.0, min(1.0, cost_priority))
+    beam_width = max(1, beam_width)
+
+    if start_province not in graph.index or goal_province not in graph.index:
+        return [], float("inf"), []
+    if start_province == goal_province:
+        return [start_province], 0.0, []
+
+    start = graph.index[start_province]
+    goal = graph.index[goal_province]
+    h = heuristic_table(graph, goal, cost_priority)
+    weights = graph.edge_weights(cost_priority)
+
+    with search_state(graph) as state:
+        g, seen, epoch = state.g, state.seen, state.epoch
+
+        state.open(start, 0.0)
+        beam = [start]
+        iterations = 0
+        max_space = 1
+        depth = 0
+
+        while beam:
+            depth += 1
+            # Các nút kề chưa vào beam nào; nút cha của mỗi nút là nút trong beam cho
+            # tổng trọng số từ điểm xuất phát nhỏ nhất (không ảnh hưởng thứ tự chọn theo h)
+            successors = {}
+            for u in beam:
+                iterations += 1
+                for e in range(indptr[u], indptr[u + 1]):
+                    v = targets[e]
+                    if seen[v] == epoch:
+                        continue
+                    value = g[u] + weights[e]
+                    if v not in successors or value < successors[v][0]:
+                        successors[v] = (value, u, e)
+            max_space = max(max_space, len(beam) + len(successors))
+
+            if goal in successors:
+                state.open(goal, *successors[goal])
+                path, transport_info = state.route(graph, goal)
+
+                if stats is not None:
+                    stats.update(iterations=iterations, max_space=max_space, depth=depth, fallback=False)
+
+                print("Thuật toán Beam Search")
+                print("Tìm thấy đường sau: ", iterations, " steps")
+                print("Đường đi: ", path)
+                print("Max space: ", max_space)
+
+                return path, evaluate_path(path, cost_priority), transport_info
+
+            beam = heapq.nsmallest(beam_width, successors, key=lambda v: h[v])
+            for v in beam:
+                state.open(v, *successors[v])
+
+    if fallback:
+        fallback_stats = {}
+        path, total_val, transport_info = greedy_best_first_search(start_province, goal_province, cost_priority, stats=fallback_stats)
+        if stats is not None:
+            stats.update(
+                iterations=iterations + fallback_stats.get("iterations", 0),
+                max_space=max(max_space, fallback_stats.get("max_space", 0)),
+                depth=depth,
+                fallback=True,
+            )
+        return path, total_val, transport_info
+
+    if stats is not None:
+        stats.update(iterations=iterations, max_space=max_space, depth=depth, fallback=False)
+    return [], float("inf"), []
+
+
 def calculate_transport_options_greedy(
-    start: str, goal: str, cost_priority: float = 0.5
+    start: str, goal: str, cost_priority: float = 0.5, beam_width: Optional[int] = None, fallback: bool = True
 ):
     result = {
         "path": [],
@@ -152,43 +214,21 @@ def calculate_transport_options_greedy(
         "heuristic_value": 0,
         "transport_details": [],
     }
-    path, total_val, transport_info = greedy_best_first_search(
-        start, goal, cost_priority
-    )
+    if beam_width:
+        path, total_val, transport_info = beam_search(
+            start, goal, cost_priority, beam_width, fallback
+        )
+    else:
+        path, total_val, transport_info = greedy_best_first_search(
+            start, goal, cost_priority
+        )
     if not path:
         return result
     result["path"] = path
-    total_dist = total_time = total_cost = 0
-    _, road_segments = build_graph_from_province_data()
-    for frm, to, ttype in transport_info:
-        if ttype == "road":
-            key = (frm, to)
-            rev = (to, frm)
-            if key in road_segments:
-                d = road_segments[key]
-            elif rev in road_segments:
-                d = road_segments[rev]
-            else:
-                lat1, lon1 = coordinates[frm]
-                lat2, lon2 = coordinates[to]
-                d = haversine_distance(lat1, lon1, lat2, lon2)
-            t = (d / ROAD_SPEED) + (d // REST_DISTANCE) * REST_TIME
-            c = d * ROAD_COST_PER_KM / 10
-        else:
-            lat1, lon1 = coordinates[frm]
-            lat2, lon2 = coordinates[to]
-            d = haversine_distance(lat1, lon1, lat2, lon2)
-            t = (d / AIR_SPEED) + STORAGE_TIME
-            c = d * AIR_COST_PER_KM / 10
-        total_dist += d
-        total_time += t
-        total_cost += c
-        result["transport_details"].append(
-            {"from": frm, "to": to, "type": ttype, "distance": d, "time": t, "cost": c}
-        )
-    result["distance"] = total_dist
-    result["time"] = total_time
-    result["cost"] = total_cost
+    result["transport_details"] = get_graph().route_details(transport_info)
+    result["distance"] = sum(s["distance"] for s in result["transport_details"])
+    result["time"] = sum(s["time"] for s in result["transport_details"])
+    result["cost"] = sum(s["cost"] for s in result["transport_details"])
     result["total_value"] = total_val
     result["heuristic_value"] = heuristic(start, goal, cost_priority)
     return result
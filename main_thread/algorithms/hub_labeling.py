@@ -0,0 +1,228 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.hub_labels import HubLabels
+from utils.graph_builder import get_graph
+
+import heapq
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Tuple
+
+import numpy as np
+
+# Thứ tự xử lý hub:
+# - "degree": nút có sân bay trước, sau đó theo bậc giảm dần
+# - "ch": theo rank của Contraction Hierarchy giảm dần (nhãn nhỏ hơn, tốn thêm bước tiền xử lý CH)
+HUB_ORDERS = ("degree", "ch")
+
+# Số bộ nhãn giữ trong cache, bộ ít dùng gần đây nhất bị bỏ trước
+LABELS_CACHE_SIZE = 8
+
+# Cache nhãn theo (phiên bản đồ thị, cost_priority), thứ tự từ cũ đến mới dùng
+_labels: "OrderedDict[Tuple[str, float], HubLabels]" = OrderedDict()
+_labels_lock = threading.Lock()
+
+
+def _hub_order(graph, cost_priority: float, order: str) -> List[int]:
+    if order not in HUB_ORDERS:
+        raise ValueError(f"Không hỗ trợ thứ tự hub {order!r}, chọn một trong {HUB_ORDERS}")
+    if order == "ch":
+        from algorithms.contraction_hierarchies import get_hierarchy
+
+        rank = get_hierarchy(graph, cost_priority).arrays["rank"]
+        return np.argsort(-rank, kind="stable").tolist()
+    degree = np.diff(graph.indptr)
+    return sorted(range(graph.num_nodes), key=lambda u: (not graph.is_airport[u], -degree[u], u))
+
+
+def _pruned_dijkstra(hub: int, rank: int, ptr, adjacent, edges, weights, hub_labels, labels) -> None:
+    """
+    Dijkstra có cắt tỉa từ hub: nút v chỉ nhận nhãn (rank, d) và được mở rộng nếu
+    các nhãn đã có chưa cho khoảng cách hub ~ v nhỏ hơn hoặc bằng d.
+
+    hub_labels: nhãn của chính hub ở phía đối diện, labels: nhãn được bổ sung.
+    """
+    known = {r: d for r, d, _ in hub_labels[hub]}
+    inf = float('inf')
+    dist = {hub: 0.0}
+    parent_edge = {hub: -1}
+    done = set()
+    heap = [(0.0, hub)]
+    while heap:
+        d, v = heapq.heappop(heap)
+        if v in done:
+            continue
+        done.add(v)
+
+        # Cắt tỉa: khoảng cách qua một hub đã xử lý không lớn hơn d
+        if any(known.get(r, inf) + dv <= d for r, dv, _ in labels[v]):
+            continue
+        labels[v].append((rank, d, parent_edge[v]))
+
+        for i in range(ptr[v], ptr[v + 1]):
+            x = adjacent[i]
+            if x in done:
+                continue
+            e = i if edges is None else edges[i]
+            nd = d + weights[e]
+            if nd < dist.get(x, inf):
+                dist[x] = nd
+                parent_edge[x] = e
+                heapq.heappush(heap, (nd, x))
+
+
+def _pack(labels: List[List[Tuple[int, float, int]]], side: str) -> Dict[str, np.ndarray]:
+    indptr = np.zeros(len(labels) + 1, dtype=np.int64)
+    np.cumsum([len(entries) for entries in labels], out=indptr[1:])
+    flat = [entry for entries in labels for entry in entries]
+    return {
+        side + "_indptr": indptr,
+        side + "_hubs": np.asarray([r for r, _, _ in flat], dtype=np.int32),
+        side + "_dist": np.asarray([d for _, d, _ in flat], dtype=np.float64),
+        side + "_edge": np.asarray([e for _, _, e in flat], dtype=np.int32),
+    }
+
+
+def build_hub_labels(graph, cost_priority: float = 0.5, order: str = "ch") -> HubLabels:
+    """
+    Tính nhãn hub bằng pruned landmark labeling: lần lượt lấy từng nút làm hub theo
+    thứ tự order, chạy Dijkstra có cắt tỉa xuôi (bổ sung nhãn vào) và ngược (bổ sung
+    nhãn ra). Nhãn của mỗi nút được sắp theo thứ hạng hub tăng dần.
+
+    Args:
+        graph: CompiledGraph
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+        order: Thứ tự xử lý hub, xem HUB_ORDERS
+
+    Returns:
+        HubLabels
+    """
+    cost_priority = max(0.0, min(1.0, cost_priority))
+    weights = graph.edge_weights(cost_priority)
+    indptr, targets, _ = graph.adjacency()
+    rindptr, sources, redges = graph.reverse_adjacency()
+
+    hubs = _hub_order(graph, cost_priority, order)
+    out_labels = [[] for _ in range(graph.num_nodes)]
+    in_labels = [[] for _ in range(graph.num_nodes)]
+    for rank, hub in enumerate(hubs):
+        # Xuôi: d(hub, v) cho nhãn vào của v, cắt tỉa bằng nhãn ra của hub
+        _pruned_dijkstra(hub, rank, indptr, targets, None, weights, out_labels, in_labels)
+        # Ngược: d(v, hub) cho nhãn ra của v, cắt tỉa bằng nhãn vào của hub
+        _pruned_dijkstra(hub, rank, rindptr, sources, redges, weights, in_labels, out_labels)
+
+    arrays = {"order": np.asarray(hubs, dtype=np.int32)}
+    arrays.update(_pack(out_labels, "out"))
+    arrays.update(_pack(in_labels, "in"))
+    return HubLabels(cost_priority, arrays)
+
+
+def get_hub_labels(graph, cost_priority: float = 0.5) -> HubLabels:
+    """
+    Nhãn hub của đồ thị cho cost_priority: lấy từ cache (tối đa LABELS_CACHE_SIZE bộ
+    nhãn), từ graph.tables (snapshot đã lưu kèm nhãn, nạp bằng mmap) hoặc tính ở lần
+    gọi đầu tiên.
+    """
+    cost_priority = max(0.0, min(1.0, cost_priority))
+    key = (graph.version, cost_priority)
+    with _labels_lock:
+        labels = _labels.get(key)
+        if labels is None:
+            labels = HubLabels.from_tables(graph.tables, cost_priority)
+            if labels is None:
+                labels = build_hub_labels(graph, cost_priority)
+            _labels[key] = labels
+            while len(_labels) > LABELS_CACHE_SIZE:
+                _labels.popitem(last=False)
+        else:
+            _labels.move_to_end(key)
+    return labels
+
+
+def hub_label_search(start_province: str, goal_province: str, cost_priority: float = 0.5):
+    """
+    Tìm đường đi tối ưu bằng nhãn hub, không duyệt đồ thị khi truy vấn
+
+    Args:
+        start_province: Tỉnh/thành bắt đầu
+        goal_province: Tỉnh/thành đích
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+
+    Returns:
+        Tuple chứa đường đi, tổng chi phí và thông tin vận chuyển
+    """
+    # Lấy đồ thị đã biên dịch dùng chung
+    graph = get_graph()
+
+    # Đảm bảo cost_priority nằm trong khoảng [0, 1]
+    cost_priority = max(0.0, min(1.0, cost_priority))
+
+    # Kiểm tra tỉnh/thành bắt đầu và đích có tồn tại không
+    if start_province not in graph.index or goal_province not in graph.index:
+        return [], float('inf'), []
+
+    # Trường hợp đặc biệt: nếu bắt đầu và đích là cùng một tỉnh
+    if start_province == goal_province:
+        return [start_province], 0.0, []
+
+    start = graph.index[start_province]
+    goal = graph.index[goal_province]
+    labels = get_hub_labels(graph, cost_priority)
+    distance, hub = labels.query(start, goal)
+
+    # Không tìm thấy đường đi
+    if hub < 0:
+        return [], float('inf'), []
+
+    edge_ids = labels.path_edges(graph, start, goal, hub)
+    path, transport_info = graph.edge_route(start, edge_ids)
+
+    weights = graph.edge_weights(cost_priority)
+    total_value = 0.0
+    for e in edge_ids:
+        total_value += weights[e]
+
+    return path, total_value, transport_info
+
+
+def calculate_transport_options_hub_labels(start: str, goal: str, cost_priority: float = 0.5):
+    """
+    Tính toán các phương án vận chuyển sử dụng nhãn hub
+
+    Args:
+        start: Tỉnh/thành bắt đầu
+        goal: Tỉnh/thành đích
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+
+    Returns:
+        Dictionary chứa thông tin của phương án
+    """
+    # Kết quả trả về
+    result = {
+        "path": [],
+        "distance": 0,
+        "time": 0,
+        "cost": 0,
+        "total_value": 0,
+        "transport_details": []
+    }
+
+    path, total_cost, transport_info = hub_label_search(start, goal, cost_priority)
+
+    # Nếu tìm được đường đi
+    if path:
+        result["path"] = path
+
+        # Thông tin chi tiết từng đoạn lấy trực tiếp từ các cạnh của đồ thị
+        segments_details = get_graph().route_details(transport_info)
+
+        # Cập nhật kết quả
+        result["distance"] = sum(s["distance"] for s in segments_details)
+        result["time"] = sum(s["time"] for s in segments_details)
+        result["cost"] = sum(s["cost"] for s in segments_details)
+        result["total_value"] = total_cost
+        result["transport_details"] = segments_details
+
+    return result
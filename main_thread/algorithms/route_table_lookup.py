@@ -0,0 +1,98 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.compiled_graph import MODE_NAMES
+from utils.graph_builder import get_graph
+from utils.route_tables import get_route_table
+
+from typing import Dict, List, Tuple
+
+# Tra cứu đường đi trên bảng mọi cặp đã tính trước (utils/route_tables): mỗi truy vấn
+# chỉ đi theo ma trận nút kế tiếp, O(độ dài đường đi), không tìm kiếm.
+# cost_priority được làm tròn về điểm lưới gần nhất (bước 0.01 như thanh trượt).
+
+
+def route_table_search(start: str, goal: str, cost_priority: float = 0.5) -> Tuple[List[str], float, List[Tuple[str, str, str]]]:
+    """
+    Đường đi start -> goal theo bảng tra cứu của điểm lưới gần cost_priority nhất.
+
+    Args:
+        start: Tỉnh/thành bắt đầu
+        goal: Tỉnh/thành đích
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+
+    Returns:
+        Tuple (đường đi, tổng trọng số theo cost_priority, thông tin vận chuyển)
+    """
+    graph = get_graph()
+    if start not in graph.index or goal not in graph.index:
+        return [], float('inf'), []
+
+    table = get_route_table(graph, cost_priority)
+    nodes = table.path(graph.index[start], graph.index[goal])
+    if not nodes:
+        return [], float('inf'), []
+
+    # Cạnh của mỗi đoạn chọn theo trọng số của bảng, tổng trọng số theo cost_priority thật
+    table_weights = graph.edge_weights(table.cost_priority)
+    weights = graph.edge_weights(cost_priority)
+    path = [graph.names[u] for u in nodes]
+    transport_info = []
+    total_value = 0.0
+    for u, v in zip(nodes, nodes[1:]):
+        e = graph.best_edge(u, v, table_weights)
+        transport_info.append((graph.names[u], graph.names[v], MODE_NAMES[int(graph.modes[e])]))
+        total_value += weights[e]
+    return path, total_value, transport_info
+
+
+def route_table_totals(start: str, goal: str, cost_priority: float = 0.5) -> Dict[str, float]:
+    """Tổng trọng số, quãng đường, thời gian, chi phí của đường start -> goal, O(1), không dựng đường đi"""
+    graph = get_graph()
+    if start not in graph.index or goal not in graph.index:
+        return {"total_value": float('inf'), "distance": float('inf'), "time": float('inf'), "cost": float('inf')}
+    table = get_route_table(graph, cost_priority)
+    value, distance, time, cost = table.totals(graph.index[start], graph.index[goal])
+    return {"total_value": value, "distance": distance, "time": time, "cost": cost}
+
+
+def calculate_transport_options_route_table(start: str, goal: str, cost_priority: float = 0.5):
+    """
+    Tính toán các phương án vận chuyển bằng bảng tra cứu mọi cặp
+
+    Args:
+        start: Tỉnh/thành bắt đầu
+        goal: Tỉnh/thành đích
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+
+    Returns:
+        Dictionary chứa thông tin của phương án
+    """
+    # Kết quả trả về
+    result = {
+        "path": [],
+        "distance": 0,
+        "time": 0,
+        "cost": 0,
+        "total_value": 0,
+        "transport_details": []
+    }
+
+    path, total_cost, transport_info = route_table_search(start, goal, cost_priority)
+
+    # Nếu tìm được đường đi
+    if path:
+        result["path"] = path
+
+        # Thông tin chi tiết từng đoạn lấy trực tiếp từ các cạnh của đồ thị
+        segments_details = get_graph().route_details(transport_info)
+
+        # Cập nhật kết quả
+        result["distance"] = sum(s["distance"] for s in segments_details)
+        result["time"] = sum(s["time"] for s in segments_details)
+        result["cost"] = sum(s["cost"] for s in segments_details)
+        result["total_value"] = total_cost
+        result["transport_details"] = segments_details
+
+    return result
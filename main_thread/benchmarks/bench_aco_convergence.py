@@ -0,0 +1,91 @@
+"""
+Số vòng lặp ACO cần để tìm được đường tối ưu (tổng trọng số bằng kết quả của UCS)
+trên mọi cặp tỉnh/thành, với từng cải tiến: danh sách ứng viên (candidate_size),
+MAX-MIN Ant System (mmas), tối ưu cục bộ bằng bảng tra cứu (local_search) và cả ba.
+Cặp không đạt tối ưu sau --num-iterations vòng lặp được tính là --num-iterations.
+
+    python benchmarks/bench_aco_convergence.py --pairs 200 --num-iterations 200
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import contextlib
+import io
+import itertools
+import random
+import time
+
+import numpy as np
+
+from algorithms.ACO import ant_colony_optimization
+from algorithms.UCS import ucs
+from models.ant_colony import DEFAULT_CANDIDATE_SIZE
+from utils.graph_builder import get_graph
+
+# Sai số tương đối khi so tổng trọng số với tối ưu của UCS
+OPTIMUM_RTOL = 1e-9
+
+
+def variants(candidate_size: int, window: int):
+    """(tên, tham số) của các cấu hình được so sánh"""
+    return [
+        ("gốc", {}),
+        (f"ứng viên {candidate_size}", {"candidate_size": candidate_size}),
+        ("MMAS", {"mmas": True}),
+        (f"local search {window}", {"local_search": True, "local_search_window": window}),
+        ("cả ba", {"candidate_size": candidate_size, "mmas": True, "local_search": True, "local_search_window": window}),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pairs", type=int, default=0, help="Số cặp lấy ngẫu nhiên, 0 để chạy mọi cặp")
+    parser.add_argument("--num-ants", type=int, default=20)
+    parser.add_argument("--num-iterations", type=int, default=200)
+    parser.add_argument("--candidate-size", type=int, default=DEFAULT_CANDIDATE_SIZE)
+    parser.add_argument("--local-search-window", type=int, default=3)
+    parser.add_argument("--cost-priority", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    graph = get_graph()
+    pairs = list(itertools.permutations(graph.names, 2))
+    if 0 < args.pairs < len(pairs):
+        pairs = random.Random(args.seed).sample(pairs, args.pairs)
+    optima = []
+    for start, goal in pairs:
+        with contextlib.redirect_stdout(io.StringIO()):
+            _, optimum, _ = ucs(start, goal, args.cost_priority)
+        optima.append(optimum)
+    print(f"{graph}, {len(pairs)} cặp, {args.num_ants} kiến, tối đa {args.num_iterations} vòng lặp\n")
+
+    print(f"{'cấu hình':>16s} {'đạt tối ưu':>12s} {'vòng lặp TB':>12s} {'trung vị':>9s} {'chênh lệch TB':>14s} {'thời gian (s)':>14s}")
+    for name, params in variants(args.candidate_size, args.local_search_window):
+        iterations, gaps, reached = [], [], 0
+        start_time = time.perf_counter()
+        for (start, goal), optimum in zip(pairs, optima):
+            stats = {}
+            with contextlib.redirect_stdout(io.StringIO()):
+                _, value, _ = ant_colony_optimization(
+                    start, goal, args.cost_priority,
+                    num_ants=args.num_ants,
+                    num_iterations=args.num_iterations,
+                    seed=args.seed,
+                    target_value=optimum * (1 + OPTIMUM_RTOL),
+                    stats=stats,
+                    **params,
+                )
+            iterations.append(stats["colony_iterations"])
+            reached += stats["stop_reason"] == "target"
+            gaps.append(value / optimum - 1 if optimum > 0 else 0.0)
+        elapsed = time.perf_counter() - start_time
+        print(
+            f"{name:>16s} {reached:5d}/{len(pairs):<6d} {np.mean(iterations):12.1f} {np.median(iterations):9.0f} "
+            f"{100 * np.mean(gaps):13.2f}% {elapsed:14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
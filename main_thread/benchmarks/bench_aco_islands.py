@@ -0,0 +1,88 @@
+"""
+Thời gian để ACO nhiều đàn (mô hình đảo) đạt chất lượng mục tiêu theo số tiến
+trình: mỗi tiến trình một đàn, dừng khi tổng trọng số không vượt quá
+(1 + tolerance) lần giá trị tối ưu của UCS hoặc hết số vòng lặp.
+
+    python benchmarks/bench_aco_islands.py --pairs 10 --workers 1,2,4,8 --tolerance 0.02
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+import numpy as np
+
+from algorithms.ACO import EXCHANGE_MODES, ant_colony_optimization
+from algorithms.UCS import ucs
+from utils.graph_builder import get_graph
+
+
+def parse_ints(text: str):
+    return [int(x) for x in text.split(",") if x]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pairs", type=int, default=10)
+    parser.add_argument("--workers", type=parse_ints, default=None, help="Mặc định: 1, 2, 4, ... đến số CPU")
+    parser.add_argument("--tolerance", type=float, default=0.02)
+    parser.add_argument("--num-ants", type=int, default=50)
+    parser.add_argument("--num-iterations", type=int, default=500)
+    parser.add_argument("--exchange-interval", type=int, default=25)
+    parser.add_argument("--exchange", choices=EXCHANGE_MODES, default="best")
+    parser.add_argument("--cost-priority", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    workers = args.workers
+    if workers is None:
+        cpus = os.cpu_count() or 1
+        workers = sorted({min(1 << i, cpus) for i in range(cpus.bit_length() + 1)})
+
+    graph = get_graph()
+    rng = random.Random(args.seed)
+    pairs = [tuple(rng.sample(list(graph.names), 2)) for _ in range(args.pairs)]
+    targets = []
+    for start, goal in pairs:
+        with contextlib.redirect_stdout(io.StringIO()):
+            _, optimum, _ = ucs(start, goal, args.cost_priority)
+        targets.append(optimum * (1 + args.tolerance))
+    print(f"{graph}, {os.cpu_count()} CPU, {len(pairs)} cặp, mục tiêu: tối ưu UCS + {100 * args.tolerance:g}%\n")
+
+    print(f"{'tiến trình':>10s} {'đàn':>5s} {'đạt mục tiêu':>13s} {'thời gian TB (s)':>17s} {'vòng lặp TB':>12s} {'bước kiến TB':>13s} {'tăng tốc':>9s}")
+    single = None
+    for count in workers:
+        elapsed, reached, ant_steps, colony_iterations = [], 0, [], []
+        for (start, goal), target in zip(pairs, targets):
+            stats = {}
+            start_time = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                _, value, _ = ant_colony_optimization(
+                    start, goal, args.cost_priority,
+                    num_ants=args.num_ants,
+                    num_iterations=args.num_iterations,
+                    seed=args.seed,
+                    colonies=count,
+                    workers=count,
+                    exchange_interval=args.exchange_interval,
+                    exchange=args.exchange,
+                    target_value=target,
+                    stats=stats,
+                )
+            elapsed.append(time.perf_counter() - start_time)
+            reached += value <= target
+            ant_steps.append(stats["iterations"])
+            colony_iterations.append(stats["colony_iterations"])
+        mean = float(np.mean(elapsed))
+        if single is None:
+            single = mean
+        print(f"{count:10d} {count:5d} {reached:6d}/{len(pairs):<6d} {mean:17.3f} {np.mean(colony_iterations):12.1f} {np.mean(ant_steps):13.0f} {single / mean:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
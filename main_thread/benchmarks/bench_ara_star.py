@@ -0,0 +1,91 @@
+"""
+ARA* (A* anytime) với thời gian tối đa mỗi truy vấn trên một loạt cặp tỉnh/thành,
+như một người gọi theo lô: với mỗi thời gian, số cặp đã chứng minh tối ưu, cận hệ số
+dưới tối ưu trung bình / lớn nhất, chênh lệch thật so với UCS và thời gian mỗi truy vấn.
+Dòng "không giới hạn" chạy đến khi epsilon = 1.
+
+    python benchmarks/bench_ara_star.py --pairs 500 --budgets 0,0.05,0.2,1 --initial-epsilon 3
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import contextlib
+import io
+import itertools
+import random
+import time
+
+import numpy as np
+
+from algorithms.UCS import ucs
+from algorithms.ara_star import DEFAULT_EPSILON_STEP, DEFAULT_INITIAL_EPSILON, ara_star
+from utils.graph_builder import build_synthetic_graph, get_graph, set_graph
+
+
+def parse_floats(text: str):
+    return [float(x) for x in text.split(",") if x]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pairs", type=int, default=500, help="Số cặp lấy ngẫu nhiên, 0 để chạy mọi cặp")
+    parser.add_argument("--budgets", type=parse_floats, default=[0.0, 0.05, 0.2, 1.0], help="Thời gian tối đa mỗi truy vấn (ms)")
+    parser.add_argument("--initial-epsilon", type=float, default=DEFAULT_INITIAL_EPSILON)
+    parser.add_argument("--epsilon-step", type=float, default=DEFAULT_EPSILON_STEP)
+    parser.add_argument("--heuristic", default="alt")
+    parser.add_argument("--rows", type=int, default=0, help="Dùng lưới tổng hợp rows × cols thay cho 63 tỉnh/thành")
+    parser.add_argument("--cols", type=int, default=0)
+    parser.add_argument("--cost-priority", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.rows and args.cols:
+        set_graph(build_synthetic_graph(args.rows, args.cols, seed=args.seed))
+    graph = get_graph()
+    pairs = list(itertools.permutations(graph.names, 2))
+    if 0 < args.pairs < len(pairs):
+        pairs = random.Random(args.seed).sample(pairs, args.pairs)
+    optima = []
+    for start, goal in pairs:
+        with contextlib.redirect_stdout(io.StringIO()):
+            _, optimum, _ = ucs(start, goal, args.cost_priority)
+        optima.append(optimum)
+    # Bảng landmark được tính ở truy vấn đầu tiên, không tính vào thời gian
+    with contextlib.redirect_stdout(io.StringIO()):
+        ara_star(*pairs[0], args.cost_priority, heuristic_mode=args.heuristic)
+    print(f"{graph}, {len(pairs)} cặp, epsilon ban đầu {args.initial_epsilon:g}, giảm {args.epsilon_step:g} mỗi vòng\n")
+
+    print(f"{'thời gian':>14s} {'tối ưu':>11s} {'cận TB':>8s} {'cận lớn nhất':>13s} {'chênh lệch TB':>14s} {'tối đa':>8s} {'số vòng TB':>11s} {'ms/truy vấn':>12s}")
+    for budget in args.budgets + [None]:
+        bounds, gaps, rounds, optimal = [], [], [], 0
+        elapsed = 0.0
+        for (start, goal), optimum in zip(pairs, optima):
+            stats = {}
+            start_time = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                path, value, _ = ara_star(
+                    start, goal, args.cost_priority,
+                    initial_epsilon=args.initial_epsilon,
+                    epsilon_step=args.epsilon_step,
+                    time_budget=None if budget is None else budget / 1000,
+                    heuristic_mode=args.heuristic,
+                    stats=stats,
+                )
+            elapsed += time.perf_counter() - start_time
+            if not path:
+                continue
+            bounds.append(stats["suboptimality_bound"])
+            rounds.append(len(stats["solutions"]))
+            optimal += stats["stop_reason"] == "optimal"
+            gaps.append(value / optimum - 1 if optimum > 0 else 0.0)
+        name = "không giới hạn" if budget is None else f"{budget:g} ms"
+        print(
+            f"{name:>14s} {optimal:5d}/{len(pairs):<5d} {np.mean(bounds):8.3f} {np.max(bounds):13.3f} "
+            f"{100 * np.mean(gaps):13.2f}% {100 * np.max(gaps):7.2f}% {np.mean(rounds):11.1f} {1000 * elapsed / len(pairs):12.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Chất lượng đường đi và bộ nhớ của beam search (Greedy giới hạn bộ nhớ) theo độ rộng
+beam, so với Greedy Best First Search và tối ưu của UCS trên một tập cặp tỉnh/thành.
+Chênh lệch là tổng trọng số / tối ưu UCS - 1; "beam tắt" là số cặp beam không đến
+được đích (có fallback thì được giải lại bằng Greedy Best First Search).
+
+    python benchmarks/bench_beam_search.py --pairs 500 --widths 1,2,4,8,16
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import contextlib
+import io
+import itertools
+import random
+import time
+
+import numpy as np
+
+from algorithms.UCS import ucs
+from algorithms.greedy_best_first_search import beam_search, greedy_best_first_search
+from utils.graph_builder import get_graph
+
+
+def parse_ints(text: str):
+    return [int(x) for x in text.split(",") if x]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pairs", type=int, default=500, help="Số cặp lấy ngẫu nhiên, 0 để chạy mọi cặp")
+    parser.add_argument("--widths", type=parse_ints, default=[1, 2, 4, 8, 16])
+    parser.add_argument("--no-fallback", action="store_true")
+    parser.add_argument("--cost-priority", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    graph = get_graph()
+    pairs = list(itertools.permutations(graph.names, 2))
+    if 0 < args.pairs < len(pairs):
+        pairs = random.Random(args.seed).sample(pairs, args.pairs)
+    optima = []
+    for start, goal in pairs:
+        with contextlib.redirect_stdout(io.StringIO()):
+            _, optimum, _ = ucs(start, goal, args.cost_priority)
+        optima.append(optimum)
+    print(f"{graph}, {len(pairs)} cặp, fallback: {not args.no_fallback}\n")
+
+    runs = [("greedy", None)] + [(f"beam {width}", width) for width in args.widths]
+    print(f"{'thuật toán':>10s} {'tìm được':>10s} {'beam tắt':>9s} {'tối ưu':>7s} {'chênh lệch TB':>14s} {'tối đa':>9s} {'max space TB':>13s} {'tối đa':>7s} {'ms/truy vấn':>12s}")
+    for name, width in runs:
+        gaps, spaces, found, optimal, died = [], [], 0, 0, 0
+        elapsed = 0.0
+        for (start, goal), optimum in zip(pairs, optima):
+            stats = {}
+            start_time = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                if width is None:
+                    path, value, _ = greedy_best_first_search(start, goal, args.cost_priority, stats=stats)
+                else:
+                    path, value, _ = beam_search(start, goal, args.cost_priority, width, not args.no_fallback, stats=stats)
+            elapsed += time.perf_counter() - start_time
+            died += bool(stats.get("fallback")) or (width is not None and not path)
+            spaces.append(stats.get("max_space", 0))
+            if path:
+                found += 1
+                gaps.append(value / optimum - 1 if optimum > 0 else 0.0)
+                optimal += value <= optimum * (1 + 1e-9)
+        gaps = np.array(gaps) if gaps else np.zeros(1)
+        print(
+            f"{name:>10s} {found:5d}/{len(pairs):<4d} {died:9d} {optimal:7d} {100 * gaps.mean():13.2f}% {100 * gaps.max():8.1f}% "
+            f"{np.mean(spaces):13.1f} {max(spaces):7d} {1000 * elapsed / len(pairs):12.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
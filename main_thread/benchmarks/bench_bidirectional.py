@@ -0,0 +1,81 @@
+"""
+So sánh số nút đã chốt và thời gian của tìm kiếm một chiều và hai chiều trên
+các tuyến Bắc - Nam của mạng tỉnh/thành và trên đồ thị lưới tổng hợp lớn.
+
+    python benchmarks/bench_bidirectional.py --rows 150 --cols 100 --queries 20
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from algorithms.UCS import ucs
+from algorithms.a_star import a_star
+from algorithms.bidirectional import bidirectional_ucs, bidirectional_a_star
+from utils.graph_builder import build_compiled_graph, build_synthetic_graph, set_graph
+
+ENGINES = (
+    ("UCS", ucs),
+    ("UCS hai chiều", bidirectional_ucs),
+    ("A*", a_star),
+    ("A* hai chiều", bidirectional_a_star),
+)
+
+NORTH_SOUTH_ROUTES = [
+    ("Hà Nội", "Cà Mau"),
+    ("Hà Giang", "Cà Mau"),
+    ("Lào Cai", "Kiên Giang"),
+    ("Cao Bằng", "Bạc Liêu"),
+]
+
+
+def run(pairs, cost_priority: float) -> None:
+    print(f"{'thuật toán':14s} {'thời gian (s)':>14s} {'nút đã chốt':>12s} {'tổng giá trị':>14s}")
+    for name, search in ENGINES:
+        settled = 0
+        total = 0.0
+        start_time = time.perf_counter()
+        for start, goal in pairs:
+            stats = {}
+            with contextlib.redirect_stdout(io.StringIO()):
+                _, value, _ = search(start, goal, cost_priority, stats=stats)
+            settled += stats.get("settled", stats.get("iterations", 0))
+            total += value
+        elapsed = time.perf_counter() - start_time
+        print(f"{name:14s} {elapsed:14.3f} {settled:12d} {total:14.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=150)
+    parser.add_argument("--cols", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--cost-priority", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    graph = build_compiled_graph()
+    set_graph(graph)
+    print(f"{graph}, các tuyến Bắc - Nam")
+    run(NORTH_SOUTH_ROUTES, args.cost_priority)
+
+    # Tuyến dài trên lưới tổng hợp: điểm đầu ở 10% hàng trên cùng, điểm cuối ở 10% hàng dưới cùng
+    graph = build_synthetic_graph(args.rows, args.cols, seed=args.seed)
+    set_graph(graph)
+    rng = random.Random(args.seed)
+    band = max(1, args.rows // 10)
+    pairs = [
+        (f"N{rng.randrange(band)}_{rng.randrange(args.cols)}", f"N{args.rows - 1 - rng.randrange(band)}_{rng.randrange(args.cols)}")
+        for _ in range(args.queries)
+    ]
+    print(f"\n{graph}, {len(pairs)} tuyến Bắc - Nam ngẫu nhiên")
+    run(pairs, args.cost_priority)
+
+
+if __name__ == "__main__":
+    main()
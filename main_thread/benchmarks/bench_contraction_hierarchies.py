@@ -0,0 +1,64 @@
+"""
+Thời gian tiền xử lý, số cạnh tắt và thời gian truy vấn của Contraction
+Hierarchies so với UCS trên đồ thị lưới tổng hợp. Kết quả CH được kiểm tra
+bằng tổng giá trị của UCS trên cùng truy vấn.
+
+    python benchmarks/bench_contraction_hierarchies.py --rows 60 --cols 50 --queries 200
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from algorithms.UCS import ucs
+from algorithms.contraction_hierarchies import contraction_hierarchy_search, get_hierarchy
+from utils.graph_builder import build_synthetic_graph, set_graph
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=60)
+    parser.add_argument("--cols", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--cost-priority", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    graph = build_synthetic_graph(args.rows, args.cols, seed=args.seed)
+    set_graph(graph)
+
+    start_time = time.perf_counter()
+    hierarchy = get_hierarchy(graph, args.cost_priority)
+    print(f"{graph}")
+    print(f"{hierarchy}, tiền xử lý {time.perf_counter() - start_time:.2f} s")
+
+    rng = random.Random(args.seed)
+    pairs = [tuple(rng.sample(graph.names, 2)) for _ in range(args.queries)]
+
+    print(f"{'thuật toán':10s} {'ms/truy vấn':>12s} {'nút đã chốt':>12s}")
+    reference = []
+    for name in ("UCS", "CH"):
+        settled = 0
+        start_time = time.perf_counter()
+        for i, (start, goal) in enumerate(pairs):
+            stats = {}
+            if name == "UCS":
+                with contextlib.redirect_stdout(io.StringIO()):
+                    _, value, _ = ucs(start, goal, args.cost_priority, stats=stats)
+                reference.append(value)
+                settled += stats["iterations"]
+            else:
+                _, value, _ = contraction_hierarchy_search(start, goal, args.cost_priority, stats=stats)
+                assert abs(value - reference[i]) < 1e-9, f"CH khác UCS trên {start} -> {goal}"
+                settled += stats["settled"]
+        elapsed = time.perf_counter() - start_time
+        print(f"{name:10s} {elapsed / len(pairs) * 1000:12.3f} {settled / len(pairs):12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Khả năng mở rộng của Floyd-Warshall theo khối theo số tiến trình và kích thước
+khối trên đồ thị lưới tổng hợp, so với Floyd-Warshall NumPy một tiến trình.
+Khoảng cách của mỗi lần chạy được kiểm tra với kết quả một tiến trình.
+
+    python benchmarks/bench_floyd_warshall.py --rows 50 --cols 40 --block-sizes 128,256 --workers 1,2,4,8
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+
+import numpy as np
+
+from algorithms.floyd_warshall import blocked_floyd_warshall_matrices, floyd_warshall_matrices
+from utils.graph_builder import build_synthetic_graph
+
+
+def parse_ints(text: str):
+    return [int(x) for x in text.split(",") if x]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--cols", type=int, default=40)
+    parser.add_argument("--block-sizes", type=parse_ints, default=[128, 256])
+    parser.add_argument("--workers", type=parse_ints, default=None, help="Mặc định: 1, 2, 4, ... đến số CPU")
+    parser.add_argument("--float32", action="store_true", help="Lưu khoảng cách bằng float32")
+    parser.add_argument("--cost-priority", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    workers = args.workers
+    if workers is None:
+        cpus = os.cpu_count() or 1
+        workers = sorted({min(1 << i, cpus) for i in range(cpus.bit_length() + 1)})
+    dtype = np.float32 if args.float32 else np.float64
+
+    graph = build_synthetic_graph(args.rows, args.cols, seed=args.seed)
+    print(f"{graph}, {os.cpu_count()} CPU, {np.dtype(dtype).name}")
+
+    start_time = time.perf_counter()
+    reference, _, _ = floyd_warshall_matrices(graph, args.cost_priority, dtype)
+    baseline = time.perf_counter() - start_time
+    print(f"Floyd-Warshall NumPy một tiến trình: {baseline:.2f} s\n")
+
+    print(f"{'khối':>6s} {'tiến trình':>10s} {'thời gian (s)':>14s} {'tăng tốc':>9s} {'so với NumPy':>13s} {'lệch tối đa':>12s}")
+    for block_size in args.block_sizes:
+        single = None
+        for count in workers:
+            start_time = time.perf_counter()
+            dist, _ = blocked_floyd_warshall_matrices(graph, args.cost_priority, dtype, block_size, count)
+            elapsed = time.perf_counter() - start_time
+            if single is None:
+                single = elapsed
+            finite = np.isfinite(reference)
+            deviation = float(np.max(np.abs(dist[finite] - reference[finite]), initial=0.0))
+            print(f"{block_size:6d} {count:10d} {elapsed:14.2f} {single / elapsed:8.2f}x {baseline / elapsed:12.2f}x {deviation:12.2e}")
+
+
+if __name__ == "__main__":
+    main()
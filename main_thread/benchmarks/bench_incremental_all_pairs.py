@@ -0,0 +1,87 @@
+"""
+Cập nhật tăng dần ma trận mọi cặp (DynamicAllPairs) so với tính lại toàn bộ bằng
+Floyd-Warshall sau mỗi thay đổi, cho một loạt thay đổi cạnh ngẫu nhiên: đóng cạnh,
+tăng trọng số (tắc đường) và giảm trọng số. Sau loạt thay đổi, ma trận khoảng cách
+được kiểm tra với kết quả tính lại toàn bộ.
+
+    python benchmarks/bench_incremental_all_pairs.py --rows 30 --cols 20 --changes 50
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+
+import numpy as np
+
+from algorithms.floyd_warshall import dynamic_all_pairs, recompute_all_pairs
+from utils.graph_builder import build_synthetic_graph, get_graph
+
+# Loại thay đổi: (tên, xác suất)
+CHANGE_KINDS = (("đóng", 0.3), ("tăng", 0.4), ("giảm", 0.3))
+
+
+def random_changes(graph, count: int, cost_priority: float, seed: int):
+    """Danh sách (loại, cạnh, trọng số mới) ngẫu nhiên"""
+    rng = np.random.default_rng(seed)
+    base = graph.edge_weight_array(cost_priority)
+    names = [name for name, _ in CHANGE_KINDS]
+    probabilities = [p for _, p in CHANGE_KINDS]
+    changes = []
+    for _ in range(count):
+        kind = names[rng.choice(len(names), p=probabilities)]
+        e = int(rng.integers(graph.num_edges))
+        if kind == "đóng":
+            weight = np.inf
+        elif kind == "tăng":
+            weight = base[e] * rng.uniform(1.5, 4.0)
+        else:
+            weight = base[e] * rng.uniform(0.3, 0.9)
+        changes.append((kind, e, weight))
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=30)
+    parser.add_argument("--cols", type=int, default=20)
+    parser.add_argument("--provinces", action="store_true", help="Dùng đồ thị 63 tỉnh/thành thay cho lưới tổng hợp")
+    parser.add_argument("--changes", type=int, default=50)
+    parser.add_argument("--cost-priority", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    graph = get_graph() if args.provinces else build_synthetic_graph(args.rows, args.cols, seed=args.seed)
+    print(graph)
+    dynamic = dynamic_all_pairs(graph, args.cost_priority)
+    changes = random_changes(graph, args.changes, args.cost_priority, args.seed)
+
+    elapsed = {name: 0.0 for name, _ in CHANGE_KINDS}
+    counts = {name: 0 for name, _ in CHANGE_KINDS}
+    recomputed = {name: 0 for name, _ in CHANGE_KINDS}
+    full = 0.0
+    for kind, e, weight in changes:
+        start_time = time.perf_counter()
+        recomputed[kind] += dynamic.set_edge_weight(e, weight)
+        elapsed[kind] += time.perf_counter() - start_time
+        counts[kind] += 1
+
+        start_time = time.perf_counter()
+        dist, _ = recompute_all_pairs(dynamic)
+        full += time.perf_counter() - start_time
+
+    print(f"{'thay đổi':>9s} {'số lần':>7s} {'hàng/cột tính lại':>18s} {'tăng dần (ms/lần)':>18s}")
+    for name, _ in CHANGE_KINDS:
+        if counts[name]:
+            print(f"{name:>9s} {counts[name]:7d} {recomputed[name] / counts[name]:18.1f} {1000 * elapsed[name] / counts[name]:18.2f}")
+
+    incremental = sum(elapsed.values())
+    finite = np.isfinite(dist)
+    deviation = float(np.max(np.abs(dynamic.dist[finite] - dist[finite]), initial=0.0))
+    print(f"\nTăng dần: {incremental:.3f} s, tính lại toàn bộ sau mỗi thay đổi: {full:.3f} s ({full / max(incremental, 1e-12):.1f}x)")
+    print(f"Cùng tập cặp không có đường: {bool((finite == np.isfinite(dynamic.dist)).all())}, lệch khoảng cách tối đa: {deviation:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+So sánh tốc độ mở rộng nút của UCS / A* với các loại hàng đợi ưu tiên trên
+đồ thị lưới tổng hợp lớn. Hàng đợi "locked" mô phỏng cách làm cũ với
+queue.PriorityQueue (có khóa, xóa lười) để làm mốc so sánh. Với "bucket" /
+"radix" trọng số được lượng tử hóa (A* không dùng "radix" vì khóa f có thể giảm), cột
+"lệch" là chênh lệch lớn nhất so với
+kết quả số thực của hàng đợi đầu tiên.
+
+    python benchmarks/bench_priority_queue.py --rows 150 --cols 100 --queries 20
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import contextlib
+import io
+import random
+import time
+from queue import PriorityQueue
+
+from algorithms.UCS import ucs
+from algorithms.a_star import a_star
+from utils.graph_builder import build_synthetic_graph, set_graph
+from utils.priority_queue import INTEGER_QUEUES, MONOTONE_QUEUES, QUEUE_TYPES
+
+
+class LockedQueue:
+    """queue.PriorityQueue với xóa lười, giống hàng đợi trước đây của các thuật toán"""
+
+    def __init__(self, capacity: int = 0):
+        self.queue = PriorityQueue()
+        self.best = {}
+
+    def __len__(self):
+        return len(self.best)
+
+    def push(self, item, key):
+        current = self.best.get(item)
+        if current is not None and current <= key:
+            return False
+        self.best[item] = key
+        self.queue.put((key, random.random(), item))
+        return True
+
+    def pop(self):
+        while True:
+            key, _, item = self.queue.get()
+            if self.best.get(item) == key:
+                del self.best[item]
+                return key, item
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=150)
+    parser.add_argument("--cols", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scale", type=int, default=100, help="hệ số lượng tử hóa cho bucket / radix")
+    args = parser.parse_args()
+
+    graph = build_synthetic_graph(args.rows, args.cols, seed=args.seed)
+    set_graph(graph)
+    QUEUE_TYPES["locked"] = LockedQueue
+
+    rng = random.Random(args.seed)
+    pairs = [tuple(rng.sample(graph.names, 2)) for _ in range(args.queries)]
+    print(f"{graph}, {len(pairs)} truy vấn ngẫu nhiên")
+    print(f"{'thuật toán':10s} {'hàng đợi':8s} {'thời gian (s)':>14s} {'nút mở rộng':>12s} {'nút/giây':>12s} {'lệch':>10s}")
+
+    for name, search in (("UCS", ucs), ("A*", a_star)):
+        reference = None
+        for queue_type in ("locked", "binary", "4-ary", "lazy", "bucket", "radix"):
+            if search is a_star and queue_type in MONOTONE_QUEUES:
+                continue
+            expanded = 0
+            values = []
+            start_time = time.perf_counter()
+            for start, goal in pairs:
+                stats = {}
+                with contextlib.redirect_stdout(io.StringIO()):
+                    _, value, _ = search(start, goal, 0.5, queue_type=queue_type, stats=stats, scale=args.scale)
+                expanded += stats.get("iterations", 0)
+                values.append(value)
+            elapsed = time.perf_counter() - start_time
+            if reference is None:
+                reference = values
+            deviation = max(abs(a - b) for a, b in zip(values, reference))
+            if queue_type not in INTEGER_QUEUES:
+                assert deviation < 1e-9, "kết quả khác nhau giữa các hàng đợi"
+            print(f"{name:10s} {queue_type:8s} {elapsed:14.3f} {expanded:12d} {expanded / elapsed:12.0f} {deviation:10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,31 +5,21 @@ import os
 # Add the parent directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.distance_function import haversine_distance
+from utils.distance_matrix import distance_matrix
 
 # Read the coordinates file
 df = pd.read_csv('vietnam_provinces_coordinates.csv')
 
+# Calculate distances between all pairs of provinces in one vectorized call
+names = df['Province'].tolist()
+matrix = distance_matrix(df['Latitude'].to_numpy(), df['Longitude'].to_numpy())
+
 # Create a dictionary to store distances
 DISTANCE = {}
-
-# Calculate distances between all pairs of provinces
-for i in range(len(df)):
-    for j in range(i + 1, len(df)):
-        province1 = df.iloc[i]['Province']
-        province2 = df.iloc[j]['Province']
-        
-        lat1 = df.iloc[i]['Latitude']
-        lon1 = df.iloc[i]['Longitude']
-        lat2 = df.iloc[j]['Latitude']
-        lon2 = df.iloc[j]['Longitude']
-        
-        # Calculate distance using haversine formula
-        distance = haversine_distance(lat1, lon1, lat2, lon2)
-        
-        # Store the distance in the dictionary
-        DISTANCE[(province1, province2)] = distance
-        DISTANCE[(province2, province1)] = distance  # Store reverse direction as well
+for i, row in enumerate(matrix.tolist()):
+    for j in range(i + 1, len(names)):
+        DISTANCE[(names[i], names[j])] = row[j]
+        DISTANCE[(names[j], names[i])] = row[j]  # Store reverse direction as well
 
 # Print the distances
 print("\nDistances between provinces (in kilometers):")
@@ -1,5 +1,4 @@
 from typing import Optional, Dict, List
-import pandas as pd
 
 #load vietnam_provinces_coordinates.csv and create a dictionary of coordinates
 coordinates = {
@@ -11,19 +11,37 @@ import matplotlib.pyplot as plt
 from matplotlib.colors import to_rgba
 
 # Import algorithms
-from algorithms.UCS import ucs, build_graph_from_province_data, calculate_transport_options_ucs
+from algorithms.UCS import ucs, calculate_transport_options_ucs
 from algorithms.a_star import a_star, calculate_transport_options
 from algorithms.floyd_warshall import floyd_warshall, calculate_transport_options_floyd_warshall
-from algorithms.ACO import calculate_transport_options_aco
+from algorithms.ACO import ACO_STAGNATION_ITERATIONS, calculate_transport_options_aco
 from algorithms.greedy_best_first_search import calculate_transport_options_greedy
+from algorithms.bidirectional import calculate_transport_options_bidirectional_ucs, calculate_transport_options_bidirectional_a_star
+from algorithms.contraction_hierarchies import calculate_transport_options_ch
+from algorithms.hub_labeling import calculate_transport_options_hub_labels
+from algorithms.arc_flags import calculate_transport_options_arc_flags
+from algorithms.customizable_route_planning import calculate_transport_options_crp
+from algorithms.route_table_lookup import calculate_transport_options_route_table
+from algorithms.ara_star import calculate_transport_options_ara
+from utils.heuristic_function import HEURISTIC_MODES
+from utils.graph_builder import get_graph
+from utils.route_tables import preload_route_tables
 from data.provinces_infor import provinces, coordinates
 
 #turn of warning
 import warnings
 warnings.filterwarnings("ignore")
 
+@st.cache_resource
+def load_route_tables(graph_version: str) -> int:
+    """Nạp (mmap) các bảng tra cứu mọi cặp đã tính trước một lần cho mỗi phiên bản đồ thị trong tiến trình"""
+    return preload_route_tables(get_graph())
+
 def main():
     st.title("Tối ưu hóa Logistics cho mạng lưới giao thông Việt Nam")
+
+    # Streamlit chạy lại main() sau mỗi thao tác, bảng chỉ được nạp ở lần đầu
+    load_route_tables(get_graph().version)
     
     # Initialize session state for destination selection
     if 'start_province' not in st.session_state:
@@ -38,10 +56,64 @@ def main():
     # Algorithm selection
     algorithm = st.sidebar.selectbox(
         "Chọn thuật toán",
-        ["UCS (Uniform Cost Search)", "A* (A-Star)", "Floyd-Warshall", "ACO (Ant Colony Optimization)", "Greedy Best First Search"],
+        ["UCS (Uniform Cost Search)", "A* (A-Star)", "Floyd-Warshall", "ACO (Ant Colony Optimization)", "Greedy Best First Search", "UCS hai chiều (Bidirectional Dijkstra)", "A* hai chiều (Bidirectional A*)", "Contraction Hierarchies", "Hub Labeling", "Arc-flags", "CRP (Customizable Route Planning)", "Bảng tra cứu mọi cặp", "ARA* (A* anytime)"],
         key="algorithm_selection"
     )
     
+    # Heuristic selection for A* variants
+    heuristic_mode = "geodesic"
+    if algorithm in ("A* (A-Star)", "A* hai chiều (Bidirectional A*)"):
+        # A* hai chiều chỉ tối ưu với heuristic nhất quán (ALT)
+        modes = list(HEURISTIC_MODES)
+        if algorithm == "A* hai chiều (Bidirectional A*)":
+            modes = [mode for mode in modes if HEURISTIC_MODES[mode] is not None]
+        heuristic_mode = st.sidebar.selectbox(
+            "Heuristic cho A*",
+            modes,
+            format_func=lambda mode: {
+                "geodesic": "Khoảng cách địa lý (có thể không tối ưu)",
+                "alt": "ALT (landmark xa nhất)",
+                "alt-regions": "ALT (landmark theo tiểu vùng)",
+            }[mode],
+            key="heuristic_mode"
+        )
+
+    # Thời gian chạy tối đa cho ACO: trang hiển thị ngay đường tốt nhất hiện tại và làm mịn dần
+    aco_time_budget = 5.0
+    if algorithm == "ACO (Ant Colony Optimization)":
+        aco_time_budget = st.sidebar.number_input(
+            "Thời gian tối đa cho ACO (giây)",
+            min_value=0.5,
+            max_value=60.0,
+            value=5.0,
+            step=0.5,
+            key="aco_time_budget"
+        )
+
+    # Thời gian chờ tối đa cho ARA*: trả về đường tốt nhất tìm được kèm hệ số dưới tối ưu tối đa
+    ara_time_budget = 50
+    if algorithm == "ARA* (A* anytime)":
+        ara_time_budget = st.sidebar.number_input(
+            "Thời gian tối đa cho ARA* (ms)",
+            min_value=1,
+            max_value=10000,
+            value=50,
+            step=10,
+            key="ara_time_budget"
+        )
+
+    # Beam search cho Greedy: giới hạn số nút giữ lại mỗi tầng (0: Greedy Best First Search thường)
+    beam_width = 0
+    if algorithm == "Greedy Best First Search":
+        beam_width = st.sidebar.number_input(
+            "Độ rộng beam (0: không giới hạn)",
+            min_value=0,
+            max_value=100,
+            value=0,
+            step=1,
+            key="beam_width"
+        )
+
     # Start province selection with callback to update valid destinations
     def on_start_change():
         # Only update end_province if it's the same as start_province
@@ -98,7 +170,7 @@ def main():
             
         elif algorithm == "A* (A-Star)":  # A*
             # Run A* algorithm
-            result = calculate_transport_options(start_province, end_province, cost_priority)
+            result = calculate_transport_options(start_province, end_province, cost_priority, heuristic_mode=heuristic_mode)
             
             st.subheader("Kết quả tìm đường với A*")
             display_results(result, start_province, end_province)
@@ -110,16 +182,88 @@ def main():
             display_results(result, start_province, end_province)
 
         elif algorithm == "ACO (Ant Colony Optimization)":
-            result = calculate_transport_options_aco(start_province, end_province, cost_priority)
-
             st.subheader("Kết quả tìm đường với ACO")
+            progress_placeholder = st.empty()
+
+            def show_progress(best, iteration):
+                # Đường tốt nhất hiện tại, được thay thế khi tìm được đường tốt hơn
+                total_hours = int(best['time'])
+                total_minutes = int((best['time'] - total_hours) * 60)
+                progress_placeholder.info(
+                    f"Vòng lặp {iteration}: " + " -> ".join(best['path'])
+                    + f" ({round(best['cost'], 2):,} VND, {total_hours} giờ {total_minutes} phút)"
+                )
+
+            result = calculate_transport_options_aco(
+                start_province, end_province, cost_priority,
+                progress=show_progress,
+                time_budget=aco_time_budget,
+                stagnation_iterations=ACO_STAGNATION_ITERATIONS,
+            )
+            progress_placeholder.empty()
+            display_results(result, start_province, end_province)
+
+        elif algorithm == "ARA* (A* anytime)":
+            result = calculate_transport_options_ara(start_province, end_province, cost_priority, time_budget=ara_time_budget / 1000)
+
+            st.subheader("Kết quả tìm đường với ARA*")
+            if result['path']:
+                if result['suboptimality_bound'] <= 1.0:
+                    st.caption("Đường đi tối ưu")
+                else:
+                    st.caption(f"Hết thời gian: tổng trọng số không quá {result['suboptimality_bound']:.3f} lần tối ưu")
             display_results(result, start_province, end_province)
 
         elif algorithm == "Greedy Best First Search":
-            result = calculate_transport_options_greedy(start_province, end_province, cost_priority)
+            result = calculate_transport_options_greedy(start_province, end_province, cost_priority, beam_width=int(beam_width))
 
             st.subheader("Kết quả tìm đường với Greedy Best First Search")
             display_results(result, start_province, end_province)
+
+        elif algorithm == "UCS hai chiều (Bidirectional Dijkstra)":
+            result = calculate_transport_options_bidirectional_ucs(start_province, end_province, cost_priority)
+
+            st.subheader("Kết quả tìm đường với UCS hai chiều")
+            st.caption(f"Số nút đã chốt: {result['settled_nodes']}")
+            display_results(result, start_province, end_province)
+
+        elif algorithm == "Bảng tra cứu mọi cặp":
+            result = calculate_transport_options_route_table(start_province, end_province, cost_priority)
+
+            st.subheader("Kết quả tìm đường với bảng tra cứu mọi cặp")
+            display_results(result, start_province, end_province)
+
+        elif algorithm == "A* hai chiều (Bidirectional A*)":
+            result = calculate_transport_options_bidirectional_a_star(start_province, end_province, cost_priority, heuristic_mode=heuristic_mode)
+
+            st.subheader("Kết quả tìm đường với A* hai chiều")
+            st.caption(f"Số nút đã chốt: {result['settled_nodes']}")
+            display_results(result, start_province, end_province)
+
+        elif algorithm == "Contraction Hierarchies":
+            result = calculate_transport_options_ch(start_province, end_province, cost_priority)
+
+            st.subheader("Kết quả tìm đường với Contraction Hierarchies")
+            display_results(result, start_province, end_province)
+
+        elif algorithm == "Hub Labeling":
+            result = calculate_transport_options_hub_labels(start_province, end_province, cost_priority)
+
+            st.subheader("Kết quả tìm đường với Hub Labeling")
+            display_results(result, start_province, end_province)
+
+        elif algorithm == "Arc-flags":
+            result = calculate_transport_options_arc_flags(start_province, end_province, cost_priority)
+
+            st.subheader("Kết quả tìm đường với Arc-flags")
+            display_results(result, start_province, end_province)
+
+        elif algorithm == "CRP (Customizable Route Planning)":
+            result = calculate_transport_options_crp(start_province, end_province, cost_priority)
+
+            st.subheader("Kết quả tìm đường với CRP")
+            st.caption(f"Số nút đã chốt: {result['settled_nodes']}")
+            display_results(result, start_province, end_province)
             
             
 
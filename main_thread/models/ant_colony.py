@@ -0,0 +1,233 @@
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# MAX-MIN Ant System: tau_min = tau_max / (MMAS_MIN_FACTOR * số nút)
+MMAS_MIN_FACTOR = 2
+
+# Số cạnh ứng viên nên dùng cho mạng lưới tỉnh/thành (bậc trung bình khoảng 4): với
+# ứng viên xếp theo cận dưới đến đích, 2 hội tụ nhanh nhất trong các giá trị đã đo
+DEFAULT_CANDIDATE_SIZE = 2
+
+
+class AntColony:
+    """
+    Trạng thái một đàn kiến (ACO) cho một cặp (start, goal) lưu trong các mảng NumPy.
+
+    Pheromone tau và heuristic eta = 1 / trọng số được lưu theo chỉ số cạnh (CSR).
+    choices[u] là các cạnh đi ra của u, độn -1 đến bậc lớn nhất của đồ thị, để mọi
+    con kiến của một vòng lặp đi cùng lúc: mỗi bước là vài phép NumPy trên ma trận
+    (số kiến × bậc lớn nhất), chọn cạnh theo xác suất tỉ lệ với
+    tau ** alpha * eta ** beta (tính một lần mỗi vòng lặp) bằng tổng tích lũy và một
+    số ngẫu nhiên cho mỗi kiến.
+
+    Với candidate_size, kiến chỉ chọn trong candidate_size cạnh tốt nhất của mỗi nút
+    (candidates, tính trước) và chỉ xét mọi cạnh khi các cạnh ứng viên đều dẫn đến nút
+    đã thăm. Cạnh u -> v được xếp theo trọng số + goal_bounds[v] (cận dưới khoảng cách
+    từ v đến goal) nếu có, nếu không theo eta; chỉ xếp theo eta thì cạnh ngắn nhưng đi
+    xa đích được ưu tiên và kiến hội tụ chậm hơn ACO gốc. Với mmas (MAX-MIN Ant System), pheromone bị chặn trong
+    [tau_max / (MMAS_MIN_FACTOR * n), tau_max] với tau_max = Q / (evaporation_rate *
+    giá trị đường tốt nhất), và được đặt bằng tau_max khi có đường đầu tiên.
+    """
+
+    __slots__ = (
+        "start", "goal", "alpha", "beta", "evaporation_rate", "Q", "max_steps",
+        "weights", "eta", "tau", "targets", "choices", "choice_targets",
+        "candidates", "candidate_targets", "mmas", "tau_max",
+    )
+
+    def __init__(
+        self,
+        graph,
+        weights: np.ndarray,
+        start: int,
+        goal: int,
+        alpha: float = 1.0,
+        beta: float = 2.0,
+        evaporation_rate: float = 0.1,
+        Q: float = 100.0,
+        max_steps: int = 100,
+        initial_tau: float = 1.0,
+        candidate_size: Optional[int] = None,
+        mmas: bool = False,
+        goal_bounds: Optional[np.ndarray] = None,
+    ):
+        n = graph.num_nodes
+        self.start = start
+        self.goal = goal
+        self.alpha = alpha
+        self.beta = beta
+        self.evaporation_rate = evaporation_rate
+        self.Q = Q
+        self.max_steps = max_steps
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.eta = np.where(self.weights > 0, 1.0 / np.where(self.weights > 0, self.weights, 1.0), 1.0)
+        self.tau = np.full(len(self.weights), initial_tau)
+        self.targets = np.asarray(graph.targets, dtype=np.int64)
+        self.mmas = mmas
+        self.tau_max: Optional[float] = None
+
+        indptr = np.asarray(graph.indptr, dtype=np.int64)
+        degrees = np.diff(indptr)
+        width = max(int(degrees.max(initial=0)), 1)
+        slots = np.arange(width)[None, :]
+        self.choices = np.where(slots < degrees[:, None], indptr[:-1, None] + slots, -1)
+        # Đích của mỗi lựa chọn, n (nút giả luôn "đã thăm") ở các ô độn
+        self.choice_targets = np.where(self.choices >= 0, self.targets[np.maximum(self.choices, 0)], n)
+
+        self.candidates = self.candidate_targets = None
+        if candidate_size is not None and 0 < candidate_size < width:
+            # Các cạnh của mỗi nút xếp theo trọng số + cận dưới đến đích tăng dần (hoặc eta
+            # giảm dần), ô độn xếp cuối
+            if goal_bounds is None:
+                rank = -self.eta
+            else:
+                rank = self.weights + np.asarray(goal_bounds, dtype=np.float64)[self.targets]
+            keys = np.where(self.choices >= 0, rank[np.maximum(self.choices, 0)], np.inf)
+            order = np.argsort(keys, axis=1, kind="stable")[:, :candidate_size]
+            self.candidates = np.take_along_axis(self.choices, order, axis=1)
+            self.candidate_targets = np.take_along_axis(self.choice_targets, order, axis=1)
+
+    def __repr__(self):
+        return f"AntColony(start={self.start}, goal={self.goal}, edges={len(self.tau)})"
+
+    def attractiveness(self) -> np.ndarray:
+        """tau ** alpha * eta ** beta của mọi cạnh, tính một lần cho mỗi vòng lặp"""
+        return np.power(self.tau, self.alpha) * np.power(self.eta, self.beta)
+
+    @staticmethod
+    def _sample(table: np.ndarray, attract: np.ndarray, closed: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Mỗi hàng chọn một ô của table theo attract (bỏ các ô closed); -1 nếu hàng không còn ô nào"""
+        probabilities = np.where(closed, 0.0, attract)
+        cumulative = np.cumsum(probabilities, axis=1)
+        totals = cumulative[:, -1]
+        # 1 - random() nằm trong (0, 1] nên không bao giờ chọn ô có xác suất 0
+        picks = (cumulative < ((1.0 - rng.random(len(table))) * totals)[:, None]).sum(axis=1)
+        edges = table[np.arange(len(table)), np.minimum(picks, table.shape[1] - 1)]
+        return np.where(totals > 0, edges, -1)
+
+    def construct(self, num_ants: int, rng: np.random.Generator) -> Tuple[List[int], float, int]:
+        """
+        Cho num_ants con kiến đi cùng lúc từ start, mỗi bước chọn một cạnh đến nút chưa
+        thăm, dừng khi đến goal, hết cạnh hoặc sau max_steps bước.
+
+        Returns:
+            Tuple (các cạnh của đường tốt nhất trong vòng, tổng trọng số, số bước kiến);
+            ([], inf, số bước) nếu không kiến nào đến goal
+        """
+        if self.start == self.goal:
+            return [], 0.0, 0
+        n = len(self.choices)
+        # Độ hấp dẫn của từng ô trong choices / candidates (0 ở ô độn), tính một lần cho vòng lặp
+        attract = np.append(self.attractiveness(), 0.0)
+        choice_attract = attract[self.choices]
+        candidate_attract = None if self.candidates is None else attract[self.candidates]
+        # visited phẳng: ô ant * (n + 1) + u; cột n là nút giả của các ô độn
+        visited = np.zeros(num_ants * (n + 1), dtype=bool)
+        rows = np.arange(num_ants) * (n + 1)
+        visited[rows + n] = True
+        visited[rows + self.start] = True
+        current = np.full(num_ants, self.start, dtype=np.int64)
+        values = np.zeros(num_ants)
+        walked = np.full((self.max_steps, num_ants), -1, dtype=np.int64)
+        active = np.arange(num_ants)
+
+        ant_steps = 0
+        for step in range(self.max_steps):
+            nodes = current[active]
+            if candidate_attract is None:
+                edges = self._sample(self.choices[nodes], choice_attract[nodes], visited[rows[active, None] + self.choice_targets[nodes]], rng)
+            else:
+                edges = self._sample(self.candidates[nodes], candidate_attract[nodes], visited[rows[active, None] + self.candidate_targets[nodes]], rng)
+                # Các cạnh ứng viên đều đến nút đã thăm: xét mọi cạnh của nút
+                stuck = np.flatnonzero(edges < 0)
+                if len(stuck):
+                    stuck_nodes = nodes[stuck]
+                    edges[stuck] = self._sample(
+                        self.choices[stuck_nodes],
+                        choice_attract[stuck_nodes],
+                        visited[rows[active[stuck], None] + self.choice_targets[stuck_nodes]],
+                        rng,
+                    )
+            # Kiến không còn cạnh nào để đi dừng lại
+            moving = edges >= 0
+            if not moving.all():
+                active, edges = active[moving], edges[moving]
+                if len(active) == 0:
+                    break
+            nodes = self.targets[edges]
+            walked[step, active] = edges
+            values[active] += self.weights[edges]
+            visited[rows[active] + nodes] = True
+            current[active] = nodes
+            ant_steps += len(active)
+            active = active[nodes != self.goal]
+            if len(active) == 0:
+                break
+
+        reached = current == self.goal
+        if not reached.any():
+            return [], float("inf"), ant_steps
+        best = int(np.flatnonzero(reached)[np.argmin(values[reached])])
+        edges = walked[:, best]
+        return edges[edges >= 0].tolist(), float(values[best]), ant_steps
+
+    def pheromone_entropy(self, nodes: Sequence[int]) -> float:
+        """
+        Entropy chuẩn hóa (0: pheromone dồn hết vào một cạnh, 1: đều) của phân bố
+        pheromone trên các cạnh đi ra, trung bình trên các nút nodes có hơn một cạnh.
+        Nút ngoài đường tốt nhất giữ pheromone đều (chỉ bị bay hơi) nên chỉ xét các nút
+        trên đường đó mới đo được mức hội tụ.
+        """
+        options = self.choices[np.asarray(nodes, dtype=np.int64)]
+        degrees = (options >= 0).sum(axis=1)
+        options, degrees = options[degrees > 1], degrees[degrees > 1]
+        if len(options) == 0:
+            return 0.0
+        tau = np.append(self.tau, 0.0)[options]
+        p = tau / tau.sum(axis=1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            terms = np.where(p > 0, -p * np.log(p), 0.0)
+        return float(np.mean(terms.sum(axis=1) / np.log(degrees)))
+
+    def update(self, edges: List[int], value: float, best_value: float = float("inf")) -> None:
+        """
+        Bay hơi trên mọi cạnh (một phép nhân tại chỗ) rồi rải Q / value lên các cạnh của
+        đường; với mmas, chặn pheromone theo giá trị đường tốt nhất đến giờ
+        (min(best_value, value)).
+        """
+        self.tau *= 1 - self.evaporation_rate
+        if edges:
+            self.tau[edges] += self.Q / value
+        best_value = min(best_value, value)
+        if self.mmas and best_value < float("inf"):
+            tau_max = self.Q / (self.evaporation_rate * max(best_value, 1e-12))
+            if self.tau_max is None:
+                self.tau.fill(tau_max)
+            self.tau_max = tau_max
+            np.clip(self.tau, tau_max / (MMAS_MIN_FACTOR * len(self.choices)), tau_max, out=self.tau)
+
+    def run(
+        self,
+        num_ants: int,
+        num_iterations: int,
+        rng: np.random.Generator,
+        improve: Optional[Callable[[List[int], float], Tuple[List[int], float]]] = None,
+    ) -> Tuple[List[int], float, int]:
+        """
+        num_iterations vòng lặp construct + update; improve(edges, value) nếu có được
+        áp dụng cho đường tốt nhất của mỗi vòng lặp trước khi rải pheromone.
+
+        Returns:
+            Tuple (các cạnh của đường tốt nhất, tổng trọng số, tổng số bước kiến)
+        """
+        best_edges, best_value, ant_steps = [], float("inf"), 0
+        for _ in range(num_iterations):
+            edges, value, steps = self.construct(num_ants, rng)
+            ant_steps += steps
+            if edges and improve is not None:
+                edges, value = improve(edges, value)
+            self.update(edges, value, best_value)
+            if edges and value < best_value:
+                best_edges, best_value = edges, value
+        return best_edges, best_value, ant_steps
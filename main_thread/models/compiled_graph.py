@@ -0,0 +1,334 @@
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models.province_node import ProvinceNode
+
+# Mã phương tiện của mỗi cạnh
+ROAD = 0
+FLY = 1
+MODE_NAMES = ("road", "fly")
+
+# Chi phí lưu trong đồ thị là distance * COST_PER_KM; khi tìm đường chia cho 10000,
+# khi hiển thị kết quả chia cho 10 (giữ nguyên quy ước của các thuật toán cũ)
+SEARCH_COST_DIVISOR = 10000
+DISPLAY_COST_DIVISOR = 10
+
+# Số lượng cost_priority khác nhau được giữ trong cache trọng số
+WEIGHT_CACHE_SIZE = 128
+
+# Hệ số lượng tử hóa mặc định khi đổi trọng số sang số nguyên cố định:
+# 100 giữ 2 chữ số thập phân, cùng độ chính xác với heuristic
+DEFAULT_WEIGHT_SCALE = 100
+
+
+def quantization_error_bound(hops: int, scale: int) -> float:
+    """
+    Sai số lớn nhất giữa tổng trọng số thực của một đường đi có hops cạnh và
+    tổng trọng số nguyên của nó chia cho scale (mỗi cạnh lệch tối đa 0.5 / scale).
+    """
+    return hops * 0.5 / scale
+
+
+class CompiledGraph:
+    """
+    Đồ thị mạng lưới giao thông đã được biên dịch, chỉ đọc.
+
+    Các tỉnh/thành được đánh số nguyên 0..n-1, danh sách kề lưu theo dạng CSR:
+    các cạnh đi ra từ nút u nằm trong khoảng [indptr[u], indptr[u + 1]) của
+    các mảng targets, modes, distances, times, costs.
+
+    tables chứa các bảng tính sẵn tùy chọn (ví dụ ma trận khoảng cách địa lý n×n)
+    được lưu cùng đồ thị trong file snapshot.
+    """
+
+    __slots__ = (
+        "version",
+        "names",
+        "index",
+        "latitudes",
+        "longitudes",
+        "is_airport",
+        "indptr",
+        "targets",
+        "modes",
+        "distances",
+        "times",
+        "costs",
+        "_nodes",
+        "tables",
+        "_cache",
+        "_weight_cache",
+    )
+
+    def __init__(
+        self,
+        version: str,
+        names: Sequence[str],
+        latitudes: np.ndarray,
+        longitudes: np.ndarray,
+        is_airport: np.ndarray,
+        indptr: np.ndarray,
+        targets: np.ndarray,
+        modes: np.ndarray,
+        distances: np.ndarray,
+        times: np.ndarray,
+        costs: np.ndarray,
+        nodes: Sequence = (),
+        tables: Optional[Dict[str, np.ndarray]] = None,
+    ):
+        arrays = {
+            "latitudes": latitudes,
+            "longitudes": longitudes,
+            "is_airport": is_airport,
+            "indptr": indptr,
+            "targets": targets,
+            "modes": modes,
+            "distances": distances,
+            "times": times,
+            "costs": costs,
+        }
+        for name, array in arrays.items():
+            if array.flags.writeable:
+                array.flags.writeable = False
+            object.__setattr__(self, name, array)
+
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "names", tuple(names))
+        object.__setattr__(self, "index", {name: i for i, name in enumerate(self.names)})
+        # Các ProvinceNode chỉ được tạo khi cần (xem nodes), để nạp snapshot không phải
+        # duyệt O(n + m) trong Python
+        object.__setattr__(self, "_nodes", tuple(nodes) if nodes else None)
+        object.__setattr__(self, "tables", dict(tables or {}))
+        for table in self.tables.values():
+            if table.flags.writeable:
+                table.flags.writeable = False
+        object.__setattr__(self, "_cache", {})
+        # Trọng số theo cost_priority để riêng, bỏ mục cũ nhất khi vượt WEIGHT_CACHE_SIZE
+        # mà không làm mất danh sách kề trong _cache
+        object.__setattr__(self, "_weight_cache", OrderedDict())
+
+        if len(indptr) != len(self.names) + 1:
+            raise ValueError("indptr phải có đúng n + 1 phần tử")
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CompiledGraph là đối tượng chỉ đọc")
+
+    def __reduce__(self):
+        # Cho phép gửi đồ thị sang tiến trình con (ProcessPoolExecutor); cache không được gửi theo
+        return (
+            CompiledGraph,
+            (
+                self.version, self.names, self.latitudes, self.longitudes, self.is_airport,
+                self.indptr, self.targets, self.modes, self.distances, self.times, self.costs,
+                self._nodes or (), self.tables,
+            ),
+        )
+
+    def __repr__(self):
+        return f"CompiledGraph(version={self.version!r}, nodes={self.num_nodes}, edges={self.num_edges})"
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.names)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    @property
+    def nodes(self) -> Tuple[ProvinceNode, ...]:
+        """ProvinceNode của mọi nút (láng giềng đường bộ theo CSR), tạo ở lần truy cập đầu tiên"""
+        if self._nodes is None:
+            indptr, targets, modes = self.adjacency()
+            names = self.names
+            nodes = tuple(
+                ProvinceNode(
+                    u, name, float(self.latitudes[u]), float(self.longitudes[u]),
+                    [names[targets[e]] for e in range(indptr[u], indptr[u + 1]) if modes[e] == ROAD],
+                )
+                for u, name in enumerate(names)
+            )
+            object.__setattr__(self, "_nodes", nodes)
+        return self._nodes
+
+    def node_id(self, name: str) -> int:
+        """Trả về id nguyên của tỉnh/thành, -1 nếu không tồn tại"""
+        return self.index.get(name, -1)
+
+    def edges_of(self, u: int) -> range:
+        """Khoảng chỉ số các cạnh đi ra từ nút u"""
+        return range(int(self.indptr[u]), int(self.indptr[u + 1]))
+
+    def adjacency(self) -> Tuple[List[int], List[int], List[int]]:
+        """
+        Bản sao dạng list Python của (indptr, targets, modes) để dùng trong các
+        vòng lặp tìm kiếm thuần Python (truy cập list nhanh hơn truy cập mảng numpy
+        từng phần tử). Được tính một lần cho mỗi đồ thị.
+        """
+        cached = self._cache.get("adjacency")
+        if cached is None:
+            cached = (self.indptr.tolist(), self.targets.tolist(), self.modes.tolist())
+            self._cache["adjacency"] = cached
+        return cached
+
+    def reverse_adjacency(self) -> Tuple[List[int], List[int], List[int]]:
+        """
+        Danh sách kề ngược dạng CSR (rindptr, sources, edge_ids): các cạnh đi vào
+        nút v là edge_ids[rindptr[v]:rindptr[v + 1]], xuất phát từ sources tương ứng.
+        edge_ids là chỉ số cạnh gốc nên dùng chung mảng trọng số và phương tiện.
+        """
+        cached = self._cache.get("reverse_adjacency")
+        if cached is None:
+            n = self.num_nodes
+            sources = np.repeat(np.arange(n, dtype=np.int64), np.diff(self.indptr))
+            order = np.argsort(self.targets, kind="stable")
+            rindptr = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.targets, minlength=n), out=rindptr[1:])
+            cached = (rindptr.tolist(), sources[order].tolist(), order.tolist())
+            self._cache["reverse_adjacency"] = cached
+        return cached
+
+    def edge_tail(self, e: int) -> int:
+        """Nút đầu (nút xuất phát) của cạnh e"""
+        return bisect_right(self.adjacency()[0], e) - 1
+
+    def _cached_weights(self, key):
+        """Mục của cache trọng số, đánh dấu là vừa dùng; None nếu chưa có"""
+        cached = self._weight_cache.get(key)
+        if cached is not None:
+            self._weight_cache.move_to_end(key)
+        return cached
+
+    def _remember_weights(self, key, value) -> None:
+        """Lưu trọng số vào cache, bỏ mục ít dùng gần đây nhất khi vượt WEIGHT_CACHE_SIZE"""
+        self._weight_cache[key] = value
+        while len(self._weight_cache) > WEIGHT_CACHE_SIZE:
+            self._weight_cache.popitem(last=False)
+
+    def edge_weight_array(self, cost_priority: float) -> np.ndarray:
+        """Trọng số cost_priority * cost + (1 - cost_priority) * time của mọi cạnh"""
+        cost_priority = max(0.0, min(1.0, cost_priority))
+        key = ("weights", cost_priority)
+        cached = self._cached_weights(key)
+        if cached is None:
+            cached = (
+                cost_priority * (self.costs / SEARCH_COST_DIVISOR)
+                + (1 - cost_priority) * self.times
+            )
+            cached.flags.writeable = False
+            self._remember_weights(key, cached)
+        return cached
+
+    def edge_weights(self, cost_priority: float) -> List[float]:
+        """Giống edge_weight_array nhưng trả về list Python cho vòng lặp tìm kiếm"""
+        cost_priority = max(0.0, min(1.0, cost_priority))
+        key = ("weight_list", cost_priority)
+        cached = self._cached_weights(key)
+        if cached is None:
+            cached = self.edge_weight_array(cost_priority).tolist()
+            self._remember_weights(key, cached)
+        return cached
+
+    def integer_edge_weights(self, cost_priority: float, scale: int = DEFAULT_WEIGHT_SCALE) -> List[int]:
+        """
+        Trọng số cạnh lượng tử hóa thành số nguyên cố định round(weight * scale),
+        dùng cho các hàng đợi chỉ nhận khóa nguyên (BucketQueue, RadixHeap).
+        """
+        cost_priority = max(0.0, min(1.0, cost_priority))
+        key = ("integer_weights", cost_priority, scale)
+        cached = self._cached_weights(key)
+        if cached is None:
+            cached = np.rint(self.edge_weight_array(cost_priority) * scale).astype(np.int64).tolist()
+            self._remember_weights(key, cached)
+        return cached
+
+    def find_edge(self, u: int, v: int, mode: Optional[int] = None) -> int:
+        """
+        Tìm cạnh u -> v, ưu tiên cạnh có phương tiện mode nếu được chỉ định.
+
+        Returns:
+            Chỉ số cạnh, hoặc -1 nếu không có cạnh nào
+        """
+        found = -1
+        for e in self.edges_of(u):
+            if self.targets[e] == v:
+                if mode is None or self.modes[e] == mode:
+                    return e
+                if found < 0:
+                    found = e
+        return found
+
+    def segment(self, frm: str, to: str, transport_type: str = "road") -> Dict:
+        """
+        Thông tin chi tiết một đoạn đường theo định dạng transport_details.
+
+        Args:
+            frm: Tỉnh/thành bắt đầu đoạn
+            to: Tỉnh/thành kết thúc đoạn
+            transport_type: "road" hoặc "fly"
+
+        Returns:
+            Dictionary chứa from, to, type, distance, time, cost
+        """
+        mode = FLY if transport_type == "fly" else ROAD
+        e = self.find_edge(self.index[frm], self.index[to], mode)
+        if e < 0:
+            raise KeyError(f"Không có đoạn đường {frm} -> {to}")
+        return {
+            "from": frm,
+            "to": to,
+            "type": MODE_NAMES[int(self.modes[e])],
+            "distance": float(self.distances[e]),
+            "time": float(self.times[e]),
+            "cost": float(self.costs[e]) / DISPLAY_COST_DIVISOR,
+        }
+
+    def route_details(self, transport_info: List[Tuple[str, str, str]]) -> List[Dict]:
+        """Danh sách transport_details cho các đoạn (from, to, type) của một đường đi"""
+        return [self.segment(frm, to, ttype) for frm, to, ttype in transport_info]
+
+    def best_edge(self, u: int, v: int, weights: Sequence[float]) -> int:
+        """Cạnh u -> v có trọng số nhỏ nhất, -1 nếu u và v không kề nhau"""
+        best = -1
+        for e in self.edges_of(u):
+            if self.targets[e] == v and (best < 0 or weights[e] < weights[best]):
+                best = e
+        return best
+
+    def path_transport_info(self, path: List[str], cost_priority: float) -> List[Tuple[str, str, str]]:
+        """Các đoạn (from, to, type) của đường đi, mỗi đoạn chọn cạnh rẻ nhất"""
+        weights = self.edge_weights(cost_priority)
+        transport_info = []
+        for frm, to in zip(path, path[1:]):
+            e = self.best_edge(self.index[frm], self.index[to], weights)
+            transport_info.append((frm, to, MODE_NAMES[int(self.modes[e])] if e >= 0 else "road"))
+        return transport_info
+
+    def path_value(self, path: List[str], cost_priority: float) -> float:
+        """Tổng trọng số của đường đi, mỗi đoạn chọn cạnh có trọng số nhỏ nhất"""
+        weights = self.edge_weights(cost_priority)
+        total_value = 0.0
+        for frm, to in zip(path, path[1:]):
+            e = self.best_edge(self.index[frm], self.index[to], weights)
+            if e < 0:
+                return float("inf")
+            total_value += weights[e]
+        return total_value
+
+    def edge_route(self, start: int, edge_ids: Sequence[int]) -> Tuple[List[str], List[Tuple[str, str, str]]]:
+        """
+        Đường đi và thông tin vận chuyển từ dãy chỉ số cạnh nối tiếp nhau bắt đầu từ start.
+
+        Returns:
+            Tuple (danh sách tên tỉnh/thành, danh sách (from, to, "road"/"fly"))
+        """
+        path = [self.names[start]]
+        transport_info = []
+        for e in edge_ids:
+            to = self.names[int(self.targets[e])]
+            transport_info.append((path[-1], to, MODE_NAMES[int(self.modes[e])]))
+            path.append(to)
+        return path, transport_info
@@ -0,0 +1,163 @@
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Tên các mảng của một hierarchy, lưu trong graph.tables với tiền tố "ch/<cost_priority>/"
+CH_ARRAYS = ("rank", "tails", "heads", "weights", "first", "second", "up_indptr", "up_edges", "down_indptr", "down_edges")
+
+
+def hierarchy_prefix(cost_priority: float) -> str:
+    """Tiền tố tên bảng của hierarchy ứng với cost_priority trong graph.tables"""
+    return f"ch/{cost_priority:.6g}/"
+
+
+class ContractionHierarchy:
+    """
+    Contraction Hierarchy của đồ thị cho một mức cost_priority.
+
+    Mỗi cạnh CH i đi từ tails[i] đến heads[i] với trọng số weights[i]. Cạnh gốc có
+    first[i] = -1 và second[i] là chỉ số cạnh trong CompiledGraph; cạnh tắt
+    (shortcut) tails[i] -> x -> heads[i] có first[i], second[i] là hai cạnh CH con.
+
+    up_edges[up_indptr[u]:up_indptr[u + 1]]: các cạnh u -> v với rank[v] > rank[u]
+    (lượt tìm xuôi). down_edges[down_indptr[v]:down_indptr[v + 1]]: các cạnh u -> v
+    với rank[u] > rank[v], duyệt ngược từ v (lượt tìm ngược).
+    """
+
+    __slots__ = ("cost_priority", "arrays")
+
+    def __init__(self, cost_priority: float, arrays: Dict[str, np.ndarray]):
+        missing = [name for name in CH_ARRAYS if name not in arrays]
+        if missing:
+            raise ValueError(f"Thiếu mảng {missing} của Contraction Hierarchy")
+        self.cost_priority = cost_priority
+        # Truy vấn đọc trực tiếp trên các mảng (có thể là mmap của snapshot, dùng chung
+        # giữa các tiến trình), mỗi nút đã chốt chỉ đọc dãy cạnh của chính nó
+        self.arrays = {name: arrays[name] for name in CH_ARRAYS}
+
+    def __repr__(self):
+        return f"ContractionHierarchy(cost_priority={self.cost_priority}, nodes={len(self.arrays['rank'])}, edges={self.num_edges}, shortcuts={self.num_shortcuts})"
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.arrays["tails"])
+
+    @property
+    def num_shortcuts(self) -> int:
+        return int(np.count_nonzero(self.arrays["first"] >= 0))
+
+    def to_tables(self) -> Dict[str, np.ndarray]:
+        """Các mảng với tên đầy đủ để lưu trong graph.tables / file snapshot"""
+        prefix = hierarchy_prefix(self.cost_priority)
+        return {prefix + name: array for name, array in self.arrays.items()}
+
+    @classmethod
+    def from_tables(cls, tables: Dict[str, np.ndarray], cost_priority: float) -> Optional['ContractionHierarchy']:
+        """Nạp hierarchy từ graph.tables (ví dụ các mảng mmap của snapshot), None nếu chưa có"""
+        prefix = hierarchy_prefix(cost_priority)
+        if prefix + "rank" not in tables:
+            return None
+        return cls(cost_priority, {name: tables[prefix + name] for name in CH_ARRAYS})
+
+    def _arcs(self, side: str, u: int) -> Tuple[List[int], List[int], List[float]]:
+        """Các cạnh CH của u ở phía side ("up" hoặc "down"): (chỉ số cạnh, đầu kia, trọng số)"""
+        a = self.arrays
+        indptr = a[side + "_indptr"]
+        edges = a[side + "_edges"][int(indptr[u]):int(indptr[u + 1])]
+        ends = a["heads"] if side == "up" else a["tails"]
+        return edges.tolist(), ends[edges].tolist(), a["weights"][edges].tolist()
+
+    def query(self, start: int, goal: int, stats: Optional[Dict] = None) -> Tuple[float, Optional[List[int]]]:
+        """
+        Truy vấn hai chiều chỉ đi lên theo rank: lượt xuôi từ start trên up_edges,
+        lượt ngược từ goal trên down_edges. Mỗi lượt dừng khi khóa nhỏ nhất không
+        nhỏ hơn đường tốt nhất mu qua một nút gặp nhau. Nút bị chặn (stall) khi
+        một hàng xóm có rank cao hơn cho khoảng cách ngắn hơn.
+
+        Returns:
+            Tuple (mu, danh sách chỉ số cạnh CH từ start đến goal), (inf, None) nếu không có đường
+        """
+        heads, tails = self.arrays["heads"], self.arrays["tails"]
+
+        dist = ({start: 0.0}, {goal: 0.0})
+        parent = ({start: -1}, {goal: -1})
+        heaps = ([(0.0, start)], [(0.0, goal)])
+        done = [False, False]
+        mu = float('inf')
+        meeting = -1
+        settled = 0
+
+        while not (done[0] and done[1]):
+            for side in (0, 1):
+                if done[side]:
+                    continue
+                heap = heaps[side]
+                if not heap or heap[0][0] >= mu:
+                    done[side] = True
+                    continue
+                d, u = heapq.heappop(heap)
+                this = dist[side]
+                if d > this[u]:
+                    continue
+                settled += 1
+
+                other = dist[1 - side].get(u)
+                if other is not None and d + other < mu:
+                    mu = d + other
+                    meeting = u
+
+                forward, backward = ("up", "down") if side == 0 else ("down", "up")
+
+                # Stall-on-demand: nếu một nút cao hơn đã cho đường đến u ngắn hơn d
+                # thì d không phải khoảng cách đúng, không cần mở rộng u
+                stalled = False
+                for _, x_node, w in zip(*self._arcs(backward, u)):
+                    x = this.get(x_node)
+                    if x is not None and x + w < d:
+                        stalled = True
+                        break
+                if stalled:
+                    continue
+
+                for e, v, w in zip(*self._arcs(forward, u)):
+                    nd = d + w
+                    if nd < this.get(v, float('inf')):
+                        this[v] = nd
+                        parent[side][v] = e
+                        heapq.heappush(heap, (nd, v))
+
+        if stats is not None:
+            stats.update(settled=settled)
+
+        if meeting < 0:
+            return float('inf'), None
+
+        # Nửa đường xuôi start -> meeting và nửa đường ngược meeting -> goal
+        edge_ids = []
+        u = meeting
+        while parent[0][u] >= 0:
+            e = parent[0][u]
+            edge_ids.append(e)
+            u = int(tails[e])
+        edge_ids.reverse()
+        u = meeting
+        while parent[1][u] >= 0:
+            e = parent[1][u]
+            edge_ids.append(e)
+            u = int(heads[e])
+        return mu, edge_ids
+
+    def unpack(self, edge_ids: List[int]) -> List[int]:
+        """Thay các cạnh tắt bằng dãy cạnh gốc của CompiledGraph theo đúng thứ tự"""
+        first, second = self.arrays["first"], self.arrays["second"]
+        result = []
+        stack = list(reversed(edge_ids))
+        while stack:
+            e = stack.pop()
+            if first[e] < 0:
+                result.append(int(second[e]))
+            else:
+                stack.append(int(second[e]))
+                stack.append(int(first[e]))
+        return result
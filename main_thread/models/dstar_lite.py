@@ -0,0 +1,163 @@
+import heapq
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class DStarLite:
+    """
+    Trạng thái tìm kiếm D* Lite giữ lại giữa các lần lập lại kế hoạch.
+
+    Tìm kiếm chạy ngược từ đích: g[u] là chi phí đường ngắn nhất u -> goal đã biết,
+    rhs[u] = min(w[e] + g[v]) trên các cạnh e: u -> v. Nút có g != rhs là nút không
+    nhất quán và nằm trong hàng đợi với khóa (min(g, rhs) + h(start, u) + km, min(g, rhs)).
+    Khi trọng số cạnh u -> v đổi chỉ rhs[u] được tính lại; replan() chỉ mở rộng các nút
+    không nhất quán có thể ảnh hưởng đến đường từ vị trí hiện tại. Khi xe di chuyển
+    (move_to), km cộng thêm heuristic giữa vị trí cũ và mới để các khóa cũ vẫn dùng được.
+
+    weights là trọng số ban đầu của các cạnh theo cost_priority (không bị sửa);
+    heuristic_from(s) trả về danh sách h(s, u) cho mọi nút u (cận dưới chi phí s -> u).
+    """
+
+    __slots__ = (
+        "graph", "cost_priority", "base_weights", "weights", "goal", "start", "heuristic_from", "h", "km",
+        "g", "rhs", "queue", "queued", "stats", "_touched",
+    )
+
+    def __init__(self, graph, cost_priority: float, weights: Sequence[float], start: int, goal: int, heuristic_from: Callable[[int], List[float]]):
+        n = graph.num_nodes
+        self.graph = graph
+        self.cost_priority = cost_priority
+        # Trọng số ban đầu và trọng số hiện tại của từng cạnh (inf: cạnh đang đóng)
+        self.base_weights = weights
+        self.weights = list(weights)
+        self.goal = goal
+        self.start = start
+        self.heuristic_from = heuristic_from
+        self.h = heuristic_from(start)
+        self.km = 0.0
+        inf = float('inf')
+        self.g = [inf] * n
+        self.rhs = [inf] * n
+        # Hàng đợi heap lười: queued[u] là khóa hiện tại của u, None nếu u không nằm trong hàng đợi
+        self.queue: List[Tuple[float, float, int]] = []
+        self.queued: List[Optional[Tuple[float, float]]] = [None] * n
+        self.stats: Dict[str, int] = {"touched_nodes": 0, "expanded_nodes": 0, "replans": 0}
+        self._touched = set()
+
+        self.rhs[goal] = 0.0
+        self._push(goal)
+
+    def __repr__(self):
+        return f"DStarLite(start={self.start}, goal={self.goal}, replans={self.stats['replans']})"
+
+    def _key(self, u: int) -> Tuple[float, float]:
+        m = min(self.g[u], self.rhs[u])
+        return (m + self.h[u] + self.km, m)
+
+    def _push(self, u: int) -> None:
+        key = self._key(u)
+        self.queued[u] = key
+        heapq.heappush(self.queue, (key[0], key[1], u))
+
+    def _top(self) -> Optional[Tuple[float, float, int]]:
+        """Phần tử còn hiệu lực có khóa nhỏ nhất, bỏ các phần tử cũ trên đỉnh heap"""
+        queue, queued = self.queue, self.queued
+        while queue:
+            k1, k2, u = queue[0]
+            if queued[u] == (k1, k2):
+                return queue[0]
+            heapq.heappop(queue)
+        return None
+
+    def _update_vertex(self, u: int) -> None:
+        self._touched.add(u)
+        if u != self.goal:
+            indptr, targets, _ = self.graph.adjacency()
+            weights, g = self.weights, self.g
+            best = float('inf')
+            for e in range(indptr[u], indptr[u + 1]):
+                value = weights[e] + g[targets[e]]
+                if value < best:
+                    best = value
+            self.rhs[u] = best
+        self.queued[u] = None
+        if self.g[u] != self.rhs[u]:
+            self._push(u)
+
+    def update_edges(self, changes: Iterable[Tuple[int, float]]) -> None:
+        """Ghi nhận trọng số mới (cạnh, trọng số) của các cạnh; đường đi được tính lại ở replan()"""
+        tails = set()
+        for e, weight in changes:
+            self.weights[e] = weight
+            tails.add(self.graph.edge_tail(e))
+        for u in tails:
+            self._update_vertex(u)
+
+    def move_to(self, start: int) -> None:
+        """Xe đã đến nút start (thường là nút kế tiếp trên đường đã lập)"""
+        if start == self.start:
+            return
+        # h(start cũ, start mới) <= chi phí giữa hai nút nên khóa cũ vẫn là cận dưới
+        self.km += self.h[start]
+        self.start = start
+        self.h = self.heuristic_from(start)
+
+    def replan(self) -> Tuple[List[int], float]:
+        """
+        Mở rộng các nút không nhất quán cần thiết rồi dựng đường đi từ vị trí hiện tại.
+
+        Returns:
+            Tuple (các chỉ số cạnh của đường đi start -> goal, tổng trọng số);
+            ([], inf) nếu không còn đường đi. stats ghi số nút khác nhau đã chạm
+            (touched_nodes: được tính lại rhs hoặc lấy ra khỏi hàng đợi, kể cả khi đổi
+            trọng số) và số lần lấy nút ra khỏi hàng đợi (expanded_nodes) của lần này.
+        """
+        rindptr, sources, _ = self.graph.reverse_adjacency()
+        g, rhs, start = self.g, self.rhs, self.start
+        expanded = 0
+        while True:
+            top = self._top()
+            if top is None:
+                break
+            start_key = self._key(start)
+            if (top[0], top[1]) >= start_key and rhs[start] == g[start]:
+                break
+            k1, k2, u = heapq.heappop(self.queue)
+            self.queued[u] = None
+            self._touched.add(u)
+            expanded += 1
+            key = self._key(u)
+            if (k1, k2) < key:
+                self._push(u)
+            elif g[u] > rhs[u]:
+                g[u] = rhs[u]
+                for i in range(rindptr[u], rindptr[u + 1]):
+                    self._update_vertex(sources[i])
+            else:
+                g[u] = float('inf')
+                self._update_vertex(u)
+                for i in range(rindptr[u], rindptr[u + 1]):
+                    self._update_vertex(sources[i])
+
+        self.stats.update(touched_nodes=len(self._touched), expanded_nodes=expanded, replans=self.stats["replans"] + 1)
+        self._touched = set()
+        return self.path_edges(), g[start]
+
+    def path_edges(self) -> List[int]:
+        """Các cạnh của đường đi tốt nhất từ start theo g hiện tại (mỗi bước chọn w[e] + g[v] nhỏ nhất)"""
+        indptr, targets, _ = self.graph.adjacency()
+        weights, g = self.weights, self.g
+        edges = []
+        u = self.start
+        if g[u] == float('inf'):
+            return []
+        while u != self.goal:
+            best, best_value = -1, float('inf')
+            for e in range(indptr[u], indptr[u + 1]):
+                value = weights[e] + g[targets[e]]
+                if value < best_value:
+                    best, best_value = e, value
+            if best < 0 or len(edges) >= self.graph.num_nodes:
+                return []
+            edges.append(best)
+            u = targets[best]
+        return edges
@@ -0,0 +1,173 @@
+import heapq
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+# Hai khoảng cách được coi là bằng nhau nếu lệch không quá sai số cộng dồn float64
+# của một đường đi; dùng khi tìm các cặp có thể đi qua cung vừa tăng trọng số
+TIGHT_RTOL = 1e-9
+
+
+class DynamicAllPairs:
+    """
+    Ma trận khoảng cách và nút kế tiếp mọi cặp (như floyd_warshall_matrices) được cập
+    nhật tăng dần khi trọng số cạnh thay đổi, đóng cạnh hoặc thêm cung mới.
+
+    Trọng số cung arcs[u, v] là trọng số nhỏ nhất của các cạnh u -> v đang mở (cạnh
+    gốc với trọng số đã sửa và các cung thêm mới), inf nếu không có. Khi một cung:
+    - giảm trọng số: mọi cặp (i, j) thử đường i -> u -> v -> j, O(n²) phép NumPy
+    - tăng trọng số hoặc bị đóng: chỉ các cặp có đường ngắn nhất có thể đi qua cung
+      (dist[i, u] + w_cũ + dist[v, j] = dist[i, j]) bị ảnh hưởng; tính lại bằng Dijkstra
+      các hàng nguồn hoặc các cột đích bị ảnh hưởng, chọn phía ít hơn.
+
+    Khoảng cách bằng kết quả tính lại toàn bộ trên cùng trọng số (có thể lệch ở chữ số
+    cuối vì thứ tự cộng khác); giữa các đường bằng nhau có thể chọn nút kế tiếp khác.
+    """
+
+    __slots__ = ("num_nodes", "indptr", "tails", "heads", "weights", "added", "arcs", "dist", "nxt")
+
+    def __init__(self, graph, weights: np.ndarray, dist: np.ndarray, nxt: np.ndarray):
+        n = graph.num_nodes
+        self.num_nodes = n
+        self.indptr = np.asarray(graph.indptr, dtype=np.int64)
+        self.tails = np.repeat(np.arange(n), np.diff(graph.indptr))
+        self.heads = np.asarray(graph.targets, dtype=np.int64)
+        # Trọng số hiện tại của từng cạnh gốc (inf: cạnh đang đóng)
+        self.weights = np.array(weights, dtype=np.float64)
+        # Các cung thêm mới không có trong đồ thị: (u, v) -> trọng số
+        self.added: Dict[Tuple[int, int], float] = {}
+        self.arcs = np.full((n, n), np.inf)
+        np.minimum.at(self.arcs, (self.tails, self.heads), self.weights)
+        self.dist = np.array(dist, dtype=np.float64)
+        self.nxt = np.array(nxt)
+
+    def __repr__(self):
+        return f"DynamicAllPairs(nodes={self.num_nodes}, added={len(self.added)})"
+
+    def set_edge_weight(self, e: int, weight: float) -> int:
+        """
+        Đặt trọng số cạnh gốc e (inf để đóng cạnh).
+
+        Returns:
+            Số hàng hoặc cột phải tính lại bằng Dijkstra (0 nếu chỉ cần cập nhật O(n²))
+        """
+        self.weights[e] = weight
+        return self._update_arc(int(self.tails[e]), int(self.heads[e]))
+
+    def close_edge(self, e: int) -> int:
+        """Đóng cạnh gốc e (đường bị ngập, sạt lở...)"""
+        return self.set_edge_weight(e, np.inf)
+
+    def set_arc(self, u: int, v: int, weight: float) -> int:
+        """Thêm hoặc sửa cung u -> v không có trong đồ thị gốc (ví dụ đường bay mới); inf để bỏ"""
+        if np.isfinite(weight):
+            self.added[(u, v)] = float(weight)
+        else:
+            self.added.pop((u, v), None)
+        return self._update_arc(u, v)
+
+    def apply(self, changes: Iterable[Tuple[int, float]]) -> int:
+        """Áp dụng lần lượt các thay đổi (cạnh, trọng số mới), trả về tổng số hàng/cột đã tính lại"""
+        return sum(self.set_edge_weight(e, weight) for e, weight in changes)
+
+    def path(self, start: int, goal: int) -> List[int]:
+        """Các id nút của đường đi ngắn nhất start -> goal, [] nếu không có đường"""
+        if start != goal and self.nxt[start, goal] < 0:
+            return []
+        path = [start]
+        u = start
+        while u != goal:
+            u = int(self.nxt[u, goal])
+            path.append(u)
+        return path
+
+    def _arc_weight(self, u: int, v: int) -> float:
+        edges = slice(self.indptr[u], self.indptr[u + 1])
+        mask = self.heads[edges] == v
+        weight = float(self.weights[edges][mask].min()) if mask.any() else np.inf
+        return min(weight, self.added.get((u, v), np.inf))
+
+    def _update_arc(self, u: int, v: int) -> int:
+        old = self.arcs[u, v]
+        new = self._arc_weight(u, v)
+        self.arcs[u, v] = new
+        if new < old:
+            self._decrease(u, v, new)
+            return 0
+        if new > old:
+            return self._increase(u, v, old)
+        return 0
+
+    def _decrease(self, u: int, v: int, weight: float) -> None:
+        """Cung u -> v giảm còn weight: dist[i, j] = min(dist[i, j], dist[i, u] + weight + dist[v, j])"""
+        candidate = (self.dist[:, u] + weight)[:, None] + self.dist[v, :][None, :]
+        improved = candidate < self.dist
+        if not improved.any():
+            return
+        np.copyto(self.dist, candidate, where=improved)
+        # Nút kế tiếp trên đường mới là nút kế tiếp trên đường i -> u (v nếu i = u)
+        hop = self.nxt[:, u].copy()
+        hop[u] = v
+        np.copyto(self.nxt, hop[:, None], where=improved)
+
+    def _increase(self, u: int, v: int, old: float) -> int:
+        """Cung u -> v tăng trọng số từ old: tính lại các hàng nguồn hoặc cột đích bị ảnh hưởng"""
+        via = (self.dist[:, u] + old)[:, None] + self.dist[v, :][None, :]
+        affected = np.isfinite(via) & (via <= self.dist * (1 + TIGHT_RTOL))
+        sources = np.flatnonzero(affected.any(axis=1))
+        goals = np.flatnonzero(affected.any(axis=0))
+        if len(sources) == 0:
+            return 0
+        if len(sources) <= len(goals):
+            indptr, targets, weights = self._csr(self.arcs)
+            for i in sources:
+                self.dist[i], self.nxt[i] = _dense_dijkstra(indptr, targets, weights, self.num_nodes, int(i), True)
+            return len(sources)
+        indptr, targets, weights = self._csr(self.arcs.T)
+        for j in goals:
+            self.dist[:, j], self.nxt[:, j] = _dense_dijkstra(indptr, targets, weights, self.num_nodes, int(j), False)
+        return len(goals)
+
+    @staticmethod
+    def _csr(arcs: np.ndarray) -> Tuple[List[int], List[int], List[float]]:
+        """Danh sách kề CSR của các cung hữu hạn trong ma trận arcs"""
+        rows, cols = np.nonzero(np.isfinite(arcs))
+        indptr = np.zeros(len(arcs) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(arcs)), out=indptr[1:])
+        return indptr.tolist(), cols.tolist(), arcs[rows, cols].tolist()
+
+
+def _dense_dijkstra(indptr: List[int], targets: List[int], weights: List[float], n: int, root: int, forward: bool) -> Tuple[List[float], List[int]]:
+    """
+    Dijkstra từ root trên danh sách kề CSR.
+
+    Returns:
+        Tuple (khoảng cách, nút kế tiếp): với forward=True là hàng root của ma trận
+        (nút đầu tiên sau root trên đường root -> x); với forward=False đồ thị là đồ thị
+        ngược và kết quả là cột root (nút kế tiếp sau x trên đường x -> root)
+    """
+    inf = float('inf')
+    dist = [inf] * n
+    hop = [-1] * n
+    done = [False] * n
+    dist[root] = 0.0
+    hop[root] = root
+    heap = [(0.0, root)]
+    while heap:
+        d, x = heapq.heappop(heap)
+        if done[x]:
+            continue
+        done[x] = True
+        for k in range(indptr[x], indptr[x + 1]):
+            y = targets[k]
+            if done[y]:
+                continue
+            nd = d + weights[k]
+            if nd < dist[y]:
+                dist[y] = nd
+                if forward:
+                    hop[y] = y if x == root else hop[x]
+                else:
+                    hop[y] = x
+                heapq.heappush(heap, (nd, y))
+    return dist, hop
@@ -0,0 +1,114 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Tên các mảng nhãn, lưu trong graph.tables với tiền tố "hl/<cost_priority>/"
+HL_ARRAYS = (
+    "order",
+    "out_indptr", "out_hubs", "out_dist", "out_edge",
+    "in_indptr", "in_hubs", "in_dist", "in_edge",
+)
+
+
+def labels_prefix(cost_priority: float) -> str:
+    """Tiền tố tên bảng nhãn hub ứng với cost_priority trong graph.tables"""
+    return f"hl/{cost_priority:.6g}/"
+
+
+class HubLabels:
+    """
+    Nhãn hub 2 bước (2-hop labels) của đồ thị cho một mức cost_priority.
+
+    Hub được đánh số theo thứ hạng r (order[r] là id nút của hub). Nhãn ra của nút v
+    là out_hubs[out_indptr[v]:out_indptr[v + 1]] (tăng dần) với khoảng cách
+    out_dist = d(v, hub) và out_edge là cạnh đầu tiên trên đường v -> hub. Nhãn vào
+    tương tự với in_dist = d(hub, v) và in_edge là cạnh cuối cùng trên đường hub -> v.
+    Nút kế tiếp trên đường cũng có nhãn với cùng hub, nên có thể dựng lại đường đi
+    bằng cách đi theo các cạnh này.
+    """
+
+    __slots__ = ("cost_priority", "arrays")
+
+    def __init__(self, cost_priority: float, arrays: Dict[str, np.ndarray]):
+        missing = [name for name in HL_ARRAYS if name not in arrays]
+        if missing:
+            raise ValueError(f"Thiếu mảng {missing} của nhãn hub")
+        self.cost_priority = cost_priority
+        # Truy vấn đọc trực tiếp trên các mảng (có thể là mmap của snapshot, dùng chung
+        # giữa các tiến trình), mỗi truy vấn chỉ chạm tới hai dãy nhãn của nó
+        self.arrays = {name: arrays[name] for name in HL_ARRAYS}
+
+    def __repr__(self):
+        return f"HubLabels(cost_priority={self.cost_priority}, nodes={len(self.arrays['order'])}, average_label={self.average_label_size:.1f})"
+
+    @property
+    def average_label_size(self) -> float:
+        n = max(len(self.arrays["order"]), 1)
+        return (len(self.arrays["out_hubs"]) + len(self.arrays["in_hubs"])) / (2 * n)
+
+    def to_tables(self) -> Dict[str, np.ndarray]:
+        """Các mảng với tên đầy đủ để lưu trong graph.tables / file snapshot"""
+        prefix = labels_prefix(self.cost_priority)
+        return {prefix + name: array for name, array in self.arrays.items()}
+
+    @classmethod
+    def from_tables(cls, tables: Dict[str, np.ndarray], cost_priority: float) -> Optional['HubLabels']:
+        """Nạp nhãn từ graph.tables (ví dụ các mảng mmap của snapshot), None nếu chưa có"""
+        prefix = labels_prefix(cost_priority)
+        if prefix + "order" not in tables:
+            return None
+        return cls(cost_priority, {name: tables[prefix + name] for name in HL_ARRAYS})
+
+    def _label(self, side: str, v: int) -> Tuple[int, np.ndarray]:
+        """Vị trí bắt đầu và dãy hub (tăng dần) của nhãn phía side ("out" hoặc "in") của v"""
+        indptr = self.arrays[side + "_indptr"]
+        lo, hi = int(indptr[v]), int(indptr[v + 1])
+        return lo, self.arrays[side + "_hubs"][lo:hi]
+
+    def query(self, start: int, goal: int) -> Tuple[float, int]:
+        """
+        Khoảng cách start -> goal bằng cách giao hai dãy hub đã sắp xếp:
+        min trên các hub chung h của d(start, h) + d(h, goal).
+
+        Returns:
+            Tuple (khoảng cách, thứ hạng hub tốt nhất), (inf, -1) nếu không có đường
+        """
+        i, out_hubs = self._label("out", start)
+        j, in_hubs = self._label("in", goal)
+        hubs, out_pos, in_pos = np.intersect1d(out_hubs, in_hubs, assume_unique=True, return_indices=True)
+        if len(hubs) == 0:
+            return float('inf'), -1
+
+        d = self.arrays["out_dist"][i + out_pos] + self.arrays["in_dist"][j + in_pos]
+        k = int(np.argmin(d))
+        return float(d[k]), int(hubs[k])
+
+    def _entry(self, side: str, v: int, hub: int) -> int:
+        """Vị trí nhãn (v, hub) trong các mảng của phía side ("out" hoặc "in")"""
+        lo, hubs = self._label(side, v)
+        i = int(np.searchsorted(hubs, hub))
+        if i == len(hubs) or hubs[i] != hub:
+            raise KeyError((v, hub))
+        return lo + i
+
+    def path_edges(self, graph, start: int, goal: int, hub: int) -> List[int]:
+        """Dãy chỉ số cạnh của đường start -> order[hub] -> goal dựng lại từ các nhãn"""
+        a = self.arrays
+        hub_node = int(a["order"][hub])
+        targets = graph.adjacency()[1]
+
+        edge_ids = []
+        v = start
+        while v != hub_node:
+            e = int(a["out_edge"][self._entry("out", v, hub)])
+            edge_ids.append(e)
+            v = targets[e]
+
+        tail = []
+        v = goal
+        while v != hub_node:
+            e = int(a["in_edge"][self._entry("in", v, hub)])
+            tail.append(e)
+            v = graph.edge_tail(e)
+        tail.reverse()
+        return edge_ids + tail
@@ -0,0 +1,287 @@
+import heapq
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class MultilevelOverlay:
+    """
+    Overlay nhiều tầng (Customizable Route Planning) trên một phân vùng lồng nhau,
+    không phụ thuộc trọng số cạnh.
+
+    levels[l] là id ô của mỗi nút ở tầng l + 1 (tầng 1 mịn nhất, mỗi ô nằm trọn trong
+    một ô của tầng trên). Cạnh cắt của tầng l nối hai ô khác nhau; nút vào (entry) của
+    một ô có cạnh cắt đi vào, nút ra (exit) có cạnh cắt đi ra. Mỗi ô có một clique
+    entry × exit, lưu liên tiếp trong một mảng trọng số của tầng tại vị trí offsets[l][c].
+    Trọng số clique do bước customization tính cho từng bộ trọng số cạnh
+    (xem algorithms/customizable_route_planning.py).
+
+    Đồ thị cục bộ của ô c ở tầng l dùng cho customization:
+    - tầng 1: mọi nút của ô, các cạnh gốc nằm trong ô
+    - tầng l > 1: các nút biên của những ô con (tầng l - 1), các cạnh cắt giữa ô con
+      nằm trong ô và clique của ô con
+    """
+
+    __slots__ = ("levels", "entries", "exits", "offsets", "local", "_lists")
+
+    def __init__(self, graph, levels: Sequence[np.ndarray]):
+        if not levels:
+            raise ValueError("Overlay cần ít nhất một tầng phân vùng")
+        tails = np.repeat(np.arange(graph.num_nodes), np.diff(graph.indptr))
+        heads = np.asarray(graph.targets)
+
+        self.levels = [np.asarray(cells, dtype=np.int32) for cells in levels]
+        self.entries: List[List[np.ndarray]] = []
+        self.exits: List[List[np.ndarray]] = []
+        self.offsets: List[np.ndarray] = []
+        # Mỗi ô: (nút cục bộ, cung gốc (src, dst, cạnh), cung clique ô con (src, dst, vị trí),
+        # vị trí cục bộ của entry, vị trí cục bộ của exit)
+        self.local: List[List[Tuple]] = []
+
+        for l, cells in enumerate(self.levels):
+            if l:
+                parent = np.full(int(self.levels[l - 1].max()) + 1, -1, dtype=np.int64)
+                parent[self.levels[l - 1]] = cells
+                if (parent[self.levels[l - 1]] != cells).any():
+                    raise ValueError(f"Ô của tầng {l} không nằm trọn trong một ô của tầng {l + 1}")
+
+            num_cells = int(cells.max()) + 1
+            cut = cells[tails] != cells[heads]
+            is_entry = np.zeros(graph.num_nodes, dtype=bool)
+            is_exit = np.zeros(graph.num_nodes, dtype=bool)
+            is_entry[heads[cut]] = True
+            is_exit[tails[cut]] = True
+
+            entries = [np.flatnonzero(is_entry & (cells == c)) for c in range(num_cells)]
+            exits = [np.flatnonzero(is_exit & (cells == c)) for c in range(num_cells)]
+            sizes = [len(a) * len(b) for a, b in zip(entries, exits)]
+            offsets = np.zeros(num_cells + 1, dtype=np.int64)
+            np.cumsum(sizes, out=offsets[1:])
+
+            local = []
+            for c in range(num_cells):
+                if l == 0:
+                    nodes = np.flatnonzero(cells == c)
+                    inner = np.flatnonzero((cells[tails] == c) & (cells[heads] == c))
+                    clique_arcs = (np.empty(0, np.int64),) * 3
+                else:
+                    below = self.levels[l - 1]
+                    sub_cells = np.unique(below[cells == c])
+                    nodes = np.unique(np.concatenate(
+                        [self.entries[l - 1][s] for s in sub_cells] + [self.exits[l - 1][s] for s in sub_cells]
+                    ))
+                    inner = np.flatnonzero((cells[tails] == c) & (cells[heads] == c) & (below[tails] != below[heads]))
+                    src, dst, pos = [], [], []
+                    for s in sub_cells:
+                        sub_entries, sub_exits = self.entries[l - 1][s], self.exits[l - 1][s]
+                        src.append(np.repeat(sub_entries, len(sub_exits)))
+                        dst.append(np.tile(sub_exits, len(sub_entries)))
+                        pos.append(np.arange(self.offsets[l - 1][s], self.offsets[l - 1][s + 1]))
+                    clique_arcs = (
+                        np.searchsorted(nodes, np.concatenate(src)) if src else np.empty(0, np.int64),
+                        np.searchsorted(nodes, np.concatenate(dst)) if dst else np.empty(0, np.int64),
+                        np.concatenate(pos) if pos else np.empty(0, np.int64),
+                    )
+                edge_arcs = (np.searchsorted(nodes, tails[inner]), np.searchsorted(nodes, heads[inner]), inner)
+                local.append((
+                    nodes, edge_arcs, clique_arcs,
+                    np.searchsorted(nodes, entries[c]), np.searchsorted(nodes, exits[c]),
+                ))
+
+            self.entries.append(entries)
+            self.exits.append(exits)
+            self.offsets.append(offsets)
+            self.local.append(local)
+
+        # Bản sao dạng list Python cho vòng lặp truy vấn, tạo khi truy vấn lần đầu
+        self._lists = None
+
+    def __repr__(self):
+        cells = "/".join(str(len(e)) for e in self.entries)
+        return f"MultilevelOverlay(levels={self.num_levels}, cells={cells}, clique_arcs={self.num_clique_arcs})"
+
+    @property
+    def num_levels(self) -> int:
+        return len(self.levels)
+
+    @property
+    def cell_lists(self) -> List[List[int]]:
+        """levels dạng list Python"""
+        return self._as_lists()[0]
+
+    @property
+    def num_clique_arcs(self) -> int:
+        return int(sum(offsets[-1] for offsets in self.offsets))
+
+    def _as_lists(self):
+        if self._lists is None:
+            n = len(self.levels[0])
+            entry_pos, exit_pos = [], []
+            for boundary, positions in ((self.entries, entry_pos), (self.exits, exit_pos)):
+                for cells in boundary:
+                    pos = [-1] * n
+                    for nodes in cells:
+                        for i, v in enumerate(nodes.tolist()):
+                            pos[v] = i
+                    positions.append(pos)
+            self._lists = (
+                [cells.tolist() for cells in self.levels],
+                entry_pos, exit_pos,
+                [[nodes.tolist() for nodes in entries] for entries in self.entries],
+                [[nodes.tolist() for nodes in exits] for exits in self.exits],
+                [offsets.tolist() for offsets in self.offsets],
+            )
+        return self._lists
+
+    def query(
+        self,
+        graph,
+        weights: Sequence[float],
+        cliques: Sequence[Sequence[float]],
+        start: int,
+        goal: int,
+        stats: Optional[Dict] = None,
+    ) -> Tuple[float, List[Tuple[int, int, int]]]:
+        """
+        Dijkstra hai chiều nhiều tầng giữa start và goal. Nút v được duyệt ở tầng q(v)
+        cao nhất mà ô của v khác ô của start và goal: q(v) = 0 thì đi theo mọi cạnh gốc,
+        q(v) > 0 thì đi theo clique của ô (từ entry đến các exit) và các cạnh cắt tầng
+        q(v). Lượt ngược đi theo đúng các cung đó theo chiều ngược lại; tìm kiếm dừng khi
+        tổng hai khóa nhỏ nhất không nhỏ hơn đường tốt nhất mu qua một nút gặp nhau.
+
+        Args:
+            graph: CompiledGraph
+            weights: Trọng số cạnh gốc
+            cliques: Trọng số clique mỗi tầng tính bằng customization với cùng weights
+            start, goal: Id nút
+            stats: Nếu truyền vào một dictionary, số nút đã chốt (settled_nodes) được ghi vào đó
+
+        Returns:
+            Tuple (khoảng cách, các cung (u, v, arc) từ start đến goal): arc >= 0 là
+            chỉ số cạnh gốc, arc = -l là cung clique u -> v trong ô tầng l chứa u.
+            (inf, []) nếu không có đường đi.
+        """
+        cells, entry_pos, exit_pos, entries, exits, offsets = self._as_lists()
+        indptr, targets, _ = graph.adjacency()
+        rindptr, sources, redges = graph.reverse_adjacency()
+        num_levels = len(cells)
+        inf = float('inf')
+
+        query_levels = {}
+
+        def level(v: int) -> int:
+            q = query_levels.get(v)
+            if q is None:
+                q = 0
+                for l in range(num_levels - 1, -1, -1):
+                    cell = cells[l][v]
+                    if cell != cells[l][start] and cell != cells[l][goal]:
+                        q = l + 1
+                        break
+                query_levels[v] = q
+            return q
+
+        dist_f, dist_b = {start: 0.0}, {goal: 0.0}
+        # parent_f[v] = (u, cung u -> v), parent_b[u] = (v, cung u -> v)
+        parent_f: Dict[int, Tuple[int, int]] = {}
+        parent_b: Dict[int, Tuple[int, int]] = {}
+        done_f, done_b = set(), set()
+        heap_f, heap_b = [(0.0, start)], [(0.0, goal)]
+        mu, meet = inf, -1
+        settled = 0
+
+        while heap_f and heap_b and heap_f[0][0] + heap_b[0][0] < mu:
+            if heap_f[0][0] <= heap_b[0][0]:
+                d, u = heapq.heappop(heap_f)
+                if u in done_f:
+                    continue
+                done_f.add(u)
+                settled += 1
+
+                q = level(u)
+                if q:
+                    cell_level = cells[q - 1]
+                    cell = cell_level[u]
+                    i = entry_pos[q - 1][u]
+                    if i >= 0:
+                        cell_exits = exits[q - 1][cell]
+                        row = offsets[q - 1][cell] + i * len(cell_exits)
+                        clique = cliques[q - 1]
+                        for j, v in enumerate(cell_exits):
+                            nd = d + clique[row + j]
+                            if nd < dist_f.get(v, inf) and v not in done_f:
+                                dist_f[v] = nd
+                                parent_f[v] = (u, -q)
+                                heapq.heappush(heap_f, (nd, v))
+                                if v in dist_b and nd + dist_b[v] < mu:
+                                    mu, meet = nd + dist_b[v], v
+                for e in range(indptr[u], indptr[u + 1]):
+                    v = targets[e]
+                    # Ở tầng q > 0, các cạnh bên trong ô đã được clique thay thế
+                    if q and cell_level[v] == cell:
+                        continue
+                    nd = d + weights[e]
+                    if nd < dist_f.get(v, inf) and v not in done_f:
+                        dist_f[v] = nd
+                        parent_f[v] = (u, e)
+                        heapq.heappush(heap_f, (nd, v))
+                        if v in dist_b and nd + dist_b[v] < mu:
+                            mu, meet = nd + dist_b[v], v
+            else:
+                d, v = heapq.heappop(heap_b)
+                if v in done_b:
+                    continue
+                done_b.add(v)
+                settled += 1
+
+                # Cung clique vào v chỉ có thể đến từ entry cùng ô ở tầng q(v)
+                q = level(v)
+                if q:
+                    cell = cells[q - 1][v]
+                    j = exit_pos[q - 1][v]
+                    if j >= 0:
+                        stride = len(exits[q - 1][cell])
+                        base = offsets[q - 1][cell] + j
+                        clique = cliques[q - 1]
+                        for i, u in enumerate(entries[q - 1][cell]):
+                            nd = d + clique[base + i * stride]
+                            if nd < dist_b.get(u, inf) and u not in done_b:
+                                dist_b[u] = nd
+                                parent_b[u] = (v, -q)
+                                heapq.heappush(heap_b, (nd, u))
+                                if u in dist_f and nd + dist_f[u] < mu:
+                                    mu, meet = nd + dist_f[u], u
+                # Cạnh gốc u -> v thuộc đồ thị tìm kiếm nếu q(u) = 0 hoặc là cạnh cắt tầng q(u)
+                for r in range(rindptr[v], rindptr[v + 1]):
+                    u = sources[r]
+                    qu = level(u)
+                    if qu and cells[qu - 1][u] == cells[qu - 1][v]:
+                        continue
+                    e = redges[r]
+                    nd = d + weights[e]
+                    if nd < dist_b.get(u, inf) and u not in done_b:
+                        dist_b[u] = nd
+                        parent_b[u] = (v, e)
+                        heapq.heappush(heap_b, (nd, u))
+                        if u in dist_f and nd + dist_f[u] < mu:
+                            mu, meet = nd + dist_f[u], u
+
+        if stats is not None:
+            stats["settled_nodes"] = settled
+
+        if meet < 0:
+            return inf, []
+
+        arcs = []
+        v = meet
+        while v != start:
+            u, arc = parent_f[v]
+            arcs.append((u, v, arc))
+            v = u
+        arcs.reverse()
+        u = meet
+        while u != goal:
+            v, arc = parent_b[u]
+            arcs.append((u, v, arc))
+            u = v
+        return mu, arcs
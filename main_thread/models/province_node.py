@@ -1,49 +1,38 @@
-from typing import List, Tuple, Dict, Optional
+from typing import Sequence
 
 class ProvinceNode:
-    def __init__(self, province_id: int, name: str, latitude: float, longitude: float):
-        self.province_id = province_id
-        self.name = name
-        self.latitude = latitude
-        self.longitude = longitude
-        self.neighbors = []
-        self.g_x = float('inf')
-        self.h_x = float('inf')
-        self.f_x = float('inf')
-        self.parent = None
-        self.is_visited = False
-        self.is_in_open_set = False
-        self.is_in_closed_set = False
-
-    def add_neighbor(self, neighbor: str):
-        if neighbor not in self.neighbors:
-            self.neighbors.append(neighbor)
-
-    def __lt__(self, other: 'ProvinceNode'):
-        if self.f_x == other.f_x:
-            # Nếu f_x bằng nhau, ưu tiên nút có h_x nhỏ hơn
-            return self.h_x < other.h_x
-        return self.f_x < other.f_x
-        
+    """
+    Thông tin bất biến của một tỉnh/thành trong đồ thị.
+
+    Trạng thái tìm kiếm (g_x, parent, open/closed...) không lưu ở đây mà trong
+    SearchState của từng truy vấn, nên nhiều truy vấn có thể dùng chung các nút.
+    """
+
+    __slots__ = ("province_id", "name", "latitude", "longitude", "neighbors")
+
+    def __init__(self, province_id: int, name: str, latitude: float, longitude: float, neighbors: Sequence[str] = ()):
+        object.__setattr__(self, "province_id", province_id)
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "latitude", latitude)
+        object.__setattr__(self, "longitude", longitude)
+        object.__setattr__(self, "neighbors", tuple(neighbors))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ProvinceNode là đối tượng chỉ đọc")
+
+    def __reduce__(self):
+        return (ProvinceNode, (self.province_id, self.name, self.latitude, self.longitude, self.neighbors))
+
     def __eq__(self, other: 'ProvinceNode'):
-        if other is None:
+        if not isinstance(other, ProvinceNode):
             return False
         return self.province_id == other.province_id
-    
+
     def __hash__(self):
         return hash(self.province_id)
-    
-    def reset(self):
-        self.g_x = float('inf')
-        self.h_x = float('inf')
-        self.f_x = float('inf')
-        self.parent = None
-        self.is_visited = False
-        self.is_in_open_set = False
-        self.is_in_closed_set = False
-        
+
     def __str__(self):
-        return f"Province: {self.name} (ID: {self.province_id}, f_x: {self.f_x}, g_x: {self.g_x}, h_x: {self.h_x})"
-    
+        return f"Province: {self.name} (ID: {self.province_id})"
+
     def __repr__(self):
-        return self.__str__()
\ No newline at end of file
+        return self.__str__()
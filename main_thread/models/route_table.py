@@ -0,0 +1,73 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Tên các mảng n×n của một bảng tra cứu mọi cặp
+ROUTE_TABLE_ARRAYS = ("dist", "nxt", "distance", "time", "cost")
+
+
+def compact_node_dtype(n: int):
+    """
+    Kiểu nguyên không dấu nhỏ nhất cho ma trận nút kế tiếp của đồ thị n nút;
+    giá trị lớn nhất của kiểu được dành cho "không có đường đi".
+    """
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if n < np.iinfo(dtype).max:
+            return dtype
+    raise ValueError(f"Đồ thị {n} nút quá lớn cho bảng tra cứu mọi cặp")
+
+
+class RouteTable:
+    """
+    Bảng tra cứu đường đi mọi cặp cho một mức cost_priority.
+
+    dist[i, j] (float32) là tổng trọng số đường tối ưu i -> j, nxt[i, j] là nút kế
+    tiếp sau i trên đường đó (np.iinfo(nxt.dtype).max nếu không có đường).
+    distance, time, cost (float32) là tổng quãng đường, thời gian và chi phí hiển thị
+    (như transport_details) của cả đường đi, tra được mà không cần đi theo đường.
+    """
+
+    __slots__ = ("cost_priority", "arrays", "no_path")
+
+    def __init__(self, cost_priority: float, arrays: Dict[str, np.ndarray]):
+        missing = [name for name in ROUTE_TABLE_ARRAYS if name not in arrays]
+        if missing:
+            raise ValueError(f"Thiếu mảng {missing} của bảng tra cứu")
+        self.cost_priority = cost_priority
+        self.arrays = {name: arrays[name] for name in ROUTE_TABLE_ARRAYS}
+        self.no_path = int(np.iinfo(self.arrays["nxt"].dtype).max)
+
+    def __repr__(self):
+        return f"RouteTable(cost_priority={self.cost_priority}, nodes={self.num_nodes}, nbytes={self.nbytes})"
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.arrays["dist"])
+
+    @property
+    def nbytes(self) -> int:
+        return sum(int(array.nbytes) for array in self.arrays.values())
+
+    def path(self, start: int, goal: int) -> List[int]:
+        """Các id nút của đường đi start -> goal theo ma trận nút kế tiếp, [] nếu không có đường"""
+        nxt = self.arrays["nxt"]
+        if start != goal and int(nxt[start, goal]) == self.no_path:
+            return []
+        path = [start]
+        u = start
+        while u != goal:
+            u = int(nxt[u, goal])
+            path.append(u)
+            if len(path) > self.num_nodes:
+                raise ValueError(f"Ma trận nút kế tiếp có chu trình trên đường {start} -> {goal}")
+        return path
+
+    def totals(self, start: int, goal: int) -> Tuple[float, float, float, float]:
+        """Tuple (tổng trọng số, quãng đường, thời gian, chi phí) của đường start -> goal, O(1)"""
+        a = self.arrays
+        return (
+            float(a["dist"][start, goal]),
+            float(a["distance"][start, goal]),
+            float(a["time"][start, goal]),
+            float(a["cost"][start, goal]),
+        )
@@ -0,0 +1,111 @@
+import threading
+from array import array
+from contextlib import contextmanager
+from typing import List, Tuple
+
+from models.compiled_graph import MODE_NAMES
+
+# Giá trị lớn nhất của bộ đếm epoch trước khi phải xóa lại các mảng đánh dấu
+_MAX_EPOCH = 2 ** 62
+
+
+class SearchState:
+    """
+    Trạng thái của một lần tìm kiếm (UCS, A*, Greedy) lưu trong các mảng theo id nút.
+
+    Mỗi truy vấn dùng một epoch mới: một nút chỉ được coi là đã gặp / đã đóng nếu
+    seen[u] / closed[u] bằng epoch hiện tại, nên không cần duyệt lại toàn bộ nút
+    để reset giữa các truy vấn. g, parent, parent_edge chỉ có nghĩa khi seen[u] == epoch.
+    """
+
+    __slots__ = ("num_nodes", "epoch", "g", "parent", "parent_edge", "seen", "closed")
+
+    def __init__(self, num_nodes: int):
+        self.num_nodes = num_nodes
+        self.epoch = 0
+        self.g = array("d", [float("inf")]) * num_nodes
+        self.parent = array("q", [-1]) * num_nodes
+        self.parent_edge = array("q", [-1]) * num_nodes
+        self.seen = array("q", [0]) * num_nodes
+        self.closed = array("q", [0]) * num_nodes
+
+    def begin(self) -> int:
+        """Bắt đầu một truy vấn mới, trả về epoch của truy vấn"""
+        self.epoch += 1
+        if self.epoch >= _MAX_EPOCH:
+            self.seen = array("q", [0]) * self.num_nodes
+            self.closed = array("q", [0]) * self.num_nodes
+            self.epoch = 1
+        return self.epoch
+
+    def open(self, u: int, g: float, parent: int = -1, parent_edge: int = -1) -> None:
+        """Ghi nhận giá trị g và nút cha mới của u trong truy vấn hiện tại"""
+        self.g[u] = g
+        self.parent[u] = parent
+        self.parent_edge[u] = parent_edge
+        self.seen[u] = self.epoch
+
+    def is_seen(self, u: int) -> bool:
+        return self.seen[u] == self.epoch
+
+    def is_closed(self, u: int) -> bool:
+        return self.closed[u] == self.epoch
+
+    def close(self, u: int) -> None:
+        self.closed[u] = self.epoch
+
+    def path_to(self, goal: int) -> List[int]:
+        """Dãy id nút từ điểm xuất phát đến goal theo mảng parent"""
+        path = []
+        u = goal
+        while u >= 0:
+            path.append(u)
+            u = self.parent[u]
+        path.reverse()
+        return path
+
+    def path_weight(self, goal: int, weights) -> float:
+        """Tổng weights[e] trên các cạnh cha từ điểm xuất phát đến goal"""
+        total = 0.0
+        for u in self.path_to(goal)[1:]:
+            total += weights[self.parent_edge[u]]
+        return total
+
+    def route(self, graph, goal: int) -> Tuple[List[str], List[Tuple[str, str, str]]]:
+        """
+        Đường đi và thông tin vận chuyển đến goal.
+
+        Returns:
+            Tuple (danh sách tên tỉnh/thành, danh sách (from, to, "road"/"fly"))
+        """
+        ids = self.path_to(goal)
+        path = [graph.names[u] for u in ids]
+        transport_info = [
+            (graph.names[self.parent[v]], graph.names[v], MODE_NAMES[int(graph.modes[self.parent_edge[v]])])
+            for v in ids[1:]
+        ]
+        return path, transport_info
+
+
+_pool = threading.local()
+
+
+@contextmanager
+def search_state(graph):
+    """
+    Mượn một SearchState cho đồ thị từ pool riêng của luồng hiện tại.
+
+    Các luồng khác nhau dùng các SearchState khác nhau trên cùng một đồ thị chỉ
+    đọc, nên nhiều truy vấn có thể chạy song song. Trong cùng một luồng, các lần
+    mượn lồng nhau cũng nhận các SearchState riêng biệt.
+    """
+    pools = getattr(_pool, "states", None)
+    if pools is None:
+        pools = _pool.states = {}
+    free = pools.setdefault(graph.version, [])
+    state = free.pop() if free and free[-1].num_nodes == graph.num_nodes else SearchState(graph.num_nodes)
+    state.begin()
+    try:
+        yield state
+    finally:
+        free.append(state)
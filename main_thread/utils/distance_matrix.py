@@ -0,0 +1,218 @@
+import numpy as np
+
+# Các hàm trong file này là phiên bản numpy của utils/distance_function.py:
+# nhận mảng tọa độ (độ) và tính khoảng cách (km) cho nhiều cặp điểm cùng lúc.
+# Các hàm batch_* tính theo từng cặp phần tử (có broadcast), distance_matrix
+# tính ma trận đầy đủ giữa hai tập điểm.
+
+EARTH_RADIUS = 6371.0  # km
+KM_PER_DEGREE = 111.0
+
+# WGS-84
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+WGS84_B = WGS84_A * (1 - WGS84_F)
+
+
+def _half_angle_terms(lat, lon):
+    """sin/cos của nửa góc vĩ độ, kinh độ và cos vĩ độ, tính một lần cho mỗi điểm"""
+    lat_rad = np.radians(np.asarray(lat, dtype=np.float64))
+    lon_rad = np.radians(np.asarray(lon, dtype=np.float64))
+    return (
+        np.sin(lat_rad / 2),
+        np.cos(lat_rad / 2),
+        np.sin(lon_rad / 2),
+        np.cos(lon_rad / 2),
+        np.cos(lat_rad),
+    )
+
+
+def _haversine_from_terms(terms1, terms2):
+    sin_lat1, cos_lat1, sin_lon1, cos_lon1, cos1 = terms1
+    sin_lat2, cos_lat2, sin_lon2, cos_lon2, cos2 = terms2
+    # sin((x2 - x1) / 2) khai triển theo nửa góc, tránh gọi sin cho từng cặp điểm;
+    # các phép tính sau được làm tại chỗ để không tạo thêm mảng tạm kích thước n×m
+    a = np.asarray(np.multiply(sin_lat2, cos_lat1))
+    a -= cos_lat2 * sin_lat1
+    a *= a
+    b = np.asarray(np.multiply(sin_lon2, cos_lon1))
+    b -= cos_lon2 * sin_lon1
+    b *= b
+    b *= cos1
+    b *= cos2
+    a += b
+    np.clip(a, 0.0, 1.0, out=a)
+    np.sqrt(a, out=a)
+    np.arcsin(a, out=a)
+    a *= 2 * EARTH_RADIUS
+    return a
+
+
+def batch_haversine_distance(lat1, lon1, lat2, lon2):
+    """Khoảng cách haversine (km) theo từng cặp phần tử của các mảng tọa độ"""
+    lat1, lon1, lat2, lon2 = np.broadcast_arrays(lat1, lon1, lat2, lon2)
+    return _haversine_from_terms(_half_angle_terms(lat1, lon1), _half_angle_terms(lat2, lon2))
+
+
+def batch_euclidean_distance(lat1, lon1, lat2, lon2):
+    """Khoảng cách equirectangular (km), giống euclidean_distance"""
+    lat1, lon1 = np.asarray(lat1, dtype=np.float64), np.asarray(lon1, dtype=np.float64)
+    lat2, lon2 = np.asarray(lat2, dtype=np.float64), np.asarray(lon2, dtype=np.float64)
+    km_per_lon = np.cos(np.radians((lat1 + lat2) / 2)) * KM_PER_DEGREE
+    dx = (lon1 - lon2) * km_per_lon
+    dy = (lat1 - lat2) * KM_PER_DEGREE
+    return np.sqrt(dx * dx + dy * dy)
+
+
+def batch_manhattan_distance(lat1, lon1, lat2, lon2):
+    """Khoảng cách Manhattan (km), giống manhattan_distance"""
+    lat1, lon1 = np.asarray(lat1, dtype=np.float64), np.asarray(lon1, dtype=np.float64)
+    lat2, lon2 = np.asarray(lat2, dtype=np.float64), np.asarray(lon2, dtype=np.float64)
+    km_per_lon = np.cos(np.radians((lat1 + lat2) / 2)) * KM_PER_DEGREE
+    return np.abs(lat2 - lat1) * KM_PER_DEGREE + np.abs(lon2 - lon1) * km_per_lon
+
+
+def batch_vincenty_distance(lat1, lon1, lat2, lon2, iter_limit: int = 100, tolerance: float = 1e-12):
+    """
+    Khoảng cách Vincenty (km) trên ellipsoid WGS-84, giống vincenty_distance.
+
+    Phép lặp tính lambda chạy đồng thời cho mọi cặp điểm; ở mỗi vòng chỉ các cặp
+    chưa hội tụ mới được tính lại.
+    """
+    f = WGS84_F
+    lat1, lon1, lat2, lon2 = np.broadcast_arrays(
+        *(np.asarray(x, dtype=np.float64) for x in (lat1, lon1, lat2, lon2))
+    )
+    shape = lat1.shape
+    lat1, lon1, lat2, lon2 = (x.ravel() for x in (lat1, lon1, lat2, lon2))
+
+    L = np.radians(lon2) - np.radians(lon1)
+    U1 = np.arctan((1 - f) * np.tan(np.radians(lat1)))
+    U2 = np.arctan((1 - f) * np.tan(np.radians(lat2)))
+    sinU1, cosU1 = np.sin(U1), np.cos(U1)
+    sinU2, cosU2 = np.sin(U2), np.cos(U2)
+
+    size = L.size
+    lambda_ = L.copy()
+    sin_sigma = np.zeros(size)
+    cos_sigma = np.ones(size)
+    sigma = np.zeros(size)
+    cos_sq_alpha = np.ones(size)
+    cos_2sigma_m = np.zeros(size)
+
+    active = np.arange(size)
+    for _ in range(iter_limit):
+        if active.size == 0:
+            break
+        lam = lambda_[active]
+        s1, c1, s2, c2 = sinU1[active], cosU1[active], sinU2[active], cosU2[active]
+        sin_lambda, cos_lambda = np.sin(lam), np.cos(lam)
+
+        ss = np.sqrt((c2 * sin_lambda) ** 2 + (c1 * s2 - s1 * c2 * cos_lambda) ** 2)
+        cs = s1 * s2 + c1 * c2 * cos_lambda
+        sg = np.arctan2(ss, cs)
+        coincide = ss == 0
+        safe_ss = np.where(coincide, 1.0, ss)
+
+        sin_alpha = c1 * c2 * sin_lambda / safe_ss
+        csa = 1 - sin_alpha ** 2
+        safe_csa = np.where(csa != 0, csa, 1.0)
+        c2sm = np.where(csa != 0, cs - 2 * s1 * s2 / safe_csa, 0.0)
+
+        C = f / 16 * csa * (4 + f * (4 - 3 * csa))
+        new_lambda = L[active] + (1 - C) * f * sin_alpha * (
+            sg + C * ss * (c2sm + C * cs * (-1 + 2 * c2sm ** 2))
+        )
+
+        sin_sigma[active] = ss
+        cos_sigma[active] = cs
+        sigma[active] = sg
+        cos_sq_alpha[active] = csa
+        cos_2sigma_m[active] = c2sm
+        lambda_[active] = np.where(coincide, lam, new_lambda)
+
+        # Các cặp trùng nhau hoặc đã hội tụ được loại khỏi vòng lặp tiếp theo
+        done = coincide | (np.abs(new_lambda - lam) < tolerance)
+        active = active[~done]
+
+    u_sq = cos_sq_alpha * (WGS84_A ** 2 - WGS84_B ** 2) / WGS84_B ** 2
+    A = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+    B = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+    delta_sigma = B * sin_sigma * (
+        cos_2sigma_m
+        + B / 4 * (
+            cos_sigma * (-1 + 2 * cos_2sigma_m ** 2)
+            - B / 6 * cos_2sigma_m * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sigma_m ** 2)
+        )
+    )
+    s = WGS84_B * A * (sigma - delta_sigma)
+    s[sin_sigma == 0] = 0.0
+    return (s / 1000).reshape(shape)
+
+
+BATCH_METRICS = {
+    "haversine": batch_haversine_distance,
+    "euclidean": batch_euclidean_distance,
+    "manhattan": batch_manhattan_distance,
+    "vincenty": batch_vincenty_distance,
+}
+
+
+def distance_matrix(
+    lat,
+    lon,
+    other_lat=None,
+    other_lon=None,
+    metric: str = "haversine",
+    dtype=np.float64,
+    block_rows: int = 2048,
+) -> np.ndarray:
+    """
+    Ma trận khoảng cách (km) giữa mọi điểm của tập thứ nhất và mọi điểm của tập thứ hai.
+
+    Args:
+        lat, lon: Tọa độ tập điểm thứ nhất (độ), mảng 1 chiều độ dài n
+        other_lat, other_lon: Tọa độ tập điểm thứ hai (mặc định: chính tập thứ nhất)
+        metric: "haversine", "euclidean", "manhattan" hoặc "vincenty"
+        dtype: Kiểu dữ liệu của ma trận kết quả (float32 giảm một nửa bộ nhớ)
+        block_rows: Số hàng được tính mỗi lượt, giới hạn bộ nhớ tạm khi n lớn
+
+    Returns:
+        Ma trận n×m
+    """
+    if metric not in BATCH_METRICS:
+        raise ValueError(f"Không hỗ trợ metric {metric!r}, chọn một trong {sorted(BATCH_METRICS)}")
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    other_lat = lat if other_lat is None else np.asarray(other_lat, dtype=np.float64)
+    other_lon = lon if other_lon is None else np.asarray(other_lon, dtype=np.float64)
+
+    out = np.empty((lat.size, other_lat.size), dtype=dtype)
+    if metric == "haversine":
+        # Các hệ số lượng giác của mỗi điểm chỉ tính một lần cho cả ma trận
+        terms = _half_angle_terms(lat, lon)
+        other_terms = tuple(t[None, :] for t in _half_angle_terms(other_lat, other_lon))
+        for start in range(0, lat.size, block_rows):
+            rows = slice(start, start + block_rows)
+            out[rows] = _haversine_from_terms(tuple(t[rows, None] for t in terms), other_terms)
+    else:
+        batch = BATCH_METRICS[metric]
+        for start in range(0, lat.size, block_rows):
+            rows = slice(start, start + block_rows)
+            out[rows] = batch(lat[rows, None], lon[rows, None], other_lat[None, :], other_lon[None, :])
+    return out
+
+
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(0)
+    for n in (63, 1000, 5000):
+        lat = rng.uniform(8.5, 23.5, n)
+        lon = rng.uniform(102.0, 109.5, n)
+        for metric in BATCH_METRICS:
+            if metric == "vincenty" and n > 1000:
+                continue
+            t0 = time.perf_counter()
+            distance_matrix(lat, lon, metric=metric, dtype=np.float32)
+            print(f"{metric:10s} n={n:5d}: {(time.perf_counter() - t0) * 1000:8.1f} ms")
@@ -0,0 +1,243 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hashlib
+import json
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models.compiled_graph import CompiledGraph, ROAD, FLY
+from models.province_node import ProvinceNode
+from utils.graph_snapshot import SNAPSHOT_ENV, load_graph_snapshot
+from utils.distance_matrix import batch_haversine_distance, distance_matrix
+from utils.heuristic_function import AIRPORTS, AIR_SPEED, ROAD_SPEED
+from utils.heuristic_function import AIR_COST_PER_KM, ROAD_COST_PER_KM, STORAGE_TIME, REST_DISTANCE, REST_TIME
+from data.provinces_infor import coordinates, province_neighbor
+
+# Tăng khi thay đổi cách biên dịch đồ thị để các bảng tính sẵn cũ bị vô hiệu
+GRAPH_FORMAT_VERSION = 1
+
+_graph = None
+_graph_lock = threading.Lock()
+
+
+def cost_constants() -> Dict[str, float]:
+    """Các hằng số vận tải ảnh hưởng đến trọng số cạnh"""
+    return {
+        "ROAD_SPEED": ROAD_SPEED,
+        "AIR_SPEED": AIR_SPEED,
+        "ROAD_COST_PER_KM": ROAD_COST_PER_KM,
+        "AIR_COST_PER_KM": AIR_COST_PER_KM,
+        "STORAGE_TIME": STORAGE_TIME,
+        "REST_TIME": REST_TIME,
+        "REST_DISTANCE": REST_DISTANCE,
+    }
+
+
+def graph_version(
+    names: Sequence[str],
+    coords: Dict[str, Tuple[float, float]],
+    road_pairs: Sequence[Tuple[int, int]],
+    airports: Sequence[str],
+) -> str:
+    """
+    Phiên bản của đồ thị: mã băm của dữ liệu đầu vào và các hằng số vận tải.
+    Hai đồ thị có cùng phiên bản cho ra cùng trọng số cạnh.
+    """
+    payload = {
+        "format": GRAPH_FORMAT_VERSION,
+        "nodes": [[name, coords[name][0], coords[name][1]] for name in names],
+        "roads": sorted([min(u, v), max(u, v)] for u, v in road_pairs),
+        "airports": sorted(airports),
+        "constants": cost_constants(),
+    }
+    digest = hashlib.sha1(
+        json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    return f"v{GRAPH_FORMAT_VERSION}-{digest[:16]}"
+
+
+def road_metrics(distance: float) -> Tuple[float, float]:
+    """Thời gian và chi phí (chưa chia tỉ lệ) của một đoạn đường bộ"""
+    time = (distance / ROAD_SPEED) + (distance // REST_DISTANCE) * REST_TIME
+    cost = distance * ROAD_COST_PER_KM
+    return time, cost
+
+
+def air_metrics(distance: float) -> Tuple[float, float]:
+    """Thời gian và chi phí (chưa chia tỉ lệ) của một chặng bay"""
+    time = (distance / AIR_SPEED) + STORAGE_TIME
+    cost = distance * AIR_COST_PER_KM
+    return time, cost
+
+
+def build_compiled_graph(
+    coords: Optional[Dict[str, Tuple[float, float]]] = None,
+    neighbors: Optional[Dict[str, List[str]]] = None,
+    airports: Optional[Sequence[str]] = None,
+) -> CompiledGraph:
+    """
+    Biên dịch dữ liệu tỉnh/thành thành CompiledGraph.
+
+    Đường bộ được coi là hai chiều: mỗi cặp tỉnh liền kề (theo province_neighbor,
+    ở bất kỳ chiều nào) tạo ra hai cạnh road có cùng khoảng cách. Mỗi cặp sân bay
+    tạo ra một cạnh fly theo mỗi chiều.
+
+    Args:
+        coords: Tọa độ các tỉnh/thành (mặc định: data.provinces_infor.coordinates)
+        neighbors: Danh sách tỉnh liền kề (mặc định: province_neighbor)
+        airports: Các tỉnh/thành có sân bay (mặc định: AIRPORTS)
+
+    Returns:
+        Đồ thị đã biên dịch
+    """
+    coords = coordinates if coords is None else coords
+    neighbors = province_neighbor if neighbors is None else neighbors
+    airports = AIRPORTS if airports is None else airports
+
+    names = list(coords.keys())
+    index = {name: i for i, name in enumerate(names)}
+    n = len(names)
+
+    # Các đoạn đường bộ (không có hướng), giữ thứ tự xuất hiện trong province_neighbor
+    road_pairs = {}
+    for province_name, neighbors_list in neighbors.items():
+        if province_name not in index:
+            continue
+        u = index[province_name]
+        for neighbor_name in neighbors_list:
+            if neighbor_name not in index or neighbor_name == province_name:
+                continue
+            v = index[neighbor_name]
+            key = (min(u, v), max(u, v))
+            if key not in road_pairs:
+                road_pairs[key] = (u, v)
+
+    airport_ids = [index[name] for name in airports if name in index]
+    air_pairs = [(u, v) for u in airport_ids for v in airport_ids if u != v]
+
+    # Khoảng cách của mọi cạnh được tính trong một lần gọi haversine vector hóa
+    latitudes = np.array([coords[name][0] for name in names], dtype=np.float64)
+    longitudes = np.array([coords[name][1] for name in names], dtype=np.float64)
+    pairs = np.array(list(road_pairs.values()) + air_pairs, dtype=np.int64).reshape(-1, 2)
+    pair_distances = batch_haversine_distance(
+        latitudes[pairs[:, 0]], longitudes[pairs[:, 0]],
+        latitudes[pairs[:, 1]], longitudes[pairs[:, 1]],
+    ).tolist()
+
+    adjacency: List[List[Tuple[int, int, float]]] = [[] for _ in range(n)]
+    for (u, v), distance in zip(road_pairs.values(), pair_distances):
+        adjacency[u].append((v, ROAD, distance))
+        adjacency[v].append((u, ROAD, distance))
+    for (u, v), distance in zip(air_pairs, pair_distances[len(road_pairs):]):
+        adjacency[u].append((v, FLY, distance))
+
+    indptr = np.zeros(n + 1, dtype=np.int32)
+    targets, modes, distances, times, costs = [], [], [], [], []
+    for u in range(n):
+        for v, mode, distance in adjacency[u]:
+            time, cost = road_metrics(distance) if mode == ROAD else air_metrics(distance)
+            targets.append(v)
+            modes.append(mode)
+            distances.append(distance)
+            times.append(time)
+            costs.append(cost)
+        indptr[u + 1] = len(targets)
+
+    is_airport = np.zeros(n, dtype=bool)
+    is_airport[airport_ids] = True
+
+    nodes = []
+    for u, name in enumerate(names):
+        lat, lon = coords[name]
+        road_neighbors = [names[v] for v, mode, _ in adjacency[u] if mode == ROAD]
+        nodes.append(ProvinceNode(u, name, lat, lon, road_neighbors))
+
+    return CompiledGraph(
+        version=graph_version(names, coords, list(road_pairs.keys()), [names[u] for u in airport_ids]),
+        names=names,
+        latitudes=latitudes,
+        longitudes=longitudes,
+        is_airport=is_airport,
+        indptr=indptr,
+        targets=np.array(targets, dtype=np.int32),
+        modes=np.array(modes, dtype=np.uint8),
+        distances=np.array(distances, dtype=np.float64),
+        times=np.array(times, dtype=np.float64),
+        costs=np.array(costs, dtype=np.float64),
+        nodes=nodes,
+    )
+
+
+def build_synthetic_graph(rows: int, cols: int, num_airports: int = 3, seed: int = 0) -> CompiledGraph:
+    """
+    Đồ thị lưới ngẫu nhiên phủ lãnh thổ Việt Nam, dùng cho benchmark trên mạng lưới lớn.
+
+    Các nút nằm trên lưới rows×cols có nhiễu tọa độ, nối đường bộ với các nút
+    kề theo hàng/cột và một số đường chéo ngẫu nhiên; num_airports nút rải đều
+    theo chiều bắc-nam có sân bay.
+    """
+    rng = np.random.default_rng(seed)
+    lat_step = (23.4 - 8.6) / max(rows - 1, 1)
+    lon_step = (109.4 - 102.2) / max(cols - 1, 1)
+    coords = {}
+    neighbors = {}
+    for r in range(rows):
+        for c in range(cols):
+            lat = 23.4 - r * lat_step + rng.uniform(-0.3, 0.3) * lat_step
+            lon = 102.2 + c * lon_step + rng.uniform(-0.3, 0.3) * lon_step
+            coords[f"N{r}_{c}"] = (float(lat), float(lon))
+    for r in range(rows):
+        for c in range(cols):
+            adjacent = []
+            if r + 1 < rows:
+                adjacent.append(f"N{r + 1}_{c}")
+            if c + 1 < cols:
+                adjacent.append(f"N{r}_{c + 1}")
+            if r + 1 < rows and c + 1 < cols and rng.random() < 0.3:
+                adjacent.append(f"N{r + 1}_{c + 1}")
+            neighbors[f"N{r}_{c}"] = adjacent
+    airport_rows = np.linspace(0, rows - 1, num_airports).round().astype(int) if num_airports else []
+    airports = [f"N{r}_{cols // 2}" for r in airport_rows]
+    return build_compiled_graph(coords, neighbors, airports)
+
+
+def geodesic_table(graph: CompiledGraph) -> np.ndarray:
+    """Ma trận khoảng cách haversine n×n (km, float32) giữa mọi cặp tỉnh/thành"""
+    return distance_matrix(graph.latitudes, graph.longitudes, dtype=np.float32)
+
+
+def get_graph() -> CompiledGraph:
+    """
+    Đồ thị dùng chung cho toàn bộ tiến trình, chỉ được tạo ở lần gọi đầu tiên.
+
+    Nếu biến môi trường VN_GRAPH_SNAPSHOT chỉ đến một file snapshot (xem
+    utils/graph_snapshot.py), đồ thị được nạp bằng mmap từ file đó thay vì
+    biên dịch lại từ data/provinces_infor.py.
+    """
+    global _graph
+    if _graph is None:
+        with _graph_lock:
+            if _graph is None:
+                snapshot_path = os.environ.get(SNAPSHOT_ENV)
+                if snapshot_path:
+                    _graph = load_graph_snapshot(snapshot_path)
+                else:
+                    _graph = build_compiled_graph()
+    return _graph
+
+
+def set_graph(graph: CompiledGraph) -> None:
+    """Thay đồ thị dùng chung của tiến trình (ví dụ khi nạp mạng lưới lớn hơn)"""
+    global _graph
+    with _graph_lock:
+        _graph = graph
+
+
+if __name__ == "__main__":
+    graph = get_graph()
+    print(graph)
+    print("Hà Nội ->", [graph.names[graph.targets[e]] for e in graph.edges_of(graph.node_id("Hà Nội"))])
@@ -0,0 +1,208 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import mmap
+import struct
+from typing import Dict, Optional
+
+import numpy as np
+
+from models.compiled_graph import CompiledGraph
+
+# Cấu trúc file snapshot:
+#   MAGIC (8 byte) | SNAPSHOT_FORMAT_VERSION (uint32) | độ dài header (uint32)
+#   | header JSON (utf-8) | các mảng dữ liệu thô, mỗi mảng căn lề ALIGNMENT byte
+# Header ghi tên tỉnh/thành, phiên bản đồ thị và vị trí (offset, dtype, shape)
+# của từng mảng, nhờ đó khi nạp chỉ cần mmap file và tạo view numpy, không sao chép.
+MAGIC = b"VNGRAPH\0"
+SNAPSHOT_FORMAT_VERSION = 1
+ALIGNMENT = 64
+_PREAMBLE = struct.Struct("<8sII")
+
+# Các mảng của CompiledGraph được lưu vào snapshot
+GRAPH_ARRAYS = (
+    "latitudes",
+    "longitudes",
+    "is_airport",
+    "indptr",
+    "targets",
+    "modes",
+    "distances",
+    "times",
+    "costs",
+)
+
+# Biến môi trường chỉ đến file snapshot mà get_graph() sẽ nạp thay vì biên dịch lại
+SNAPSHOT_ENV = "VN_GRAPH_SNAPSHOT"
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def save_graph_snapshot(
+    graph: CompiledGraph,
+    path: str,
+    tables: Optional[Dict[str, np.ndarray]] = None,
+) -> None:
+    """
+    Ghi đồ thị đã biên dịch ra file snapshot nhị phân.
+
+    Args:
+        graph: Đồ thị cần lưu
+        path: Đường dẫn file đích
+        tables: Các bảng tính sẵn bổ sung (mặc định: graph.tables)
+    """
+    tables = graph.tables if tables is None else tables
+    arrays = {name: np.ascontiguousarray(getattr(graph, name)) for name in GRAPH_ARRAYS}
+    for name, table in tables.items():
+        arrays["table:" + name] = np.ascontiguousarray(table)
+
+    sections = []
+    offset = 0
+    for name, array in arrays.items():
+        array = array.astype(array.dtype.newbyteorder("<"), copy=False)
+        arrays[name] = array
+        sections.append(
+            {
+                "name": name,
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+                "offset": offset,
+                "nbytes": int(array.nbytes),
+            }
+        )
+        offset = _align(offset + array.nbytes)
+
+    header = {
+        "version": graph.version,
+        "names": list(graph.names),
+        "sections": sections,
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    data_start = _align(_PREAMBLE.size + len(header_bytes))
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, SNAPSHOT_FORMAT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        for section in sections:
+            f.seek(data_start + section["offset"])
+            f.write(arrays[section["name"]].tobytes())
+        f.truncate(data_start + offset)
+    # Ghi vào file tạm rồi đổi tên để worker đang mmap file cũ không đọc phải file dở dang
+    os.replace(tmp_path, path)
+
+
+def load_graph_snapshot(path: str) -> CompiledGraph:
+    """
+    Nạp đồ thị từ file snapshot bằng mmap. Các mảng trả về là view chỉ đọc trên
+    vùng nhớ được ánh xạ, nên nhiều tiến trình nạp cùng một file sẽ dùng chung trang nhớ.
+
+    Args:
+        path: Đường dẫn file snapshot
+
+    Returns:
+        Đồ thị đã biên dịch
+    """
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, format_version, header_length = _PREAMBLE.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} không phải file snapshot đồ thị")
+    if format_version != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(
+            f"{path} có định dạng phiên bản {format_version}, cần phiên bản {SNAPSHOT_FORMAT_VERSION}"
+        )
+    header = json.loads(bytes(buffer[_PREAMBLE.size:_PREAMBLE.size + header_length]).decode("utf-8"))
+    data_start = _align(_PREAMBLE.size + header_length)
+
+    arrays = {}
+    for section in header["sections"]:
+        dtype = np.dtype(section["dtype"])
+        count = int(np.prod(section["shape"], dtype=np.int64))
+        array = np.frombuffer(buffer, dtype=dtype, count=count, offset=data_start + section["offset"])
+        arrays[section["name"]] = array.reshape(section["shape"])
+
+    # Chỉ tạo view trên vùng nhớ ánh xạ; ProvinceNode được tạo khi cần (CompiledGraph.nodes)
+    tables = {
+        name[len("table:"):]: array for name, array in arrays.items() if name.startswith("table:")
+    }
+    return CompiledGraph(
+        version=header["version"],
+        names=header["names"],
+        tables=tables,
+        **{name: arrays[name] for name in GRAPH_ARRAYS},
+    )
+
+
+if __name__ == "__main__":
+    from utils.graph_builder import build_compiled_graph, geodesic_table
+
+    parser = argparse.ArgumentParser(description="Biên dịch mạng lưới tỉnh/thành thành file snapshot")
+    parser.add_argument(
+        "output",
+        nargs="?",
+        default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "graph.vngraph"),
+    )
+    parser.add_argument(
+        "--geodesic-table",
+        action="store_true",
+        help="Lưu kèm ma trận khoảng cách địa lý n×n (float32)",
+    )
+    parser.add_argument(
+        "--ch-levels",
+        type=lambda text: [float(x) for x in text.split(",") if x],
+        default=[],
+        help="Các mức cost_priority cần tiền xử lý Contraction Hierarchy, ví dụ 0,0.5,1",
+    )
+    parser.add_argument(
+        "--hl-levels",
+        type=lambda text: [float(x) for x in text.split(",") if x],
+        default=[],
+        help="Các mức cost_priority cần tính nhãn hub, ví dụ 0,0.5,1",
+    )
+    parser.add_argument(
+        "--alt-levels",
+        type=lambda text: [float(x) for x in text.split(",") if x],
+        default=[],
+        help="Các mức cost_priority cần tính bảng landmark ALT, ví dụ 0,0.5,1",
+    )
+    parser.add_argument(
+        "--af-levels",
+        type=lambda text: [float(x) for x in text.split(",") if x],
+        default=[],
+        help="Các mức cost_priority cần tiền xử lý arc-flags (song song theo tiểu vùng), ví dụ 0,0.5,1",
+    )
+    parser.add_argument("--alt-method", choices=("farthest", "regions"), default="farthest")
+    parser.add_argument("--alt-landmarks", type=int, default=8, help="Số landmark ALT")
+    args = parser.parse_args()
+
+    graph = build_compiled_graph()
+    tables = {"geodesic": geodesic_table(graph)} if args.geodesic_table else {}
+    if args.ch_levels:
+        from algorithms.contraction_hierarchies import build_contraction_hierarchy
+
+        for cost_priority in args.ch_levels:
+            tables.update(build_contraction_hierarchy(graph, cost_priority).to_tables())
+    if args.hl_levels:
+        from algorithms.hub_labeling import build_hub_labels
+
+        for cost_priority in args.hl_levels:
+            tables.update(build_hub_labels(graph, cost_priority).to_tables())
+    if args.alt_levels:
+        from utils.landmarks import compute_landmark_tables
+
+        for cost_priority in args.alt_levels:
+            tables.update(compute_landmark_tables(graph, args.alt_landmarks, args.alt_method, cost_priority))
+    if args.af_levels:
+        from algorithms.arc_flags import compute_arc_flags
+
+        for cost_priority in args.af_levels:
+            tables.update(compute_arc_flags(graph, cost_priority))
+    save_graph_snapshot(graph, args.output, tables)
+    print(f"Đã ghi {graph} vào {args.output}")
@@ -4,7 +4,13 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from data.provinces_infor import *
 from utils.distance_function import haversine_distance
-from typing import Dict, List, Tuple
+from utils.distance_matrix import batch_haversine_distance
+from utils.landmarks import landmark_lower_bounds
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
 
 # List of provinces with airports (assumed)
 AIRPORTS = ["Hà Nội", "TP Hồ Chí Minh", "Đà Nẵng"]
@@ -18,6 +24,41 @@ STORAGE_TIME = 2  # giờ
 REST_TIME = 1  # 1 hours rest time per 300 km
 REST_DISTANCE = 300  # km
 
+# Các loại heuristic cho A*: "geodesic" là heuristic() theo khoảng cách địa lý (trên
+# dữ liệu này không phải cận dưới, A* có thể trả về đường không tối ưu),
+# "alt" / "alt-regions" chỉ dùng cận dưới landmark (ALT) chọn theo farthest-point /
+# theo logistics_regions, xem utils/landmarks.py: chấp nhận được và nhất quán, nên A*
+# với ALT luôn tối ưu. Không lấy max với "geodesic" vì khi đó ALT cũng mất tính chấp nhận được
+HEURISTIC_MODES = {
+    "geodesic": None,
+    "alt": "farthest",
+    "alt-regions": "regions",
+}
+
+# Số bảng heuristic (mỗi bảng một (đích, cost_priority, mode)) giữ trong mỗi cache.
+# Khóa gồm graph.version thay cho chính đồ thị, để đồ thị đã bị thay bằng set_graph
+# không bị cache giữ lại
+HEURISTIC_CACHE_SIZE = 256
+
+_heuristic_caches: Dict[str, "OrderedDict[Tuple, object]"] = {"array": OrderedDict(), "list": OrderedDict(), "integer": OrderedDict()}
+_heuristic_lock = threading.Lock()
+
+
+def _cached(kind: str, key: Tuple, compute: Callable[[], object]):
+    """Giá trị của key trong cache kind (LRU), tính bằng compute() nếu chưa có"""
+    cache = _heuristic_caches[kind]
+    with _heuristic_lock:
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+    value = compute()
+    with _heuristic_lock:
+        cache[key] = value
+        while len(cache) > HEURISTIC_CACHE_SIZE:
+            cache.popitem(last=False)
+    return value
+
+
 def heuristic(current_province: str, goal_province: str, cost_priority: float = 0.5, log: bool = False) -> float:
     """
     Heuristic function for A* in logistics.
@@ -76,6 +117,65 @@ def heuristic(current_province: str, goal_province: str, cost_priority: float =
     return heuristic_value
 
 
+def heuristic_array(graph, goal_id: int, cost_priority: float = 0.5, mode: str = "geodesic") -> np.ndarray:
+    """
+    Giá trị heuristic của mọi nút đến goal_id, tính vector hóa một lần cho mỗi
+    (đồ thị, đích, cost_priority, mode). Với mode "geodesic", cùng công thức với heuristic().
+
+    Args:
+        graph: CompiledGraph
+        goal_id: Id của tỉnh/thành đích
+        cost_priority: Mức độ ưu tiên chi phí
+        mode: Loại heuristic, xem HEURISTIC_MODES
+
+    Returns:
+        Mảng chỉ đọc độ dài n, phần tử u là heuristic(u, goal)
+    """
+    return _cached("array", (graph.version, goal_id, cost_priority, mode), lambda: _heuristic_array(graph, goal_id, cost_priority, mode))
+
+
+def _heuristic_array(graph, goal_id: int, cost_priority: float, mode: str) -> np.ndarray:
+    if mode not in HEURISTIC_MODES:
+        raise ValueError(f"Không hỗ trợ heuristic {mode!r}, chọn một trong {sorted(HEURISTIC_MODES)}")
+    if HEURISTIC_MODES[mode] is not None:
+        values = landmark_lower_bounds(graph, goal_id, cost_priority, HEURISTIC_MODES[mode])
+        values.flags.writeable = False
+        return values
+
+    distance = batch_haversine_distance(
+        graph.latitudes, graph.longitudes,
+        graph.latitudes[goal_id], graph.longitudes[goal_id],
+    )
+
+    road_time = (distance / ROAD_SPEED) + (distance // REST_DISTANCE) * REST_TIME
+    road_cost = distance * ROAD_COST_PER_KM / 10000
+    values = np.round(cost_priority * road_cost + (1 - cost_priority) * road_time, 2)
+
+    # Chỉ các nút có sân bay mới xét đường bay, và chỉ khi đích cũng có sân bay
+    if graph.is_airport[goal_id]:
+        air_time = (distance / AIR_SPEED) + STORAGE_TIME
+        air_cost = distance * AIR_COST_PER_KM / 10000
+        air_values = np.round(cost_priority * air_cost + (1 - cost_priority) * air_time, 2)
+        values = np.where(graph.is_airport, np.minimum(values, air_values), values)
+
+    values.flags.writeable = False
+    return values
+
+
+def heuristic_table(graph, goal_id: int, cost_priority: float = 0.5, mode: str = "geodesic") -> List[float]:
+    """heuristic_array dưới dạng list Python, tra cứu O(1) trong vòng lặp tìm kiếm"""
+    return _cached("list", (graph.version, goal_id, cost_priority, mode), lambda: heuristic_array(graph, goal_id, cost_priority, mode).tolist())
+
+
+def integer_heuristic_table(graph, goal_id: int, cost_priority: float = 0.5, scale: int = 100, mode: str = "geodesic") -> List[int]:
+    """heuristic_array nhân với scale và làm tròn, cho A* trên trọng số nguyên"""
+    return _cached(
+        "integer",
+        (graph.version, goal_id, cost_priority, scale, mode),
+        lambda: np.rint(heuristic_array(graph, goal_id, cost_priority, mode) * scale).astype(np.int64).tolist(),
+    )
+
+
 if __name__ == "__main__":
     # print(heuristic("Hải Phòng", "Đà Nẵng"))
     # print(heuristic("Hải Phòng", "Hà Nội"))
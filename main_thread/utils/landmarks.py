@@ -0,0 +1,156 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.provinces_infor import logistics_regions
+from utils.shortest_paths import dijkstra_distances
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Số landmark mặc định (bằng số tiểu vùng logistics)
+DEFAULT_LANDMARKS = 8
+
+# Cách chọn landmark:
+# - "farthest": lần lượt chọn nút xa nhất so với các landmark đã chọn
+# - "regions": mỗi tiểu vùng trong logistics_regions một landmark, là tỉnh của vùng
+#   ở xa tâm đồ thị nhất; đồ thị không có tiểu vùng (mạng lưới nhập từ ngoài) dùng "farthest"
+LANDMARK_METHODS = ("farthest", "regions")
+
+# Số bộ bảng landmark giữ trong cache, bộ ít dùng gần đây nhất bị bỏ trước
+LANDMARK_CACHE_SIZE = 8
+
+# Cache bảng landmark theo (phiên bản đồ thị, cách chọn, số landmark, cost_priority),
+# thứ tự từ cũ đến mới dùng
+_tables: "OrderedDict[Tuple, Tuple[np.ndarray, np.ndarray, np.ndarray]]" = OrderedDict()
+_tables_lock = threading.Lock()
+
+
+def landmark_prefix(method: str, num_landmarks: int, cost_priority: float) -> str:
+    """Tiền tố tên bảng landmark trong graph.tables"""
+    return f"alt/{method}/{num_landmarks}/{cost_priority:.6g}/"
+
+
+def _farthest_landmarks(graph, num_landmarks: int, cost_priority: float, chosen: List[int], distances: List[np.ndarray]) -> None:
+    """Bổ sung landmark theo farthest-point cho đến khi đủ num_landmarks"""
+    if not chosen:
+        # Nút xa nhất tính từ một nút bất kỳ là điểm khởi đầu tốt hơn chính nút đó
+        d = dijkstra_distances(graph, 0, cost_priority)
+        chosen.append(int(np.argmax(np.where(np.isfinite(d), d, -1.0))))
+        distances.append(dijkstra_distances(graph, chosen[-1], cost_priority))
+    while len(chosen) < min(num_landmarks, graph.num_nodes):
+        nearest = np.min(np.vstack(distances), axis=0)
+        nearest[chosen] = -1.0
+        nearest[~np.isfinite(nearest)] = -1.0
+        chosen.append(int(np.argmax(nearest)))
+        distances.append(dijkstra_distances(graph, chosen[-1], cost_priority))
+
+
+def select_landmarks(graph, num_landmarks: int = DEFAULT_LANDMARKS, method: str = "farthest", cost_priority: float = 0.5) -> List[int]:
+    """
+    Chọn các nút landmark cho heuristic ALT.
+
+    Args:
+        graph: CompiledGraph
+        num_landmarks: Số landmark cần chọn
+        method: "farthest" hoặc "regions", xem LANDMARK_METHODS
+        cost_priority: Mức độ ưu tiên chi phí dùng để đo khoảng cách khi chọn
+
+    Returns:
+        Danh sách id nút landmark
+    """
+    if method not in LANDMARK_METHODS:
+        raise ValueError(f"Không hỗ trợ cách chọn landmark {method!r}, chọn một trong {LANDMARK_METHODS}")
+
+    chosen: List[int] = []
+    distances: List[np.ndarray] = []
+    if method == "regions":
+        # Tâm đồ thị: nút gần tọa độ trung bình nhất
+        center_lat, center_lon = graph.latitudes.mean(), graph.longitudes.mean()
+        center = int(np.argmin((graph.latitudes - center_lat) ** 2 + (graph.longitudes - center_lon) ** 2))
+        from_center = dijkstra_distances(graph, center, cost_priority)
+        for members in logistics_regions.values():
+            ids = [graph.index[name] for name in members if name in graph.index]
+            if ids and len(chosen) < num_landmarks:
+                chosen.append(max(ids, key=lambda u: from_center[u]))
+                distances.append(dijkstra_distances(graph, chosen[-1], cost_priority))
+
+    _farthest_landmarks(graph, num_landmarks, cost_priority, chosen, distances)
+    return chosen
+
+
+def compute_landmark_tables(graph, num_landmarks: int = DEFAULT_LANDMARKS, method: str = "farthest", cost_priority: float = 0.5) -> Dict[str, np.ndarray]:
+    """
+    Chọn landmark và tính khoảng cách từ / đến mỗi landmark cho một mức cost_priority.
+
+    Returns:
+        Dictionary tên bảng -> mảng, lưu được trong graph.tables / file snapshot:
+        landmarks (k,), from (k×n, d(L, v)), to (k×n, d(v, L))
+    """
+    cost_priority = max(0.0, min(1.0, cost_priority))
+    landmarks = select_landmarks(graph, num_landmarks, method, cost_priority)
+    from_landmark = np.vstack([dijkstra_distances(graph, L, cost_priority) for L in landmarks])
+    to_landmark = np.vstack([dijkstra_distances(graph, L, cost_priority, reverse=True) for L in landmarks])
+    prefix = landmark_prefix(method, num_landmarks, cost_priority)
+    return {
+        prefix + "landmarks": np.asarray(landmarks, dtype=np.int32),
+        prefix + "from": from_landmark,
+        prefix + "to": to_landmark,
+    }
+
+
+def landmark_tables(graph, num_landmarks: int = DEFAULT_LANDMARKS, method: str = "farthest", cost_priority: float = 0.5) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bảng landmark (landmarks, from, to) của đồ thị: lấy từ cache (tối đa
+    LANDMARK_CACHE_SIZE bộ bảng), từ graph.tables (snapshot đã lưu kèm, nạp bằng mmap)
+    hoặc tính ở lần gọi đầu tiên.
+    """
+    cost_priority = max(0.0, min(1.0, cost_priority))
+    key = (graph.version, method, num_landmarks, cost_priority)
+    with _tables_lock:
+        tables = _tables.get(key)
+        if tables is None:
+            prefix = landmark_prefix(method, num_landmarks, cost_priority)
+            source = graph.tables if prefix + "landmarks" in graph.tables else compute_landmark_tables(graph, num_landmarks, method, cost_priority)
+            tables = (source[prefix + "landmarks"], source[prefix + "from"], source[prefix + "to"])
+            _tables[key] = tables
+            while len(_tables) > LANDMARK_CACHE_SIZE:
+                _tables.popitem(last=False)
+        else:
+            _tables.move_to_end(key)
+    return tables
+
+
+def landmark_lower_bounds(graph, goal_id: int, cost_priority: float = 0.5, method: str = "farthest", num_landmarks: int = DEFAULT_LANDMARKS) -> np.ndarray:
+    """
+    Cận dưới ALT của khoảng cách từ mọi nút đến goal_id theo bất đẳng thức tam giác:
+    max trên các landmark L của d(v, L) - d(goal, L) và d(L, goal) - d(L, v).
+    """
+    _, from_landmark, to_landmark = landmark_tables(graph, num_landmarks, method, cost_priority)
+    with np.errstate(invalid="ignore"):
+        bounds = np.maximum(
+            to_landmark - to_landmark[:, goal_id:goal_id + 1],
+            from_landmark[:, goal_id:goal_id + 1] - from_landmark,
+        )
+    # inf - inf (cả hai không đến được landmark) không cho thông tin gì
+    bounds = np.nan_to_num(bounds, nan=0.0, posinf=np.inf, neginf=0.0)
+    return np.maximum(bounds.max(axis=0), 0.0)
+
+
+def landmark_source_bounds(graph, source_id: int, cost_priority: float = 0.5, method: str = "farthest", num_landmarks: int = DEFAULT_LANDMARKS) -> np.ndarray:
+    """
+    Cận dưới ALT của khoảng cách từ source_id đến mọi nút (chiều ngược với
+    landmark_lower_bounds): max trên các landmark L của d(L, v) - d(L, source)
+    và d(source, L) - d(v, L).
+    """
+    _, from_landmark, to_landmark = landmark_tables(graph, num_landmarks, method, cost_priority)
+    with np.errstate(invalid="ignore"):
+        bounds = np.maximum(
+            from_landmark - from_landmark[:, source_id:source_id + 1],
+            to_landmark[:, source_id:source_id + 1] - to_landmark,
+        )
+    bounds = np.nan_to_num(bounds, nan=0.0, posinf=np.inf, neginf=0.0)
+    return np.maximum(bounds.max(axis=0), 0.0)
@@ -0,0 +1,93 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.provinces_infor import logistics_regions
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Số ô mặc định khi tự chia đồ thị không có tiểu vùng logistics
+DEFAULT_CELLS = 16
+
+
+def region_partition(graph) -> Optional[Tuple[np.ndarray, List[str]]]:
+    """
+    Chia đồ thị theo logistics_regions.
+
+    Returns:
+        Tuple (mảng id ô của mỗi nút, tên các ô), None nếu có nút không thuộc tiểu vùng nào
+    """
+    cells = np.full(graph.num_nodes, -1, dtype=np.int32)
+    names = []
+    for region, members in logistics_regions.items():
+        ids = [graph.index[name] for name in members if name in graph.index]
+        if ids:
+            cells[ids] = len(names)
+            names.append(region)
+    if (cells < 0).any():
+        return None
+    return cells, names
+
+
+def _bisect(coords: np.ndarray, ids: np.ndarray, parts: int, cells: np.ndarray, next_cell: int) -> int:
+    """
+    Chia các nút ids thành parts ô bằng chia đôi tọa độ đệ quy: mỗi lần cắt theo
+    trung vị của chiều (vĩ độ / kinh độ) trải rộng hơn, số ô của hai nửa tỉ lệ với
+    số nút. Ghi id ô từ next_cell trở đi vào cells, trả về id ô kế tiếp còn trống.
+    """
+    stack = [(ids, max(1, min(parts, len(ids))))]
+    while stack:
+        ids, parts = stack.pop()
+        if parts == 1:
+            cells[ids] = next_cell
+            next_cell += 1
+            continue
+        points = coords[ids]
+        axis = int(np.argmax(points.max(axis=0) - points.min(axis=0)))
+        order = ids[np.argsort(points[:, axis], kind="stable")]
+        left_parts = parts // 2
+        split = len(order) * left_parts // parts
+        stack.append((order[split:], parts - left_parts))
+        stack.append((order[:split], left_parts))
+    return next_cell
+
+
+def balanced_partition(graph, num_cells: int = DEFAULT_CELLS) -> Tuple[np.ndarray, List[str]]:
+    """
+    Chia đồ thị thành num_cells ô có số nút gần bằng nhau bằng chia đôi tọa độ đệ quy.
+
+    Returns:
+        Tuple (mảng id ô của mỗi nút, tên các ô)
+    """
+    cells = np.zeros(graph.num_nodes, dtype=np.int32)
+    coords = np.column_stack((graph.latitudes, graph.longitudes))
+    num = _bisect(coords, np.arange(graph.num_nodes), num_cells, cells, 0)
+    return cells, [f"Ô {i + 1}" for i in range(num)]
+
+
+def refine_partition(graph, cells: np.ndarray, parts: int) -> np.ndarray:
+    """
+    Chia mỗi ô của phân vùng cells thành tối đa parts ô con (bằng chia đôi tọa độ),
+    để mỗi ô con nằm trọn trong một ô cha.
+
+    Returns:
+        Mảng id ô con của mỗi nút
+    """
+    coords = np.column_stack((graph.latitudes, graph.longitudes))
+    refined = np.zeros(graph.num_nodes, dtype=np.int32)
+    next_cell = 0
+    for cell in range(int(cells.max()) + 1):
+        ids = np.flatnonzero(cells == cell)
+        if len(ids):
+            next_cell = _bisect(coords, ids, parts, refined, next_cell)
+    return refined
+
+
+def graph_partition(graph, num_cells: int = DEFAULT_CELLS) -> Tuple[np.ndarray, List[str]]:
+    """Chia theo logistics_regions nếu mọi nút thuộc một tiểu vùng, ngược lại chia cân bằng num_cells ô"""
+    partition = region_partition(graph)
+    if partition is None:
+        partition = balanced_partition(graph, num_cells)
+    return partition
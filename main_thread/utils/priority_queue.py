@@ -0,0 +1,327 @@
+import heapq
+from array import array
+from typing import Tuple
+
+# Hàng đợi ưu tiên cho các thuật toán tìm kiếm trên đồ thị. Phần tử là id nút
+# (số nguyên 0..capacity-1), mỗi id xuất hiện tối đa một lần với một khóa (key).
+# push(item, key) thêm item hoặc giảm khóa nếu item đã có trong hàng đợi,
+# pop() lấy ra cặp (key, item) có khóa nhỏ nhất, peek() xem cặp đó mà không
+# lấy ra. Không dùng khóa (lock) như queue.PriorityQueue vì mỗi truy vấn có
+# hàng đợi riêng.
+
+
+class IndexedHeap:
+    """
+    Heap d-phân có chỉ mục, hỗ trợ giảm khóa thật sự (decrease-key) trong O(log n).
+    Vị trí của mỗi item trong heap được lưu trong mảng pos để tìm lại khi giảm khóa.
+    """
+
+    __slots__ = ("arity", "items", "keys", "pos")
+
+    def __init__(self, capacity: int, arity: int = 2):
+        if arity < 2:
+            raise ValueError("arity phải >= 2")
+        self.arity = arity
+        self.items = []
+        self.keys = []
+        self.pos = array("q", [-1]) * capacity
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item: int):
+        return self.pos[item] >= 0
+
+    def key(self, item: int) -> float:
+        return self.keys[self.pos[item]]
+
+    def push(self, item: int, key: float) -> bool:
+        """Thêm item hoặc giảm khóa của item. Trả về True nếu hàng đợi thay đổi."""
+        i = self.pos[item]
+        if i < 0:
+            i = len(self.items)
+            self.items.append(item)
+            self.keys.append(key)
+        elif key < self.keys[i]:
+            self.keys[i] = key
+        else:
+            return False
+        self._sift_up(i, item, key)
+        return True
+
+    def peek(self) -> Tuple[float, int]:
+        """Cặp (key, item) nhỏ nhất mà không lấy ra"""
+        return self.keys[0], self.items[0]
+
+    def pop(self) -> Tuple[float, int]:
+        items, keys, pos = self.items, self.keys, self.pos
+        top_item, top_key = items[0], keys[0]
+        pos[top_item] = -1
+        last_item, last_key = items.pop(), keys.pop()
+        if items:
+            self._sift_down(0, last_item, last_key)
+        return top_key, top_item
+
+    def clear(self) -> None:
+        for item in self.items:
+            self.pos[item] = -1
+        self.items.clear()
+        self.keys.clear()
+
+    def _sift_up(self, i: int, item: int, key: float) -> None:
+        items, keys, pos, arity = self.items, self.keys, self.pos, self.arity
+        while i > 0:
+            parent = (i - 1) // arity
+            parent_key = keys[parent]
+            if parent_key <= key:
+                break
+            parent_item = items[parent]
+            items[i] = parent_item
+            keys[i] = parent_key
+            pos[parent_item] = i
+            i = parent
+        items[i] = item
+        keys[i] = key
+        pos[item] = i
+
+    def _sift_down(self, i: int, item: int, key: float) -> None:
+        items, keys, pos, arity = self.items, self.keys, self.pos, self.arity
+        size = len(items)
+        while True:
+            first = i * arity + 1
+            if first >= size:
+                break
+            best = first
+            best_key = keys[first]
+            for child in range(first + 1, min(first + arity, size)):
+                if keys[child] < best_key:
+                    best = child
+                    best_key = keys[child]
+            if best_key >= key:
+                break
+            best_item = items[best]
+            items[i] = best_item
+            keys[i] = best_key
+            pos[best_item] = i
+            i = best
+        items[i] = item
+        keys[i] = key
+        pos[item] = i
+
+
+class LazyHeap:
+    """
+    Heap nhị phân dựa trên heapq với xóa lười: giảm khóa được thực hiện bằng cách
+    đẩy thêm một bản ghi mới, các bản ghi cũ bị bỏ qua khi lấy ra.
+    """
+
+    __slots__ = ("heap", "best", "size")
+
+    def __init__(self, capacity: int = 0):
+        self.heap = []
+        self.best = {}
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, item: int):
+        return item in self.best
+
+    def key(self, item: int) -> float:
+        return self.best[item]
+
+    def push(self, item: int, key: float) -> bool:
+        current = self.best.get(item)
+        if current is not None and current <= key:
+            return False
+        if current is None:
+            self.size += 1
+        self.best[item] = key
+        heapq.heappush(self.heap, (key, item))
+        return True
+
+    def peek(self) -> Tuple[float, int]:
+        heap, best = self.heap, self.best
+        while best.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0]
+
+    def pop(self) -> Tuple[float, int]:
+        heap, best = self.heap, self.best
+        while True:
+            key, item = heapq.heappop(heap)
+            if best.get(item) == key:
+                del best[item]
+                self.size -= 1
+                return key, item
+
+    def clear(self) -> None:
+        self.heap.clear()
+        self.best.clear()
+        self.size = 0
+
+
+class BucketQueue:
+    """
+    Hàng đợi thùng (Dial) cho khóa nguyên không âm: mỗi giá trị khóa có một thùng,
+    con trỏ cur chỉ đến thùng nhỏ nhất có thể còn phần tử. Giảm khóa bằng xóa lười.
+    Khóa không cần đơn điệu: đẩy vào thùng nhỏ hơn cur sẽ kéo cur lùi lại.
+    """
+
+    __slots__ = ("buckets", "best", "cur", "size")
+
+    def __init__(self, capacity: int = 0):
+        self.buckets = []
+        self.best = {}
+        self.cur = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, item: int):
+        return item in self.best
+
+    def key(self, item: int) -> int:
+        return self.best[item]
+
+    def push(self, item: int, key: int) -> bool:
+        current = self.best.get(item)
+        if current is not None and current <= key:
+            return False
+        if current is None:
+            self.size += 1
+        self.best[item] = key
+        buckets = self.buckets
+        if key >= len(buckets):
+            buckets.extend([] for _ in range(key + 1 - len(buckets)))
+        buckets[key].append(item)
+        if key < self.cur:
+            self.cur = key
+        return True
+
+    def peek(self) -> Tuple[int, int]:
+        key, item = self.pop()
+        self.push(item, key)
+        return key, item
+
+    def pop(self) -> Tuple[int, int]:
+        buckets, best = self.buckets, self.best
+        cur = self.cur
+        while True:
+            bucket = buckets[cur]
+            while bucket:
+                item = bucket.pop()
+                if best.get(item) == cur:
+                    del best[item]
+                    self.size -= 1
+                    self.cur = cur
+                    return cur, item
+            cur += 1
+
+    def clear(self) -> None:
+        self.buckets.clear()
+        self.best.clear()
+        self.cur = 0
+        self.size = 0
+
+
+class RadixHeap:
+    """
+    Radix heap cho khóa nguyên đơn điệu (khóa được đẩy vào không nhỏ hơn khóa
+    vừa lấy ra, như trong Dijkstra). Thùng i chứa các khóa khác khóa cuối cùng
+    ở bit cao nhất thứ i, nên mỗi phần tử chỉ được phân phối lại O(log C) lần.
+    Khóa nhỏ hơn khóa vừa lấy ra (ví dụ A* với heuristic không nhất quán) bị từ chối:
+    nâng khóa lên sẽ làm sai thứ tự mở rộng và đường đi trả về.
+    """
+
+    __slots__ = ("buckets", "best", "last", "size")
+
+    def __init__(self, capacity: int = 0):
+        self.buckets = [[] for _ in range(65)]
+        self.best = {}
+        self.last = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, item: int):
+        return item in self.best
+
+    def key(self, item: int) -> int:
+        return self.best[item]
+
+    def push(self, item: int, key: int) -> bool:
+        if key < self.last:
+            raise ValueError(f"RadixHeap chỉ nhận khóa đơn điệu: {key} < {self.last}")
+        current = self.best.get(item)
+        if current is not None and current <= key:
+            return False
+        if current is None:
+            self.size += 1
+        self.best[item] = key
+        self.buckets[(key ^ self.last).bit_length()].append((key, item))
+        return True
+
+    def peek(self) -> Tuple[int, int]:
+        key, item = self.pop()
+        self.push(item, key)
+        return key, item
+
+    def pop(self) -> Tuple[int, int]:
+        buckets, best = self.buckets, self.best
+        while True:
+            if not buckets[0]:
+                i = 1
+                while not buckets[i]:
+                    i += 1
+                # Khóa nhỏ nhất của thùng i trở thành khóa cuối mới, phân phối lại thùng i
+                bucket = buckets[i]
+                buckets[i] = []
+                last = min(bucket)[0]
+                self.last = last
+                for entry in bucket:
+                    buckets[(entry[0] ^ last).bit_length()].append(entry)
+            key, item = buckets[0].pop()
+            if best.get(item) == key:
+                del best[item]
+                self.size -= 1
+                return key, item
+
+    def clear(self) -> None:
+        for bucket in self.buckets:
+            bucket.clear()
+        self.best.clear()
+        self.last = 0
+        self.size = 0
+
+
+QUEUE_TYPES = {
+    "binary": lambda capacity: IndexedHeap(capacity, arity=2),
+    "4-ary": lambda capacity: IndexedHeap(capacity, arity=4),
+    "lazy": LazyHeap,
+    "bucket": BucketQueue,
+    "radix": RadixHeap,
+}
+
+# Các hàng đợi chỉ nhận khóa nguyên: thuật toán phải lượng tử hóa trọng số cạnh
+INTEGER_QUEUES = ("bucket", "radix")
+
+# Các hàng đợi chỉ nhận khóa không giảm (Dijkstra / UCS), không dùng được cho A*
+MONOTONE_QUEUES = ("radix",)
+
+
+def make_queue(queue_type: str, capacity: int):
+    """
+    Tạo hàng đợi ưu tiên theo tên.
+
+    Args:
+        queue_type: "binary", "4-ary" (IndexedHeap), "lazy" (LazyHeap),
+            "bucket" (BucketQueue) hoặc "radix" (RadixHeap); hai loại cuối cần khóa nguyên
+        capacity: Số nút của đồ thị (id lớn nhất + 1)
+    """
+    if queue_type not in QUEUE_TYPES:
+        raise ValueError(f"Không hỗ trợ hàng đợi {queue_type!r}, chọn một trong {sorted(QUEUE_TYPES)}")
+    return QUEUE_TYPES[queue_type](capacity)
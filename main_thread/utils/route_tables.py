@@ -0,0 +1,274 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.compiled_graph import DISPLAY_COST_DIVISOR, SEARCH_COST_DIVISOR
+from models.route_table import ROUTE_TABLE_ARRAYS, RouteTable, compact_node_dtype
+from utils.graph_builder import cost_constants
+
+import argparse
+import json
+import shutil
+import tempfile
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# Bảng tra cứu mọi cặp được lưu theo từng mức cost_priority trên lưới bước
+# ROUTE_TABLE_STEP (bằng bước của thanh trượt trong giao diện), mỗi bảng là một thư mục
+#   <thư mục gốc>/<phiên bản đồ thị>/step-<bước>/cp-<chỉ số>/{dist,nxt,distance,time,cost}.npy
+# và được nạp bằng mmap. Phiên bản đồ thị đã gồm các hằng số vận tải; các hằng số vận
+# tải và các hằng số còn lại ảnh hưởng đến bảng cũng được ghi trong ROUTE_TABLE_META
+# để bảng của các hằng số cũ (thư mục phiên bản khác) được nhận ra và xóa.
+ROUTE_TABLE_STEP = 0.01
+ROUTE_TABLE_FORMAT_VERSION = 1
+ROUTE_TABLE_META = "route_tables.json"
+
+# Biến môi trường chỉ đến thư mục gốc chứa các bảng tra cứu
+ROUTE_TABLES_ENV = "VN_ROUTE_TABLES"
+DEFAULT_ROUTE_TABLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "route_tables")
+
+# Cache bảng đã nạp theo (phiên bản đồ thị, bước lưới, chỉ số trên lưới)
+_route_tables: Dict[Tuple[str, float, int], RouteTable] = {}
+_route_tables_lock = threading.Lock()
+
+
+def route_tables_dir() -> str:
+    return os.environ.get(ROUTE_TABLES_ENV, DEFAULT_ROUTE_TABLES_DIR)
+
+
+def quantize_cost_priority(cost_priority: float, step: float = ROUTE_TABLE_STEP) -> Tuple[int, float]:
+    """Tuple (chỉ số, giá trị) của điểm lưới gần cost_priority nhất"""
+    cost_priority = max(0.0, min(1.0, cost_priority))
+    level = int(round(cost_priority / step))
+    return level, round(min(1.0, level * step), 10)
+
+
+def _meta(graph, step: float) -> Dict:
+    return {
+        "format": ROUTE_TABLE_FORMAT_VERSION,
+        "version": graph.version,
+        "step": step,
+        "search_cost_divisor": SEARCH_COST_DIVISOR,
+        "display_cost_divisor": DISPLAY_COST_DIVISOR,
+        "constants": cost_constants(),
+    }
+
+
+def _hop_edges(graph, weights: np.ndarray) -> np.ndarray:
+    """Ma trận n×n chỉ số cạnh u -> v có trọng số nhỏ nhất (như CompiledGraph.best_edge), -1 nếu không kề"""
+    n = graph.num_nodes
+    tails = np.repeat(np.arange(n), np.diff(graph.indptr))
+    heads = np.asarray(graph.targets)
+    order = np.lexsort((np.arange(len(heads)), weights, heads, tails))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = (tails[order][1:] != tails[order][:-1]) | (heads[order][1:] != heads[order][:-1])
+    best = np.full((n, n), -1, dtype=np.int64)
+    chosen = order[first]
+    best[tails[chosen], heads[chosen]] = chosen
+    return best
+
+
+def build_route_table(graph, cost_priority: float = 0.5, engine: str = "auto", workers: Optional[int] = None) -> RouteTable:
+    """
+    Tính bảng tra cứu mọi cặp cho cost_priority bằng all_pairs_matrices rồi cộng dồn
+    quãng đường, thời gian, chi phí dọc theo ma trận nút kế tiếp (mỗi vòng lặp NumPy
+    đi thêm một cạnh trên mọi đường cùng lúc).
+
+    Args:
+        graph: CompiledGraph
+        cost_priority: Mức độ ưu tiên chi phí (0: ưu tiên thời gian, 1: ưu tiên chi phí)
+        engine, workers: Xem algorithms/all_pairs.all_pairs_matrices
+
+    Returns:
+        RouteTable
+    """
+    from algorithms.all_pairs import all_pairs_matrices
+
+    cost_priority = max(0.0, min(1.0, cost_priority))
+    n = graph.num_nodes
+    dist, nxt = all_pairs_matrices(graph, cost_priority, np.float64, engine, workers)
+    hop_edges = _hop_edges(graph, graph.edge_weight_array(cost_priority))
+    attributes = np.column_stack((graph.distances, graph.times, graph.costs / DISPLAY_COST_DIVISOR)).astype(np.float64)
+
+    targets = np.broadcast_to(np.arange(n)[None, :], (n, n))
+    current = np.broadcast_to(np.arange(n)[:, None], (n, n)).copy()
+    totals = np.zeros((n, n, 3))
+    active = (current != targets) & (nxt >= 0)
+    while active.any():
+        rows, cols = np.nonzero(active)
+        u = current[rows, cols]
+        v = nxt[u, cols].astype(np.int64)
+        totals[rows, cols] += attributes[hop_edges[u, v]]
+        current[rows, cols] = v
+        active[rows, cols] = v != cols
+
+    node_dtype = compact_node_dtype(n)
+    compact = np.where(nxt >= 0, nxt, np.iinfo(node_dtype).max).astype(node_dtype)
+    unreachable = ~np.isfinite(dist)
+    totals[unreachable] = np.inf
+    return RouteTable(cost_priority, {
+        "dist": dist.astype(np.float32),
+        "nxt": compact,
+        "distance": totals[:, :, 0].astype(np.float32),
+        "time": totals[:, :, 1].astype(np.float32),
+        "cost": totals[:, :, 2].astype(np.float32),
+    })
+
+
+def _version_dir(graph, root: str) -> str:
+    return os.path.join(root, graph.version)
+
+
+def _table_dir(graph, root: str, step: float, level: int) -> str:
+    return os.path.join(_version_dir(graph, root), f"step-{step:g}", f"cp-{level:04d}")
+
+
+def invalidate_stale_route_tables(graph, root: Optional[str] = None, step: float = ROUTE_TABLE_STEP) -> None:
+    """
+    Xóa các thư mục phiên bản có ROUTE_TABLE_META hỏng hoặc được ghi với định dạng /
+    hằng số khác (kể cả hằng số vận tải: đổi tốc độ, giá cước tạo phiên bản đồ thị mới,
+    thư mục của phiên bản cũ không còn dùng được). Bảng hợp lệ của các phiên bản đồ thị
+    khác được giữ nguyên: nhiều đồ thị (ví dụ đồ thị tổng hợp của benchmark) có thể dùng
+    chung thư mục gốc.
+    """
+    root = root or route_tables_dir()
+    if not os.path.isdir(root):
+        return
+    for entry in os.listdir(root):
+        path = os.path.join(root, entry)
+        meta_path = os.path.join(path, ROUTE_TABLE_META)
+        if not os.path.isfile(meta_path):
+            continue
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = None
+        if not isinstance(meta, dict):
+            shutil.rmtree(path, ignore_errors=True)
+            continue
+        # Mỗi thư mục chỉ được so với chính phiên bản của nó
+        expected = dict(_meta(graph, meta.get("step", step)), version=entry)
+        if meta != expected:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def save_route_table(graph, table: RouteTable, root: Optional[str] = None, step: float = ROUTE_TABLE_STEP) -> str:
+    """Ghi bảng vào thư mục của điểm lưới tương ứng, trả về đường dẫn thư mục"""
+    root = root or route_tables_dir()
+    level, _ = quantize_cost_priority(table.cost_priority, step)
+    version_dir = _version_dir(graph, root)
+    os.makedirs(version_dir, exist_ok=True)
+    with open(os.path.join(version_dir, ROUTE_TABLE_META), "w", encoding="utf-8") as f:
+        json.dump(_meta(graph, step), f)
+
+    path = _table_dir(graph, root, step, level)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Ghi vào thư mục tạm rồi đổi tên để tiến trình khác không nạp phải bảng dở dang
+    tmp_path = tempfile.mkdtemp(dir=os.path.dirname(path), prefix=".tmp-")
+    for name, array in table.arrays.items():
+        np.save(os.path.join(tmp_path, name + ".npy"), np.ascontiguousarray(array))
+    try:
+        os.replace(tmp_path, path)
+    except OSError:
+        # Một tiến trình khác đã ghi bảng này trước
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    return path
+
+
+def load_route_table(graph, cost_priority: float, root: Optional[str] = None, step: float = ROUTE_TABLE_STEP) -> Optional[RouteTable]:
+    """Nạp bảng của điểm lưới gần cost_priority nhất bằng mmap, None nếu chưa có hoặc đã cũ"""
+    root = root or route_tables_dir()
+    meta_path = os.path.join(_version_dir(graph, root), ROUTE_TABLE_META)
+    if not os.path.isfile(meta_path):
+        return None
+    with open(meta_path, encoding="utf-8") as f:
+        if json.load(f) != _meta(graph, step):
+            return None
+    level, value = quantize_cost_priority(cost_priority, step)
+    path = _table_dir(graph, root, step, level)
+    if not all(os.path.isfile(os.path.join(path, name + ".npy")) for name in ROUTE_TABLE_ARRAYS):
+        return None
+    arrays = {name: np.load(os.path.join(path, name + ".npy"), mmap_mode="r") for name in ROUTE_TABLE_ARRAYS}
+    if arrays["dist"].shape != (graph.num_nodes, graph.num_nodes):
+        return None
+    return RouteTable(value, arrays)
+
+
+def get_route_table(graph, cost_priority: float = 0.5, step: float = ROUTE_TABLE_STEP) -> RouteTable:
+    """
+    Bảng tra cứu của điểm lưới gần cost_priority nhất: lấy từ cache, nạp bằng mmap từ
+    thư mục bảng tra cứu, hoặc tính rồi ghi lại (bảng có định dạng / hằng số cũ bị xóa).
+    Nếu không ghi được thư mục, bảng chỉ được giữ trong bộ nhớ.
+    """
+    level, value = quantize_cost_priority(cost_priority, step)
+    key = (graph.version, step, level)
+    table = _route_tables.get(key)
+    if table is None:
+        with _route_tables_lock:
+            table = _route_tables.get(key)
+            if table is None:
+                table = load_route_table(graph, value, step=step)
+                if table is None:
+                    table = build_route_table(graph, value)
+                    try:
+                        invalidate_stale_route_tables(graph, step=step)
+                        save_route_table(graph, table, step=step)
+                    except OSError as exc:
+                        print(f"Không ghi được bảng tra cứu: {exc}")
+                _route_tables[key] = table
+    return table
+
+
+def preload_route_tables(graph, root: Optional[str] = None, step: float = ROUTE_TABLE_STEP) -> int:
+    """
+    Nạp bằng mmap mọi bảng đã ghi của đồ thị vào cache (gọi khi khởi động); bảng có
+    định dạng hoặc hằng số cũ bị xóa trước.
+
+    Returns:
+        Số bảng có trong cache cho đồ thị này
+    """
+    root = root or route_tables_dir()
+    invalidate_stale_route_tables(graph, root, step)
+    step_dir = os.path.join(_version_dir(graph, root), f"step-{step:g}")
+    if os.path.isdir(step_dir):
+        for entry in sorted(os.listdir(step_dir)):
+            if not entry.startswith("cp-"):
+                continue
+            level = int(entry[3:])
+            key = (graph.version, step, level)
+            if key in _route_tables:
+                continue
+            table = load_route_table(graph, level * step, root, step)
+            if table is not None:
+                with _route_tables_lock:
+                    _route_tables.setdefault(key, table)
+    return sum(1 for key in _route_tables if key[0] == graph.version and key[1] == step)
+
+
+if __name__ == "__main__":
+    from utils.graph_builder import get_graph
+
+    parser = argparse.ArgumentParser(description="Tính trước bảng tra cứu mọi cặp cho lưới cost_priority")
+    parser.add_argument("--root", default=None, help=f"Thư mục gốc (mặc định: ${ROUTE_TABLES_ENV} hoặc {DEFAULT_ROUTE_TABLES_DIR})")
+    parser.add_argument("--step", type=float, default=ROUTE_TABLE_STEP)
+    parser.add_argument(
+        "--levels",
+        type=lambda text: [float(x) for x in text.split(",") if x],
+        default=None,
+        help="Các mức cost_priority cần tính, ví dụ 0,0.5,1 (mặc định: toàn bộ lưới)",
+    )
+    parser.add_argument("--engine", choices=("auto", "dense", "sparse"), default="auto")
+    args = parser.parse_args()
+
+    graph = get_graph()
+    root = args.root or route_tables_dir()
+    levels = args.levels if args.levels is not None else [i * args.step for i in range(int(round(1 / args.step)) + 1)]
+    invalidate_stale_route_tables(graph, root, args.step)
+    for cost_priority in levels:
+        _, value = quantize_cost_priority(cost_priority, args.step)
+        if load_route_table(graph, value, root, args.step) is None:
+            save_route_table(graph, build_route_table(graph, value, args.engine), root, args.step)
+    print(f"Đã ghi {len(levels)} bảng tra cứu của {graph} vào {root}")
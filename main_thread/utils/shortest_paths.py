@@ -0,0 +1,72 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import heapq
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+# Dijkstra một nguồn trên CompiledGraph, trả về khoảng cách đến mọi nút. Dùng cho
+# các bước tiền xử lý (landmark, nhãn hub, arc-flags...) cần cả cây đường đi ngắn nhất
+# thay vì một đường đi giữa hai tỉnh/thành.
+
+
+def dijkstra(
+    graph,
+    source: int,
+    weights: Sequence[float],
+    reverse: bool = False,
+    allowed: Optional[Sequence[bool]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Dijkstra từ source trên đồ thị (hoặc đồ thị ngược nếu reverse=True).
+
+    Args:
+        graph: CompiledGraph
+        source: Id nút nguồn
+        weights: Trọng số của mọi cạnh (ví dụ graph.edge_weights(cost_priority))
+        reverse: True để tính khoảng cách từ mọi nút ĐẾN source
+        allowed: Nếu có, chỉ duyệt các nút u có allowed[u] (nguồn luôn được duyệt)
+
+    Returns:
+        Tuple (dist, parent_edge): dist[v] là khoảng cách (inf nếu không đến được),
+        parent_edge[v] là cạnh cuối cùng trên cây đường đi ngắn nhất (-1 với nguồn
+        và nút không đến được)
+    """
+    if reverse:
+        ptr, adjacent, edges = graph.reverse_adjacency()
+    else:
+        ptr, adjacent, _ = graph.adjacency()
+        edges = None
+
+    n = graph.num_nodes
+    inf = float('inf')
+    dist = [inf] * n
+    parent_edge = [-1] * n
+    done = [False] * n
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+
+    while heap:
+        d, u = heapq.heappop(heap)
+        if done[u]:
+            continue
+        done[u] = True
+        for i in range(ptr[u], ptr[u + 1]):
+            v = adjacent[i]
+            if done[v] or (allowed is not None and not allowed[v]):
+                continue
+            e = i if edges is None else edges[i]
+            nd = d + weights[e]
+            if nd < dist[v]:
+                dist[v] = nd
+                parent_edge[v] = e
+                heapq.heappush(heap, (nd, v))
+
+    return np.asarray(dist, dtype=np.float64), np.asarray(parent_edge, dtype=np.int64)
+
+
+def dijkstra_distances(graph, source: int, cost_priority: float = 0.5, reverse: bool = False) -> np.ndarray:
+    """Khoảng cách theo trọng số cost_priority từ source đến mọi nút (hoặc ngược lại nếu reverse=True)"""
+    return dijkstra(graph, source, graph.edge_weights(cost_priority), reverse)[0]